@@ -1,7 +1,14 @@
 from flask import Flask
 from flask_cors import CORS
-from app.extensions import db, jwt, migrate, mail
+from app.extensions import db, jwt
 from app.config import Config
+from app.utils.membership_cache import membership_cache
+from app.utils.response_cache import response_cache
+from app.utils.event_broker import event_broker
+from app.utils.user_claims_cache import user_claims_cache
+from app.utils.password_hasher import password_hasher
+from app.utils.sql_profiler import sql_profiler
+from app.utils.metrics import metrics
 
 
 def create_app(config_class=Config):
@@ -11,9 +18,17 @@ def create_app(config_class=Config):
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
-    migrate.init_app(app, db)
-    mail.init_app(app)
     CORS(app, resources={r"/api/*": {"origins": "*"}})
+    membership_cache.init_app(app)
+    response_cache.init_app(app)
+    event_broker.init_app(app)
+    user_claims_cache.init_app(app)
+    password_hasher.init_app(app)
+    sql_profiler.init_app(app)
+    metrics.init_app(app)
+
+    from app.utils.auth_middleware import is_token_revoked
+    jwt.token_in_blocklist_loader(is_token_revoked)
 
     # Register blueprints
     from app.routes.auth_routes import auth_bp
@@ -21,16 +36,32 @@ def create_app(config_class=Config):
     from app.routes.task_routes import task_bp
     from app.routes.comment_routes import comment_bp
     from app.routes.label_routes import label_bp
+    from app.routes.search_routes import search_bp
+    from app.routes.admin_routes import admin_bp
+    from app.routes.metrics_routes import metrics_bp
 
     app.register_blueprint(auth_bp, url_prefix="/api/auth")
     app.register_blueprint(project_bp, url_prefix="/api/projects")
     app.register_blueprint(task_bp, url_prefix="/api/tasks")
     app.register_blueprint(comment_bp, url_prefix="/api/tasks")
     app.register_blueprint(label_bp, url_prefix="/api")
+    app.register_blueprint(search_bp, url_prefix="/api/search")
+    app.register_blueprint(admin_bp, url_prefix="/api/admin")
+    if app.config.get("METRICS_ENABLED", False):
+        app.register_blueprint(metrics_bp, url_prefix="/metrics")
+
+    from app.commands import building_for_app_command, register_commands
+    register_commands(app)
+
+    from app.services.change_tracking import register_change_tracking
+    register_change_tracking()
+
+    from app.models import user, project, task, comment, label, activity_log, activity_archive, task_stats, email_outbox, notification, search  # noqa: F401
 
-    # Create tables
-    with app.app_context():
-        from app.models import user, project, task, comment, label, activity_log  # noqa: F401
-        db.create_all()
+    # Create tables, unless the schema is managed by migrations (`flask db upgrade`)
+    # or the app is being built to run one of its CLI commands (including `flask db`)
+    if app.config.get("DB_CREATE_ALL", True) and not building_for_app_command():
+        with app.app_context():
+            db.create_all()
 
     return app
@@ -0,0 +1,221 @@
+"""
+ASGI serving mode (``uvicorn --factory asgi:create_asgi_app``).
+
+The read-heavy routes in ``ASYNC_ENDPOINTS`` run on an async SQLAlchemy engine:
+each request gets a connection from the async pool and the ordinary Flask view
+runs inside ``AsyncConnection.run_sync`` with ``db.session`` bound to that
+connection. Every database round trip then awaits the async driver instead of
+blocking a thread, so one worker serves many concurrent connections. The views,
+URLs and JSON are the same code as under WSGI.
+
+The project event stream (SSE) runs its access checks through the Flask view on
+a thread, then streams from the event loop; an open stream holds no thread.
+Everything else (writes, exports, metrics) goes to the WSGI app on a pool of
+``ASGI_THREADS`` threads.
+
+Needs the packages in requirements-asgi.txt: an ASGI server, asgiref, greenlet
+and an async driver (aiomysql for MySQL, aiosqlite for SQLite).
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from flask import Flask, Response, request
+from flask_sqlalchemy.session import Session
+from werkzeug.exceptions import HTTPException
+from werkzeug.test import EnvironBuilder
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.utils.event_broker import EventStream
+
+ASYNC_ENDPOINTS = {
+    "projects.get_board",
+    "tasks.get_tasks",
+    "tasks.get_task_activity",
+    "comment.get_comments",
+    "label.get_project_labels",
+}
+EVENT_ENDPOINTS = {"projects.project_events"}
+ASYNC_DRIVERS = {"mysql+pymysql": "mysql+aiomysql", "mysql": "mysql+aiomysql", "sqlite": "sqlite+aiosqlite"}
+CONNECTION_ENVIRON_KEY = "taskflow.db_connection"
+
+
+def async_database_url(url: str) -> str:
+    """The async-driver equivalent of a sync SQLAlchemy URL."""
+    scheme, sep, rest = url.partition("://")
+    if scheme in ASYNC_DRIVERS.values():
+        return url
+    if scheme not in ASYNC_DRIVERS:
+        raise RuntimeError(f"No async driver known for {scheme}://; set ASYNC_DATABASE_URL")
+    return ASYNC_DRIVERS[scheme] + sep + rest
+
+
+class ConnectionSession(Session):
+    """A ``db.session`` that runs everything on one given connection."""
+
+    def get_bind(self, *args, **kwargs):
+        return self.bind
+
+
+def _bind_request_connection() -> None:
+    connection = request.environ.get(CONNECTION_ENVIRON_KEY)
+    if connection is not None:
+        db.session.registry.set(ConnectionSession(db, bind=connection))
+
+
+def _wsgi_on_thread_pool(app: Flask, executor: ThreadPoolExecutor):
+    """ASGI adapter running the WSGI app on ``executor``.
+
+    asgiref's ``WsgiToAsgi`` runs every request on one shared thread
+    (``thread_sensitive=True``), so a single slow or streaming request would
+    block all the others.
+    """
+    from asgiref.sync import sync_to_async
+    from asgiref.wsgi import WsgiToAsgiInstance
+
+    class ThreadPoolInstance(WsgiToAsgiInstance):
+        run_wsgi_app = sync_to_async(WsgiToAsgiInstance.__dict__["run_wsgi_app"].func, thread_sensitive=False,
+                                     executor=executor)
+
+    async def wsgi(scope, receive, send) -> None:
+        await ThreadPoolInstance(app)(scope, receive, send)
+
+    return wsgi
+
+
+class AsyncReadApp:
+    """ASGI app serving ``ASYNC_ENDPOINTS`` on async SQLAlchemy, SSE natively and the rest through WSGI."""
+
+    def __init__(self, app: Flask):
+        try:
+            from sqlalchemy.ext.asyncio import create_async_engine
+            self.executor = ThreadPoolExecutor(app.config.get("ASGI_THREADS", 32), thread_name_prefix="wsgi")
+            self.wsgi = _wsgi_on_thread_pool(app, self.executor)
+        except ImportError as e:
+            raise RuntimeError("ASGI mode needs the packages in requirements-asgi.txt") from e
+        self.app = app
+        url = app.config.get("ASYNC_DATABASE_URL") or async_database_url(app.config["SQLALCHEMY_DATABASE_URI"])
+        self.engine = create_async_engine(url, pool_size=app.config.get("ASYNC_POOL_SIZE", 20), pool_pre_ping=True)
+        self.urls = app.url_map.bind("localhost")
+        app.before_request(_bind_request_connection)
+
+    def endpoint(self, method: str, path: str) -> Optional[str]:
+        if method != "GET":
+            return None
+        try:
+            endpoint, _ = self.urls.match(path, method=method)
+        except HTTPException:
+            return None
+        return endpoint
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        endpoint = self.endpoint(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if endpoint in ASYNC_ENDPOINTS:
+            await self._serve(scope, send)
+        elif endpoint in EVENT_ENDPOINTS:
+            await self._serve_events(scope, receive, send)
+        else:
+            await self.wsgi(scope, receive, send)
+
+    async def _serve(self, scope, send) -> None:
+        environ = _environ(scope)
+        async with self.engine.connect() as connection:
+            status, headers, body = await connection.run_sync(self._dispatch, environ)
+        await send({"type": "http.response.start", "status": status, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    def _dispatch(self, connection, environ: Dict) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+        """Run the Flask view on ``connection``; the whole body is built here, while the connection is held."""
+        environ[CONNECTION_ENVIRON_KEY] = connection
+        started: List = []
+
+        def start_response(status: str, headers, exc_info=None):
+            started[:] = [status, headers]
+
+        iterable = self.app(environ, start_response)
+        try:
+            body = b"".join(iterable)
+        finally:
+            if hasattr(iterable, "close"):
+                iterable.close()
+        status, headers = started
+        return int(status.split(" ", 1)[0]), _headers(headers), body
+
+    def _respond(self, environ: Dict) -> Response:
+        """Run the request through Flask and return the response without consuming its body."""
+        with self.app.request_context(environ):
+            try:
+                return self.app.full_dispatch_request()
+            except Exception as e:
+                return self.app.handle_exception(e)
+
+    async def _serve_events(self, scope, receive, send) -> None:
+        environ = _environ(scope)
+        response = await asyncio.get_running_loop().run_in_executor(self.executor, self._respond, environ)
+        headers = _headers(response.get_wsgi_headers(environ).to_wsgi_list())
+        await send({"type": "http.response.start", "status": response.status_code, "headers": headers})
+        stream = response.response
+        if not isinstance(stream, EventStream):  # Refused before subscribing (401, 403, 404)
+            await send({"type": "http.response.body", "body": response.get_data()})
+            return
+
+        async def pump() -> None:
+            async for chunk in stream:
+                await send({"type": "http.response.body", "body": chunk.encode(), "more_body": True})
+            await send({"type": "http.response.body"})
+
+        async def disconnected() -> None:
+            while (await receive())["type"] != "http.disconnect":
+                pass
+
+        # Stream until the stream ends (revoked) or the client goes away; either way the other is cancelled
+        tasks = [asyncio.ensure_future(pump()), asyncio.ensure_future(disconnected())]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            stream.close()
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.engine.dispose()
+                self.executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def _headers(headers) -> List[Tuple[bytes, bytes]]:
+    return [(k.lower().encode("latin-1"), v.encode("latin-1")) for k, v in headers]
+
+
+def _environ(scope) -> Dict:
+    """A WSGI environ for a bodiless ASGI HTTP request."""
+    host, port = scope.get("server") or ("localhost", 80)
+    client: Optional[Tuple[str, int]] = scope.get("client")
+    builder = EnvironBuilder(
+        path=scope["path"],
+        base_url=f"{scope.get('scheme', 'http')}://{host}:{port}{scope.get('root_path', '')}",
+        query_string=scope.get("query_string", b"").decode("latin-1"),
+        method=scope["method"],
+        headers=[(k.decode("latin-1"), v.decode("latin-1")) for k, v in scope.get("headers", [])],
+        environ_overrides={"REMOTE_ADDR": client[0] if client else "", "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}"},
+    )
+    try:
+        return builder.get_environ()
+    finally:
+        builder.close()
+
+
+def create_asgi_app(config_class=Config) -> AsyncReadApp:
+    return AsyncReadApp(create_app(config_class))
@@ -0,0 +1,107 @@
+import time
+from datetime import datetime, timedelta
+import click
+from flask import Flask
+
+
+class LazyMigrateGroup(click.Group):
+    """``flask db``, importing Flask-Migrate (and Alembic) only when a db command is used.
+
+    Alembic is the largest import in the app and only the CLI needs it, so
+    web workers no longer pay for it at boot.
+    """
+
+    def __init__(self, app: Flask):
+        super().__init__("db", help="Perform database migrations.")
+        self.app = app
+
+    def make_context(self, info_name, args, parent=None, **extra):
+        from flask_migrate import Migrate
+        from flask_migrate.cli import db as db_group
+        from app.extensions import db
+
+        if "migrate" not in self.app.extensions:
+            Migrate(self.app, db)
+        return db_group.make_context(info_name, args, parent=parent, **extra)
+
+
+def building_for_app_command() -> bool:
+    """Whether the flask CLI is loading the app to run (or list) a command the app registers.
+
+    The CLI builds the app before it knows which command will run, so
+    ``flask db upgrade`` would otherwise get ``create_all`` first, which makes
+    the head-revision tables and breaks the migrations. Built-in commands such
+    as ``flask run`` load the app from inside their own context instead.
+    """
+    ctx = click.get_current_context(silent=True)
+    return ctx is not None and ctx.parent is None and isinstance(ctx.command, click.Group)
+
+
+def register_commands(app: Flask) -> None:
+    """Register maintenance commands on the ``flask`` CLI."""
+    app.cli.add_command(LazyMigrateGroup(app))
+
+    @app.cli.command("rebuild-task-stats")
+    @click.option("--project-id", "project_ids", type=int, multiple=True,
+                  help="Rebuild only this project (repeatable). Defaults to all projects.")
+    def rebuild_task_stats(project_ids):
+        """Recompute per-project task status counters from the tasks table."""
+        from app.services.task_service import TaskService
+
+        count = TaskService.rebuild_task_stats(list(project_ids) or None)
+        click.echo(f"Rebuilt task stats for {count} project(s)")
+
+    @app.cli.command("rebuild-search-index")
+    def rebuild_search_index():
+        """Rebuild the search_postings inverted index from tasks and comments."""
+        from app.services.search_service import SearchService
+
+        count = SearchService.rebuild()
+        click.echo(f"Indexed {count} task(s)")
+
+    @app.cli.command("compact-activity")
+    @click.option("--days", type=int, default=None, help="Archive entries older than this (default ACTIVITY_RETENTION_DAYS).")
+    @click.option("--chunk-size", type=int, default=1000, help="Entries moved per transaction.")
+    @click.option("--max-chunks", type=int, default=None, help="Stop after this many chunks.")
+    @click.option("--pause", type=float, default=0.0, help="Seconds to sleep between chunks.")
+    def compact_activity(days, chunk_size, max_chunks, pause):
+        """Move old task activity into the compressed archive tier."""
+        from app.services.activity_service import ActivityService
+
+        days = app.config["ACTIVITY_RETENTION_DAYS"] if days is None else days
+        moved, segments = ActivityService.compact(
+            datetime.utcnow() - timedelta(days=days), chunk_size=chunk_size, max_chunks=max_chunks, pause=pause
+        )
+        click.echo(f"Archived {moved} activity entries into {segments} segment(s)")
+
+    @app.cli.command("outbox-worker")
+    @click.option("--workers", type=int, default=None, help="Worker threads (default EMAIL_OUTBOX_WORKERS).")
+    @click.option("--once", is_flag=True, help="Deliver everything currently due, then exit.")
+    def outbox_worker(workers, once):
+        """Deliver queued emails from the email outbox."""
+        from app.services.email_outbox import OutboxWorker, outbox_workers
+
+        if once:
+            click.echo(f"Processed {OutboxWorker(app).drain()} email(s)")
+            return
+        outbox_workers.start(app, size=workers)
+        click.echo("Email outbox workers running. Press Ctrl+C to stop.")
+        try:
+            while outbox_workers.running:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            outbox_workers.stop()
+
+    @app.cli.command("debug-smtp")
+    @click.option("--host", default="localhost")
+    @click.option("--port", type=int, default=1025)
+    def debug_smtp(host, port):
+        """Run a local SMTP server that prints every message it receives."""
+        from app.utils.debug_smtp import DebugSMTPServer
+
+        with DebugSMTPServer(host, port) as server:
+            click.echo(f"Debug SMTP server listening on {host}:{port}")
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
@@ -1,9 +1,28 @@
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
 from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
-from flask_mail import Mail
 
 db = SQLAlchemy()
 jwt = JWTManager()
-migrate = Migrate()
-mail = Mail()
+
+
+class LazyMail:
+    """Flask-Mail, imported and configured for the current app on first use.
+
+    Only the outbox workers send mail, so web workers that never do skip the
+    import and setup at boot.
+    """
+
+    def state(self):
+        app = current_app._get_current_object()
+        state = app.extensions.get("mail")
+        if state is None:
+            from flask_mail import Mail
+            state = Mail().init_app(app)
+        return state
+
+    def __getattr__(self, name):
+        return getattr(self.state(), name)
+
+
+mail = LazyMail()
@@ -0,0 +1,86 @@
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from app.extensions import db
+
+
+class ActivityArchive(db.Model):
+    """A compressed segment of a task's activity entries moved out of activity_logs.
+
+    Written by ``flask compact-activity``. Entries keep their original ids and
+    timestamps, so reads can page across activity_logs and the archive as one
+    history.
+    """
+    __tablename__ = "activity_archive"
+    __table_args__ = (
+        db.Index("ix_activity_archive_task_last", "task_id", "last_at"),
+    )
+
+    id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    task_id: int = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    entry_count: int = db.Column(db.Integer, nullable=False)
+    first_at: datetime = db.Column(db.DateTime, nullable=False)
+    last_at: datetime = db.Column(db.DateTime, nullable=False)
+    entries: bytes = db.Column(db.LargeBinary(length=2 ** 24), nullable=False)  # zlib-compressed JSON list
+    archived_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    task = db.relationship("Task", backref=db.backref("activity_archives", lazy="dynamic", cascade="all, delete-orphan"))
+
+    def __init__(self, task_id: int, entries: List[Dict[str, Any]], **kwargs):
+        super().__init__(**kwargs)
+        self.task_id = task_id
+        self.entry_count = len(entries)
+        self.first_at = datetime.fromisoformat(entries[0]["created_at"])
+        self.last_at = datetime.fromisoformat(entries[-1]["created_at"])
+        self.entries = zlib.compress(json.dumps(entries, separators=(",", ":")).encode())
+
+    @staticmethod
+    def decode(entries: bytes) -> List[Dict[str, Any]]:
+        return json.loads(zlib.decompress(entries))
+
+    def load_entries(self) -> List[Dict[str, Any]]:
+        """The archived entries, oldest first."""
+        return ActivityArchive.decode(self.entries)
+
+
+class ActivitySummary(db.Model):
+    """Per-task totals of archived activity, kept hot so history size is known without the archive"""
+    __tablename__ = "activity_summaries"
+
+    task_id: int = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    archived_count: int = db.Column(db.Integer, nullable=False, default=0)
+    first_at: Optional[datetime] = db.Column(db.DateTime, nullable=True)
+    last_archived_at: Optional[datetime] = db.Column(db.DateTime, nullable=True)
+    action_counts: str = db.Column(db.Text, nullable=False, default="{}")  # JSON: action -> count
+
+    # Relationships
+    task = db.relationship("Task", backref=db.backref("activity_summary", uselist=False, cascade="all, delete-orphan"))
+
+    def __init__(self, task_id: int, **kwargs):
+        super().__init__(**kwargs)
+        self.task_id = task_id
+        self.archived_count = 0
+        self.action_counts = "{}"
+
+    def add(self, entries: List[Dict[str, Any]]) -> None:
+        counts = json.loads(self.action_counts or "{}")
+        for entry in entries:
+            counts[entry["action"]] = counts.get(entry["action"], 0) + 1
+        self.action_counts = json.dumps(counts, sort_keys=True)
+        self.archived_count = (self.archived_count or 0) + len(entries)
+        first_at = datetime.fromisoformat(entries[0]["created_at"])
+        if self.first_at is None or first_at < self.first_at:
+            self.first_at = first_at
+        last_at = datetime.fromisoformat(entries[-1]["created_at"])
+        if self.last_archived_at is None or last_at > self.last_archived_at:
+            self.last_archived_at = last_at
+
+    def to_dict(self):
+        return {
+            "archived_count": self.archived_count,
+            "first_at": self.first_at.isoformat() if self.first_at else None,
+            "last_archived_at": self.last_archived_at.isoformat() if self.last_archived_at else None,
+            "action_counts": json.loads(self.action_counts or "{}"),
+        }
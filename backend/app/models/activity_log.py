@@ -6,6 +6,9 @@ from app.extensions import db
 class ActivityLog(db.Model):
     """Activity log for tracking changes to tasks"""
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        db.Index("ix_activity_logs_task_created", "task_id", "created_at"),
+    )
 
     id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
     task_id: int = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
@@ -5,6 +5,10 @@ from app.extensions import db
 
 class Comment(db.Model):
     __tablename__ = "comments"
+    __table_args__ = (
+        db.Index("ix_comments_task_created", "task_id", "created_at"),
+        db.Index("ft_comments_content", "content", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
     content: str = db.Column(db.Text, nullable=False)
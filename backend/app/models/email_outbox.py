@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import List, Optional
+from app.extensions import db
+
+
+class EmailOutbox(db.Model):
+    """Queued outgoing email, written by request handlers and drained by the outbox workers"""
+    __tablename__ = "email_outbox"
+    __table_args__ = (
+        db.Index("ix_email_outbox_status_next_attempt", "status", "next_attempt_at"),
+    )
+
+    id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    subject: str = db.Column(db.String(255), nullable=False)
+    recipients: str = db.Column(db.Text, nullable=False)  # Comma-separated addresses
+    html_body: str = db.Column(db.Text, nullable=False)
+    # PENDING -> SENDING (claimed by a worker) -> SENT, or back to PENDING for a retry, or FAILED
+    status: str = db.Column(
+        db.Enum("PENDING", "SENDING", "SENT", "FAILED", name="email_status"),
+        default="PENDING",
+        nullable=False,
+    )
+    attempts: int = db.Column(db.Integer, default=0, nullable=False)
+    # When the row may next be claimed; for SENDING rows this is the end of the worker's lease
+    next_attempt_at: datetime = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    claim_token: Optional[str] = db.Column(db.String(32), nullable=True)  # Set by the worker that claimed the row
+    last_error: Optional[str] = db.Column(db.String(500), nullable=True)
+    created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
+    sent_at: Optional[datetime] = db.Column(db.DateTime, nullable=True)
+
+    def __init__(self, subject: str, recipients: List[str], html_body: str, **kwargs):
+        super().__init__(**kwargs)
+        self.subject = subject
+        self.recipients = ",".join(recipients)
+        self.html_body = html_body
+
+    @property
+    def recipient_list(self) -> List[str]:
+        return [r for r in self.recipients.split(",") if r]
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "subject": self.subject,
+            "recipients": self.recipient_list,
+            "status": self.status,
+            "attempts": self.attempts,
+            "next_attempt_at": self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "sent_at": self.sent_at.isoformat() if self.sent_at else None,
+        }
@@ -7,11 +7,15 @@ task_labels = db.Table(
     "task_labels",
     db.Column("task_id", db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True),
     db.Column("label_id", db.Integer, db.ForeignKey("labels.id", ondelete="CASCADE"), primary_key=True),
+    db.Index("ix_task_labels_label_id", "label_id"),
 )
 
 
 class Label(db.Model):
     __tablename__ = "labels"
+    __table_args__ = (
+        db.UniqueConstraint("project_id", "name", name="uq_labels_project_name"),
+    )
 
     id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name: str = db.Column(db.String(50), nullable=False)
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Optional
+from app.extensions import db
+
+
+class PendingNotification(db.Model):
+    """A notification waiting to be coalesced into its recipient's next email"""
+    __tablename__ = "pending_notifications"
+    __table_args__ = (
+        db.Index("ix_pending_notifications_deliver_after", "deliver_after"),
+        db.Index("ix_pending_notifications_user_id", "user_id"),
+    )
+
+    id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    user_id: int = db.Column(db.Integer, db.ForeignKey("users.id", ondelete="CASCADE"), nullable=False)  # Recipient
+    task_id: int = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    actor_id: int = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    kind: str = db.Column(db.String(20), nullable=False)  # 'assigned', 'updated' or 'commented'
+    field_changed: Optional[str] = db.Column(db.String(50), nullable=True)
+    old_value: Optional[str] = db.Column(db.String(200), nullable=True)
+    new_value: Optional[str] = db.Column(db.String(200), nullable=True)
+    content: Optional[str] = db.Column(db.Text, nullable=True)  # Comment text
+    deliver_after: datetime = db.Column(db.DateTime, nullable=False)
+    claim_token: Optional[str] = db.Column(db.String(32), nullable=True)
+    claimed_at: Optional[datetime] = db.Column(db.DateTime, nullable=True)
+    created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Relationships
+    task = db.relationship("Task")
+
+    def __init__(self, user_id: int, task_id: int, actor_id: int, kind: str, deliver_after: datetime,
+                 field_changed: Optional[str] = None, old_value: Optional[str] = None,
+                 new_value: Optional[str] = None, content: Optional[str] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.user_id = user_id
+        self.task_id = task_id
+        self.actor_id = actor_id
+        self.kind = kind
+        self.deliver_after = deliver_after
+        self.field_changed = field_changed
+        self.old_value = old_value
+        self.new_value = new_value
+        self.content = content
@@ -6,6 +6,10 @@ from app.extensions import db
 class ProjectMember(db.Model):
     """Association model for project members with roles"""
     __tablename__ = "project_members"
+    # The (user_id, project_id) primary key already serves lookups by user
+    __table_args__ = (
+        db.Index("ix_project_members_project_id", "project_id"),
+    )
     
     user_id: int = db.Column(db.Integer, db.ForeignKey("users.id"), primary_key=True)
     project_id: int = db.Column(db.Integer, db.ForeignKey("projects.id"), primary_key=True)
@@ -32,8 +36,10 @@ class Project(db.Model):
     id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
     name: str = db.Column(db.String(200), nullable=False)
     description: Optional[str] = db.Column(db.Text, nullable=True)
-    owner_id: int = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    owner_id: int = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False, index=True)
     created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
+    # Bumped by every write to the project, its tasks, comments, labels or members (see change_tracking)
+    version: int = db.Column(db.Integer, nullable=False, default=0, server_default="0")
 
     def __init__(self, name: str, description: Optional[str], owner_id: int, **kwargs):
         super().__init__(**kwargs)
@@ -71,18 +77,33 @@ class Project(db.Model):
         """Check if user is a member (PM or regular) of this project"""
         return ProjectMember.query.filter_by(project_id=self.id, user_id=user_id).first() is not None
 
-    def to_dict(self, include_tasks=False):
+    def to_dict(self, include_tasks=False, memberships: Optional[List["ProjectMember"]] = None,
+                task_count: Optional[int] = None):
+        """Serialize the project.
+
+        ``memberships`` (with ``user`` loaded) and ``task_count`` may be supplied
+        by bulk callers (see ``ProjectService.serialize_projects``); otherwise
+        they are loaded here with one query each.
+        """
+        if memberships is None:
+            memberships = ProjectMember.query.options(
+                db.joinedload(ProjectMember.user)
+            ).filter_by(project_id=self.id).all()
+        if task_count is None:
+            from app.services.task_service import TaskService
+            task_count = TaskService.get_task_stats([self.id])[self.id].total
+
         # Get all memberships with roles
-        memberships = ProjectMember.query.filter_by(project_id=self.id).all()
         members_with_roles = []
+        project_managers = []
         for membership in memberships:
-            from app.models.user import User
-            user = User.query.get(membership.user_id)
-            if user:
-                user_dict = user.to_dict()
+            if membership.user:
+                user_dict = membership.user.to_dict()
+                if membership.role == "PM":
+                    project_managers.append(dict(user_dict))
                 user_dict['project_role'] = membership.role
                 members_with_roles.append(user_dict)
-        
+
         data = {
             "id": self.id,
             "name": self.name,
@@ -90,10 +111,11 @@ class Project(db.Model):
             "owner_id": self.owner_id,
             "owner": self.owner.to_dict() if self.owner else None,
             "members": members_with_roles,
-            "project_managers": [pm.to_dict() for pm in self.project_managers],
-            "task_count": self.tasks.count(),
+            "project_managers": project_managers,
+            "task_count": task_count,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
         if include_tasks:
-            data["tasks"] = [t.to_dict() for t in self.tasks.all()]
+            from app.services.task_service import TaskService
+            data["tasks"] = TaskService.serialize_tasks(self.tasks.all())
         return data
@@ -0,0 +1,35 @@
+from typing import Optional
+from app.extensions import db
+
+
+class SearchPosting(db.Model):
+    """How often a term occurs in one task field or comment.
+
+    This is the inverted index behind ``/api/search`` on databases without
+    MySQL FULLTEXT (SQLite in development). It is kept up to date by change
+    tracking and can be rebuilt with ``flask rebuild-search-index``.
+    """
+    __tablename__ = "search_postings"
+    __table_args__ = (
+        db.Index("ix_search_postings_term_project", "term", "project_id", "task_id"),
+        db.Index("ix_search_postings_task_id", "task_id"),
+        db.Index("ix_search_postings_comment_id", "comment_id"),
+    )
+
+    id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    term: str = db.Column(db.String(64), nullable=False)
+    task_id: int = db.Column(db.Integer, db.ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    project_id: int = db.Column(db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    source: str = db.Column(db.String(12), nullable=False)  # 'title', 'description' or 'comment'
+    comment_id: Optional[int] = db.Column(db.Integer, db.ForeignKey("comments.id", ondelete="CASCADE"), nullable=True)
+    hits: int = db.Column(db.Integer, nullable=False, default=1)
+
+    def __init__(self, term: str, task_id: int, project_id: int, source: str,
+                 comment_id: Optional[int] = None, hits: int = 1, **kwargs):
+        super().__init__(**kwargs)
+        self.term = term
+        self.task_id = task_id
+        self.project_id = project_id
+        self.source = source
+        self.comment_id = comment_id
+        self.hits = hits
@@ -5,6 +5,16 @@ from app.extensions import db
 
 class Task(db.Model):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Project task lists: default (created_at, id) keyset order, status/priority filters and due-date sort
+        db.Index("ix_tasks_project_created", "project_id", "created_at", "id"),
+        db.Index("ix_tasks_project_status_created", "project_id", "status", "created_at"),
+        db.Index("ix_tasks_project_priority_created", "project_id", "priority", "created_at"),
+        db.Index("ix_tasks_project_due_date", "project_id", "due_date"),
+        # Full-text search on MySQL (other databases use the search_postings inverted index)
+        db.Index("ft_tasks_title", "title", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+        db.Index("ft_tasks_title_description", "title", "description", mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+    )
 
     id: int = db.Column(db.Integer, primary_key=True, autoincrement=True)
     title: str = db.Column(db.String(200), nullable=False)
@@ -20,8 +30,8 @@ class Task(db.Model):
         nullable=False,
     )
     project_id: int = db.Column(db.Integer, db.ForeignKey("projects.id"), nullable=False)
-    assigned_to: Optional[int] = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True)
-    due_date: Optional[date] = db.Column(db.Date, nullable=True)
+    assigned_to: Optional[int] = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=True, index=True)
+    due_date: Optional[date] = db.Column(db.Date, nullable=True, index=True)
     created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
 
     def __init__(self, title: str, description: Optional[str], project_id: int,
@@ -35,7 +45,14 @@ class Task(db.Model):
         self.priority = priority
         self.due_date = due_date
 
-    def to_dict(self):
+    def to_dict(self, comment_count: Optional[int] = None):
+        """Serialize the task.
+
+        ``comment_count`` may be supplied by bulk callers (see
+        ``TaskService.serialize_tasks``) to skip the per-task COUNT query.
+        """
+        if comment_count is None:
+            comment_count = self.comments.count() if hasattr(self, 'comments') else 0  # type: ignore
         return {
             "id": self.id,
             "title": self.title,
@@ -48,5 +65,5 @@ class Task(db.Model):
             "due_date": self.due_date.isoformat() if self.due_date else None,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "labels": [label.to_dict() for label in self.labels] if hasattr(self, 'labels') else [],  # type: ignore
-            "comment_count": self.comments.count() if hasattr(self, 'comments') else 0,
+            "comment_count": comment_count,
         }
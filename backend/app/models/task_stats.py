@@ -0,0 +1,35 @@
+from typing import Dict
+from app.extensions import db
+
+
+class ProjectTaskStats(db.Model):
+    """Per-project task counts by status, maintained alongside task writes"""
+    __tablename__ = "project_task_stats"
+
+    # Maps each task status to the counter column that tracks it
+    STATUS_COLUMNS = {"TODO": "todo_count", "IN_PROGRESS": "in_progress_count", "DONE": "done_count"}
+
+    project_id: int = db.Column(db.Integer, db.ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    todo_count: int = db.Column(db.Integer, default=0, nullable=False)
+    in_progress_count: int = db.Column(db.Integer, default=0, nullable=False)
+    done_count: int = db.Column(db.Integer, default=0, nullable=False)
+
+    def __init__(self, project_id: int, todo_count: int = 0, in_progress_count: int = 0,
+                 done_count: int = 0, **kwargs):
+        super().__init__(**kwargs)
+        self.project_id = project_id
+        self.todo_count = todo_count
+        self.in_progress_count = in_progress_count
+        self.done_count = done_count
+
+    @property
+    def total(self) -> int:
+        return self.todo_count + self.in_progress_count + self.done_count
+
+    def to_summary(self) -> Dict[str, int]:
+        return {
+            "total": self.total,
+            "TODO": self.todo_count,
+            "IN_PROGRESS": self.in_progress_count,
+            "DONE": self.done_count,
+        }
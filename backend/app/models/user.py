@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 from app.extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.utils.password_hasher import password_hasher
 
 
 class User(db.Model):
@@ -12,6 +12,15 @@ class User(db.Model):
     email: str = db.Column(db.String(120), unique=True, nullable=False, index=True)
     password_hash: str = db.Column(db.String(256), nullable=False)
     role: str = db.Column(db.Enum("ADMIN", "MEMBER", name="user_role"), default="MEMBER", nullable=False)
+    # How task notification emails are batched: coalesced within a short window, or hourly/daily digests
+    notification_mode: str = db.Column(
+        db.Enum("IMMEDIATE", "HOURLY", "DAILY", name="notification_mode"),
+        default="IMMEDIATE",
+        server_default="IMMEDIATE",
+        nullable=False,
+    )
+    # Part of every access token; bumping it revokes the user's outstanding tokens
+    token_version: int = db.Column(db.Integer, nullable=False, default=0, server_default="0")
     created_at: datetime = db.Column(db.DateTime, default=datetime.utcnow)
 
     def __init__(self, name: str, email: str, role: str = "MEMBER", **kwargs):
@@ -24,11 +33,18 @@ class User(db.Model):
     owned_projects = db.relationship("Project", backref="owner", lazy="dynamic", foreign_keys="Project.owner_id")
     assigned_tasks = db.relationship("Task", backref="assignee", lazy="dynamic", foreign_keys="Task.assigned_to")
 
+    # Both may raise PasswordHashingBusy when the hashing pool is saturated
     def set_password(self, password):
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password):
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return password_hasher.needs_rehash(self.password_hash)
+
+    def revoke_tokens(self):
+        self.token_version = (self.token_version or 0) + 1
 
     def to_dict(self):
         return {
@@ -36,5 +52,6 @@ class User(db.Model):
             "name": self.name,
             "email": self.email,
             "role": self.role,
+            "notification_mode": self.notification_mode,
             "created_at": self.created_at.isoformat() if self.created_at else None,
         }
@@ -0,0 +1,24 @@
+from flask import Blueprint, jsonify
+from app.utils.auth_middleware import admin_required
+from app.utils.sql_profiler import sql_profiler
+
+admin_bp = Blueprint("admin", __name__)
+
+
+@admin_bp.route("/sql-profile", methods=["GET"])
+@admin_required
+def get_sql_profile():
+    """The most database-expensive recent requests per endpoint, with N+1 suspects"""
+    return jsonify({
+        "enabled": sql_profiler.enabled,
+        "n_plus_one_threshold": sql_profiler.threshold,
+        "endpoints": sql_profiler.worst_requests(),
+    }), 200
+
+
+@admin_bp.route("/sql-profile", methods=["DELETE"])
+@admin_required
+def reset_sql_profile():
+    """Forget the recorded requests"""
+    sql_profiler.reset()
+    return jsonify({"message": "SQL profile reset"}), 200
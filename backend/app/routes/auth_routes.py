@@ -1,12 +1,18 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required
+from flask_jwt_extended import jwt_required
 from app.extensions import db
 from app.models.user import User
-from app.utils.auth_middleware import get_current_user, validate_required_fields
+from app.utils.auth_middleware import create_user_token, load_current_user, validate_required_fields
+from app.utils.password_hasher import PasswordHashingBusy
+from app.utils.response_cache import response_cache
 
 auth_bp = Blueprint("auth", __name__)
 
 
+def _hashing_busy():
+    return jsonify({"error": "Too many sign-ins in progress, please retry shortly"}), 429, {"Retry-After": "1"}
+
+
 @auth_bp.route("/register", methods=["POST"])
 def register():
     data = request.get_json()
@@ -22,11 +28,14 @@ def register():
         email=data["email"],
         role=data.get("role", "MEMBER"),
     )
-    user.set_password(data["password"])
+    try:
+        user.set_password(data["password"])
+    except PasswordHashingBusy:
+        return _hashing_busy()
     db.session.add(user)
     db.session.commit()
 
-    access_token = create_access_token(identity=str(user.id))
+    access_token = create_user_token(user)
     return jsonify({
         "message": "User registered successfully",
         "user": user.to_dict(),
@@ -42,10 +51,21 @@ def login():
         return jsonify({"error": error}), 400
 
     user = User.query.filter_by(email=data["email"]).first()
-    if not user or not user.check_password(data["password"]):
-        return jsonify({"error": "Invalid email or password"}), 401
+    try:
+        if not user or not user.check_password(data["password"]):
+            return jsonify({"error": "Invalid email or password"}), 401
+    except PasswordHashingBusy:
+        return _hashing_busy()
 
-    access_token = create_access_token(identity=str(user.id))
+    # Upgrade hashes made with an older method or work factor while we have the password
+    if user.password_needs_rehash():
+        try:
+            user.set_password(data["password"])
+            db.session.commit()
+        except PasswordHashingBusy:
+            pass  # Try again at the next login
+
+    access_token = create_user_token(user)
     return jsonify({
         "message": "Login successful",
         "user": user.to_dict(),
@@ -56,15 +76,37 @@ def login():
 @auth_bp.route("/profile", methods=["GET"])
 @jwt_required()
 def profile():
-    user = get_current_user()
+    user = load_current_user()
     if not user:
         return jsonify({"error": "User not found"}), 404
     return jsonify({"user": user.to_dict()}), 200
 
 
+@auth_bp.route("/preferences", methods=["PUT"])
+@jwt_required()
+def update_preferences():
+    """Update the current user's notification preferences"""
+    user = load_current_user()
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    data = request.get_json()
+    valid, error = validate_required_fields(data, ["notification_mode"])
+    if not valid:
+        return jsonify({"error": error}), 400
+
+    mode = data["notification_mode"]
+    if mode not in ["IMMEDIATE", "HOURLY", "DAILY"]:
+        return jsonify({"error": "Invalid notification_mode. Must be IMMEDIATE, HOURLY or DAILY"}), 400
+
+    user.notification_mode = mode
+    db.session.commit()
+    return jsonify({"message": "Preferences updated", "user": user.to_dict()}), 200
+
+
 @auth_bp.route("/users", methods=["GET"])
 @jwt_required()
 def get_all_users():
     """Get all users for member selection"""
-    users = User.query.order_by(User.name).all()
-    return jsonify({"users": [u.to_dict() for u in users]}), 200
+    users = response_cache.get_or_build(response_cache.users_key("directory"),
+                                        lambda: [u.to_dict() for u in User.query.order_by(User.name).all()])
+    return jsonify({"users": users}), 200
@@ -1,10 +1,10 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.auth_middleware import get_current_user
 from app.extensions import db
 from app.models.comment import Comment
 from app.models.task import Task
 from app.models.project import Project
-from app.services.notification_service import notify_comment_added
 from typing import Optional
 
 comment_bp = Blueprint("comment", __name__)
@@ -15,10 +15,9 @@ comment_bp = Blueprint("comment", __name__)
 def get_comments(task_id: int):
     """Get all comments for a task"""
     try:
-        from app.models.user import User
         from app.services.project_service import ProjectService
         
-        current_user_id: int = get_jwt_identity()
+        current_user_id: int = int(get_jwt_identity())
         
         # Check if task exists and user has access
         task: Optional[Task] = db.session.get(Task, task_id)
@@ -29,8 +28,8 @@ def get_comments(task_id: int):
         if not project:
             return jsonify({"error": "Project not found"}), 404
         
-        # Get user to check role
-        user: Optional[User] = db.session.get(User, current_user_id)
+        # Role comes from the token claims
+        user = get_current_user()
         if not user:
             return jsonify({"error": "User not found"}), 404
         
@@ -38,7 +37,12 @@ def get_comments(task_id: int):
         if user.role != "ADMIN" and not ProjectService.is_project_member(project, current_user_id):
             return jsonify({"error": "Access denied"}), 403
         
-        comments = Comment.query.filter_by(task_id=task_id).order_by(Comment.created_at.desc()).all()  # type: ignore
+        comments = (
+            Comment.query.filter_by(task_id=task_id)  # type: ignore
+            .options(db.joinedload(Comment.author))
+            .order_by(Comment.created_at.desc())
+            .all()
+        )
         return jsonify([comment.to_dict() for comment in comments]), 200
         
     except Exception as e:
@@ -50,7 +54,7 @@ def get_comments(task_id: int):
 def create_comment(task_id: int):
     """Create a new comment on a task"""
     try:
-        current_user_id: int = get_jwt_identity()
+        current_user_id: int = int(get_jwt_identity())
         data = request.get_json()
         
         if not data:
@@ -70,10 +74,9 @@ def create_comment(task_id: int):
             return jsonify({"error": "Project not found"}), 404
         
         # Get user to check role
-        from app.models.user import User
         from app.services.project_service import ProjectService
         
-        user: Optional[User] = db.session.get(User, current_user_id)
+        user = get_current_user()
         if not user:
             return jsonify({"error": "User not found"}), 404
         
@@ -85,15 +88,13 @@ def create_comment(task_id: int):
         comment = Comment(
             content=content.strip(),
             task_id=task_id,
-            user_id=current_user_id
+            user_id=user.id
         )
         
+        # The assignee is notified in the same commit by change tracking
         db.session.add(comment)
         db.session.commit()
         
-        # Send notification
-        notify_comment_added(task_id, current_user_id, content.strip())
-        
         return jsonify(comment.to_dict()), 201
         
     except Exception as e:
@@ -106,7 +107,7 @@ def create_comment(task_id: int):
 def update_comment(comment_id: int):
     """Update a comment"""
     try:
-        current_user_id: int = get_jwt_identity()
+        current_user_id: int = int(get_jwt_identity())
         data = request.get_json()
         
         if not data:
@@ -139,7 +140,7 @@ def update_comment(comment_id: int):
 def delete_comment(comment_id: int):
     """Delete a comment"""
     try:
-        current_user_id: int = get_jwt_identity()
+        current_user_id: int = int(get_jwt_identity())
         
         comment: Optional[Comment] = db.session.get(Comment, comment_id)
         if not comment:
@@ -1,11 +1,13 @@
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.utils.auth_middleware import get_current_user
+from sqlalchemy.exc import IntegrityError
 from app.extensions import db
 from app.models.label import Label
 from app.models.task import Task
 from app.models.project import Project
-from app.models.user import User
 from app.services.project_service import ProjectService
+from app.utils.response_cache import response_cache
 from typing import Optional
 
 label_bp = Blueprint("label", __name__)
@@ -16,14 +18,14 @@ label_bp = Blueprint("label", __name__)
 def get_project_labels(project_id: int):
     """Get all labels for a project"""
     try:
-        current_user_id: int = get_jwt_identity()
+        current_user_id: int = int(get_jwt_identity())
         
         project: Optional[Project] = db.session.get(Project, project_id)
         if not project:
             return jsonify({"error": "Project not found"}), 404
         
-        # Get user to check role
-        user: Optional[User] = db.session.get(User, current_user_id)
+        # Role comes from the token claims
+        user = get_current_user()
         if not user:
             return jsonify({"error": "User not found"}), 404
         
@@ -31,8 +33,11 @@ def get_project_labels(project_id: int):
         if user.role != "ADMIN" and not ProjectService.is_project_member(project, current_user_id):
             return jsonify({"error": "Access denied"}), 403
         
-        labels = Label.query.filter_by(project_id=project_id).order_by(Label.name).all()
-        return jsonify([label.to_dict() for label in labels]), 200
+        labels = response_cache.get_or_build(
+            response_cache.project_key(project, "labels"),
+            lambda: [label.to_dict() for label in Label.query.filter_by(project_id=project_id).order_by(Label.name).all()],
+        )
+        return jsonify(labels), 200
         
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -43,7 +48,7 @@ def get_project_labels(project_id: int):
 def create_label(project_id: int):
     """Create a new label for a project"""
     try:
-        current_user_id: int = get_jwt_identity()
+        current_user_id: int = int(get_jwt_identity())
         data = request.get_json()
         
         if not data:
@@ -53,8 +58,8 @@ def create_label(project_id: int):
         if not project:
             return jsonify({"error": "Project not found"}), 404
         
-        # Get user to check role
-        user: Optional[User] = db.session.get(User, current_user_id)
+        # Role comes from the token claims
+        user = get_current_user()
         if not user:
             return jsonify({"error": "User not found"}), 404
         
@@ -68,22 +73,21 @@ def create_label(project_id: int):
         if not name or not name.strip():
             return jsonify({"error": "Label name is required"}), 400
         
-        # Check if label with same name exists in project
-        existing_label = Label.query.filter_by(project_id=project_id, name=name.strip()).first()
-        if existing_label:
-            return jsonify({"error": "Label with this name already exists"}), 400
-        
         label = Label(
             name=name.strip(),
             color=color,
             project_id=project_id
         )
         
+        # Names are unique per project (uq_labels_project_name); let the database enforce it
         db.session.add(label)
         db.session.commit()
         
         return jsonify(label.to_dict()), 201
         
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "Label with this name already exists"}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -94,7 +98,7 @@ def create_label(project_id: int):
 def update_label(label_id: int):
     """Update a label"""
     try:
-        current_user_id: int = get_jwt_identity()
+        current_user_id: int = int(get_jwt_identity())
         data = request.get_json()
         
         if not data:
@@ -108,8 +112,8 @@ def update_label(label_id: int):
         if not project:
             return jsonify({"error": "Project not found"}), 404
         
-        # Get user to check role
-        user: Optional[User] = db.session.get(User, current_user_id)
+        # Role comes from the token claims
+        user = get_current_user()
         if not user:
             return jsonify({"error": "User not found"}), 404
         
@@ -124,15 +128,6 @@ def update_label(label_id: int):
             if not name.strip():
                 return jsonify({"error": "Label name cannot be empty"}), 400
             
-            # Check if another label with same name exists
-            existing_label = Label.query.filter(  # type: ignore
-                Label.project_id == label.project_id,
-                Label.name == name.strip(),
-                Label.id != label_id
-            ).first()
-            if existing_label:
-                return jsonify({"error": "Label with this name already exists"}), 400
-            
             label.name = name.strip()
         
         if color is not None:
@@ -141,6 +136,9 @@ def update_label(label_id: int):
         db.session.commit()
         return jsonify(label.to_dict()), 200
         
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "Label with this name already exists"}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({"error": str(e)}), 500
@@ -151,7 +149,7 @@ def update_label(label_id: int):
 def delete_label(label_id: int):
     """Delete a label"""
     try:
-        current_user_id: int = get_jwt_identity()
+        current_user_id: int = int(get_jwt_identity())
         
         label: Optional[Label] = db.session.get(Label, label_id)
         if not label:
@@ -161,8 +159,8 @@ def delete_label(label_id: int):
         if not project:
             return jsonify({"error": "Project not found"}), 404
         
-        # Get user to check role
-        user: Optional[User] = db.session.get(User, current_user_id)
+        # Role comes from the token claims
+        user = get_current_user()
         if not user:
             return jsonify({"error": "User not found"}), 404
         
@@ -185,7 +183,7 @@ def delete_label(label_id: int):
 def add_label_to_task(task_id: int, label_id: int):
     """Add a label to a task"""
     try:
-        current_user_id: int = get_jwt_identity()
+        current_user_id: int = int(get_jwt_identity())
         
         task: Optional[Task] = db.session.get(Task, task_id)
         if not task:
@@ -204,10 +202,9 @@ def add_label_to_task(task_id: int, label_id: int):
             return jsonify({"error": "Project not found"}), 404
         
         # Get user to check role
-        from app.models.user import User
         from app.services.project_service import ProjectService
         
-        user: Optional[User] = db.session.get(User, current_user_id)
+        user = get_current_user()
         if not user:
             return jsonify({"error": "User not found"}), 404
         
@@ -232,7 +229,7 @@ def add_label_to_task(task_id: int, label_id: int):
 def remove_label_from_task(task_id: int, label_id: int):
     """Remove a label from a task"""
     try:
-        current_user_id: int = get_jwt_identity()
+        current_user_id: int = int(get_jwt_identity())
         
         task: Optional[Task] = db.session.get(Task, task_id)
         if not task:
@@ -247,10 +244,9 @@ def remove_label_from_task(task_id: int, label_id: int):
             return jsonify({"error": "Project not found"}), 404
         
         # Get user to check role
-        from app.models.user import User
         from app.services.project_service import ProjectService
         
-        user: Optional[User] = db.session.get(User, current_user_id)
+        user = get_current_user()
         if not user:
             return jsonify({"error": "User not found"}), 404
         
@@ -0,0 +1,46 @@
+import hmac
+
+from flask import Blueprint, Response, current_app, jsonify, request
+from sqlalchemy import func
+from app.extensions import db
+from app.models.email_outbox import EmailOutbox
+from app.utils.event_broker import event_broker
+from app.utils.metrics import metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+def _pool_gauge(method: str):
+    def collect():
+        pool = db.engine.pool
+        if hasattr(pool, method):  # QueuePool; SQLite's pools do not track checkouts
+            yield (), getattr(pool, method)()
+    return collect
+
+
+def _outbox_depth():
+    rows = db.session.query(EmailOutbox.status, func.count(EmailOutbox.id)).filter(
+        EmailOutbox.status.in_(["PENDING", "SENDING"])
+    ).group_by(EmailOutbox.status).all()
+    counts = dict(rows)
+    for status in ("PENDING", "SENDING"):
+        yield (status,), counts.get(status, 0)
+
+
+metrics.gauge("taskflow_db_pool_size", "Connections the SQLAlchemy pool keeps open", (), _pool_gauge("size"))
+metrics.gauge("taskflow_db_pool_checked_out", "Pool connections currently in use", (), _pool_gauge("checkedout"))
+metrics.gauge("taskflow_db_pool_overflow", "Connections open beyond the pool size (negative while below it)", (),
+              _pool_gauge("overflow"))
+metrics.gauge("taskflow_email_outbox_depth", "Emails waiting in or being sent from the outbox", ("status",),
+              _outbox_depth)
+metrics.gauge("taskflow_event_stream_subscribers", "Open project event streams in this process", (),
+              lambda: [((), event_broker.subscriber_count())])
+
+
+@metrics_bp.route("", methods=["GET"])
+def get_metrics():
+    """Prometheus metrics for this process"""
+    token = current_app.config.get("METRICS_TOKEN")
+    if token and not hmac.compare_digest(request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode()):
+        return jsonify({"error": "Invalid metrics token"}), 401
+    return Response(metrics.render(), mimetype="text/plain; version=0.0.4")
@@ -1,7 +1,12 @@
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
-from app.utils.auth_middleware import get_current_user, admin_required, validate_required_fields
+import time
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
+from flask_jwt_extended import get_jwt, jwt_required
+from app.utils.auth_middleware import get_current_user, admin_required, is_token_revoked, validate_required_fields
 from app.services.project_service import ProjectService
+from app.services.export_service import EXPORT_FORMATS, ExportService
+from app.utils.etag import not_modified, not_modified_response, request_etag, with_etag
+from app.utils.response_cache import response_cache
+from app.utils.event_broker import EventStream, event_broker
 
 project_bp = Blueprint("projects", __name__)
 
@@ -33,7 +38,7 @@ def get_projects():
     if not user:
         return jsonify({"error": "User not found"}), 404
     projects = ProjectService.get_all_projects(user.id, user.role)
-    return jsonify({"projects": [p.to_dict() for p in projects]}), 200
+    return jsonify({"projects": ProjectService.serialize_projects(projects)}), 200
 
 
 @project_bp.route("/<int:project_id>", methods=["GET"])
@@ -49,7 +54,107 @@ def get_project(project_id):
     if user.role != "ADMIN" and not ProjectService.is_project_member(project, user.id):
         return jsonify({"error": "Access denied"}), 403
 
-    return jsonify({"project": project.to_dict(include_tasks=True)}), 200
+    etag = request_etag(project)
+    if not_modified(etag):
+        return not_modified_response(etag)
+    data = response_cache.get_or_build(response_cache.project_key(project, "detail"),
+                                       lambda: project.to_dict(include_tasks=True))
+    return with_etag(jsonify({"project": data}), etag), 200
+
+
+@project_bp.route("/<int:project_id>/board", methods=["GET"])
+@jwt_required()
+def get_board(project_id):
+    """Tasks grouped by status, status counts, labels and members in one response"""
+    user = get_current_user()
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    project = ProjectService.get_project_by_id(project_id)
+    if not project:
+        return jsonify({"error": "Project not found"}), 404
+
+    if user.role != "ADMIN" and not ProjectService.is_project_member(project, user.id):
+        return jsonify({"error": "Access denied"}), 403
+
+    etag = request_etag(project)
+    if not_modified(etag):
+        return not_modified_response(etag)
+    status = request.args.get("status")
+    priority = request.args.get("priority")
+    data = response_cache.get_or_build(
+        response_cache.project_key(project, f"board:{status or ''}:{priority or ''}"),
+        lambda: ProjectService.get_board(project, status=status, priority=priority),
+    )
+    return with_etag(jsonify(data), etag), 200
+
+
+@project_bp.route("/<int:project_id>/export", methods=["GET"])
+@jwt_required()
+def export_project(project_id):
+    """Stream the project's tasks, comments and activity as NDJSON or CSV"""
+    user = get_current_user()
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    project = ProjectService.get_project_by_id(project_id)
+    if not project:
+        return jsonify({"error": "Project not found"}), 404
+
+    if user.role != "ADMIN" and not ProjectService.is_project_member(project, user.id):
+        return jsonify({"error": "Access denied"}), 403
+
+    fmt = request.args.get("format", "ndjson")
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({"error": f"Invalid format. Must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+
+    return Response(
+        stream_with_context(ExportService.stream(project, fmt)),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={
+            "Content-Disposition": f'attachment; filename="{ExportService.filename(project, fmt)}"',
+            "X-Accel-Buffering": "no",  # Don't let a reverse proxy hold the stream back
+        },
+    )
+
+
+@project_bp.route("/<int:project_id>/events", methods=["GET"])
+@jwt_required(locations=["headers", "query_string"])  # EventSource can't send headers; use ?jwt=<token>
+def project_events(project_id):
+    """Server-Sent Events stream of the project's task, comment, label and member changes.
+
+    Clients load the board once, then apply each event's delta. A ``resync``
+    event means events were dropped and the board must be refetched.
+    """
+    user = get_current_user()
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    project = ProjectService.get_project_by_id(project_id)
+    if not project:
+        return jsonify({"error": "Project not found"}), 404
+
+    if user.role != "ADMIN" and not ProjectService.is_project_member(project, user.id):
+        return jsonify({"error": "Access denied"}), 403
+
+    app = current_app._get_current_object()
+    keepalive = app.config.get("EVENTS_KEEPALIVE_SECONDS", 15)
+    user_id, is_admin, token = user.id, user.role == "ADMIN", get_jwt()
+
+    def still_allowed():
+        if token.get("exp") is not None and token["exp"] <= time.time():
+            return False
+        with app.app_context():
+            if is_token_revoked(None, token):
+                return False
+            current = ProjectService.get_project_by_id(project_id)
+            return current is not None and (is_admin or ProjectService.is_project_member(current, user_id))
+
+    # Not wrapped in stream_with_context: the request's DB session is released
+    # as soon as this view returns, rather than held for the life of the stream
+    stream = EventStream(event_broker, event_broker.subscribe(project_id), keepalive, still_allowed)
+
+    return Response(stream, mimetype="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
 
 
 @project_bp.route("/<int:project_id>", methods=["PUT"])
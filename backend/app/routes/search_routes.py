@@ -0,0 +1,40 @@
+from flask import Blueprint, request, jsonify
+from flask_jwt_extended import jwt_required
+from app.utils.auth_middleware import get_current_user
+from app.models.task import Task
+from app.services.project_service import ProjectService
+from app.services.search_service import SearchService, DEFAULT_PER_PAGE
+from app.services.task_service import TaskService
+
+search_bp = Blueprint("search", __name__)
+
+
+@search_bp.route("", methods=["GET"])
+@jwt_required()
+def search():
+    """Search task titles, descriptions and comments in the caller's projects"""
+    user = get_current_user()
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    query = (request.args.get("q") or "").strip()
+    if not query:
+        return jsonify({"error": "Query parameter q is required"}), 400
+    page = request.args.get("page", 1, type=int)
+    per_page = request.args.get("per_page", DEFAULT_PER_PAGE, type=int)
+
+    project_ids = None if user.role == "ADMIN" else ProjectService.get_member_project_ids(user.id)
+    hits, has_more = SearchService.search(query, project_ids, page=page, per_page=per_page)
+
+    tasks = {}
+    if hits:
+        tasks = {t.id: t for t in Task.query.filter(Task.id.in_([task_id for task_id, _ in hits])).all()}  # type: ignore
+    ranked = [tasks[task_id] for task_id, _ in hits if task_id in tasks]
+    scores = dict(hits)
+    return jsonify({
+        "results": [
+            {"task": data, "score": scores[data["id"]]}
+            for data in TaskService.serialize_tasks(ranked)
+        ],
+        "page": max(1, page),
+        "has_more": has_more,
+    }), 200
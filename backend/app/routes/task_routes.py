@@ -2,9 +2,11 @@ from datetime import datetime
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import jwt_required
 from app.utils.auth_middleware import get_current_user, validate_required_fields
-from app.services.task_service import TaskService
+from app.services.task_service import TaskService, SORT_KEYS, DEFAULT_PAGE_SIZE
 from app.services.project_service import ProjectService
-from app.models.activity_log import ActivityLog
+from app.services.bulk_task_service import BulkTaskService
+from app.utils.etag import not_modified, not_modified_response, request_etag, with_etag
+from app.services.activity_service import ActivityService, DEFAULT_ACTIVITY_PAGE_SIZE
 from typing import Optional
 
 task_bp = Blueprint("tasks", __name__)
@@ -47,6 +49,36 @@ def create_task():
     return jsonify({"message": "Task created", "task": task.to_dict()}), 201
 
 
+@task_bp.route("/bulk", methods=["POST"])
+@jwt_required()
+def bulk_tasks():
+    """Create, update, move and delete many tasks in one transaction"""
+    user = get_current_user()
+    if not user:
+        return jsonify({"error": "User not found"}), 404
+    try:
+        ops = BulkTaskService.parse_request(request.get_json() or {})
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    tasks = BulkTaskService.get_tasks(ops["task_ids"])
+    missing = [task_id for task_id in ops["task_ids"] if task_id not in tasks]
+    if missing:
+        return jsonify({"error": "Task not found", "task_ids": missing}), 404
+
+    # One access check per project, however many of its tasks are in the request
+    project_ids = {row["project_id"] for row in ops["create"]} | {t.project_id for t in tasks.values()}
+    for project_id in sorted(project_ids):
+        project = ProjectService.get_project_by_id(project_id)
+        if not project:
+            return jsonify({"error": "Project not found", "project_id": project_id}), 404
+        if user.role != "ADMIN" and not ProjectService.is_project_member(project, user.id):
+            return jsonify({"error": "Access denied", "project_id": project_id}), 403
+
+    result = BulkTaskService.apply(ops, tasks, user.id)
+    return jsonify({"message": "Bulk operation applied", **result}), 200
+
+
 @task_bp.route("/project/<int:project_id>", methods=["GET"])
 @jwt_required()
 def get_tasks(project_id):
@@ -60,12 +92,39 @@ def get_tasks(project_id):
     if user.role != "ADMIN" and not ProjectService.is_project_member(project, user.id):
         return jsonify({"error": "Access denied"}), 403
 
+    # The project version changes with every write that could alter this list
+    etag = request_etag(project)
+    if not_modified(etag):
+        return not_modified_response(etag)
+
     status = request.args.get("status")
     priority = request.args.get("priority")
-    tasks = TaskService.get_tasks_by_project(project_id, status=status, priority=priority)
+    next_cursor = None
+    if request.args.get("paginate", "true").lower() == "false":
+        # Legacy behaviour for old clients: every task in one response
+        tasks = TaskService.get_tasks_by_project(project_id, status=status, priority=priority)
+    else:
+        sort = request.args.get("sort", "created_at")
+        if sort not in SORT_KEYS:
+            return jsonify({"error": f"Invalid sort. Must be one of: {', '.join(SORT_KEYS)}"}), 400
+        order = request.args.get("order")
+        if order not in (None, "asc", "desc"):
+            return jsonify({"error": "Invalid order. Must be asc or desc"}), 400
+        limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+        try:
+            tasks, next_cursor = TaskService.get_tasks_page(
+                project_id, status=status, priority=priority, sort=sort, order=order,
+                limit=limit, cursor=request.args.get("cursor"),
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
     summary = TaskService.get_task_summary(project_id)
 
-    return jsonify({"tasks": [t.to_dict() for t in tasks], "summary": summary}), 200
+    return with_etag(jsonify({
+        "tasks": TaskService.serialize_tasks(tasks),
+        "summary": summary,
+        "next_cursor": next_cursor,
+    }), etag), 200
 
 
 @task_bp.route("/<int:task_id>", methods=["PUT"])
@@ -131,7 +190,7 @@ def delete_task(task_id):
 @task_bp.route("/<int:task_id>/activity", methods=["GET"])
 @jwt_required()
 def get_task_activity(task_id: int):
-    """Get activity logs for a task"""
+    """Get a page of a task's activity, newest first, across the hot and archived history"""
     user = get_current_user()
     if not user:
         return jsonify({"error": "User not found"}), 404
@@ -147,5 +206,13 @@ def get_task_activity(task_id: int):
     if user.role != "ADMIN" and not ProjectService.is_project_member(project, user.id):
         return jsonify({"error": "Access denied"}), 403
     
-    activities = ActivityLog.query.filter_by(task_id=task_id).order_by(ActivityLog.created_at.desc()).all()  # type: ignore
-    return jsonify([activity.to_dict() for activity in activities]), 200
+    limit = request.args.get("limit", DEFAULT_ACTIVITY_PAGE_SIZE, type=int)
+    try:
+        activities, next_cursor = ActivityService.get_task_activity_page(task_id, limit, request.args.get("cursor"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({
+        "activities": activities,
+        "next_cursor": next_cursor,
+        "summary": ActivityService.get_task_activity_summary(task_id),
+    }), 200
@@ -0,0 +1,153 @@
+"""
+Task activity history across the hot and archive tiers.
+
+Recent entries live in ``activity_logs``. ``compact`` moves entries older than
+the retention window into compressed per-task ``activity_archive`` segments
+and keeps a running ``activity_summaries`` row per task. Reads page across
+both tiers with one keyset cursor on (created_at, id), which archived entries
+keep from their original rows.
+"""
+import base64
+import json
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, func, or_
+
+from app.extensions import db
+from app.models.activity_archive import ActivityArchive, ActivitySummary
+from app.models.activity_log import ActivityLog
+from app.models.user import User
+
+DEFAULT_ACTIVITY_PAGE_SIZE = 50
+MAX_ACTIVITY_PAGE_SIZE = 200
+
+
+def _entry(log: ActivityLog) -> Dict[str, Any]:
+    return {
+        "id": log.id,
+        "task_id": log.task_id,
+        "user_id": log.user_id,
+        "action": log.action,
+        "field_changed": log.field_changed,
+        "old_value": log.old_value,
+        "new_value": log.new_value,
+        "created_at": log.created_at.isoformat(),
+    }
+
+
+def _key(entry: Dict[str, Any]) -> Tuple[datetime, int]:
+    return datetime.fromisoformat(entry["created_at"]), entry["id"]
+
+
+def _encode_cursor(entry: Dict[str, Any]) -> str:
+    payload = {"c": entry["created_at"], "i": entry["id"]}
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+class ActivityService:
+    @staticmethod
+    def get_task_activity_page(task_id: int, limit: int = DEFAULT_ACTIVITY_PAGE_SIZE,
+                               cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Return one page of a task's activity, newest first, and the cursor for the next page.
+
+        Raises ValueError for a malformed cursor.
+        """
+        limit = max(1, min(limit, MAX_ACTIVITY_PAGE_SIZE))
+        before = _decode_cursor(cursor) if cursor else None
+
+        query = ActivityLog.query.filter_by(task_id=task_id)
+        if before:
+            query = query.filter(or_(
+                ActivityLog.created_at < before[0],
+                and_(ActivityLog.created_at == before[0], ActivityLog.id < before[1]),
+            ))
+        entries = [_entry(log) for log in query.order_by(
+            ActivityLog.created_at.desc(), ActivityLog.id.desc()).limit(limit + 1).all()]  # type: ignore
+
+        # Archived entries are older than the retention cutoff, so they are only
+        # needed once the hot page runs short (or overlaps a segment's range)
+        segments = ActivityArchive.query.filter_by(task_id=task_id)
+        if before:
+            segments = segments.filter(ActivityArchive.first_at <= before[0])
+        if len(entries) > limit:
+            segments = segments.filter(ActivityArchive.last_at >= _key(entries[-1])[0])
+        archived: List[Dict[str, Any]] = []
+        for segment in segments.order_by(ActivityArchive.last_at.desc(), ActivityArchive.id.desc()).all():  # type: ignore
+            archived += [e for e in segment.load_entries() if before is None or _key(e) < before]
+            if len(archived) > limit:
+                break
+
+        entries = sorted(entries + archived, key=_key, reverse=True)
+        next_cursor = None
+        if len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = _encode_cursor(entries[-1])
+        return ActivityService._with_users(entries), next_cursor
+
+    @staticmethod
+    def _with_users(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Attach each entry's user with one query, matching ActivityLog.to_dict()."""
+        user_ids = {e["user_id"] for e in entries}
+        users = {u.id: u for u in User.query.filter(User.id.in_(user_ids)).all()} if user_ids else {}  # type: ignore
+        for entry in entries:
+            user = users.get(entry["user_id"])
+            entry["user"] = user.to_dict() if user else None
+        return entries
+
+    @staticmethod
+    def get_task_activity_summary(task_id: int) -> Dict[str, Any]:
+        """Entry counts for a task's whole history, without reading the archive."""
+        summary = db.session.get(ActivitySummary, task_id)
+        hot = db.session.query(func.count(ActivityLog.id)).filter(ActivityLog.task_id == task_id).scalar()
+        archived = summary.to_dict() if summary else ActivitySummary(task_id).to_dict()
+        return {"total": hot + archived["archived_count"], "hot_count": hot, **archived}
+
+    @staticmethod
+    def compact(older_than: datetime, chunk_size: int = 1000, max_chunks: Optional[int] = None,
+                pause: float = 0.0) -> Tuple[int, int]:
+        """Move activity older than ``older_than`` into the archive.
+
+        Works through the oldest entries ``chunk_size`` at a time, committing
+        each chunk in its own short transaction so no lock is held for long;
+        ``pause`` sleeps between chunks to leave room for other writers.
+        Returns (entries archived, segments written).
+        """
+        moved = segments = chunks = 0
+        while max_chunks is None or chunks < max_chunks:
+            logs = (
+                ActivityLog.query.filter(ActivityLog.created_at < older_than)
+                .order_by(ActivityLog.id).limit(chunk_size).all()  # type: ignore
+            )
+            if not logs:
+                break
+            by_task: "OrderedDict[int, List[Dict[str, Any]]]" = OrderedDict()
+            for log in sorted(logs, key=lambda log: (log.created_at, log.id)):
+                by_task.setdefault(log.task_id, []).append(_entry(log))
+            for task_id, entries in by_task.items():
+                db.session.add(ActivityArchive(task_id, entries))
+                summary = db.session.get(ActivitySummary, task_id)
+                if summary is None:
+                    summary = ActivitySummary(task_id)
+                    db.session.add(summary)
+                summary.add(entries)
+            db.session.execute(delete(ActivityLog).where(ActivityLog.id.in_([log.id for log in logs])),
+                               execution_options={"synchronize_session": False})
+            db.session.commit()
+            db.session.expunge_all()  # Keep memory flat across chunks
+            moved += len(logs)
+            segments += len(by_task)
+            chunks += 1
+            if pause:
+                time.sleep(pause)
+        return moved, segments
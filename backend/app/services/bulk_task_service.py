@@ -0,0 +1,354 @@
+"""
+Bulk task writes for ``POST /api/tasks/bulk``.
+
+A bulk request is validated up front, then applied in one transaction with
+set-based statements: multi-row INSERTs and executemany UPDATEs for created and
+updated tasks, one ``UPDATE ... WHERE id IN`` per status move and one
+``DELETE ... WHERE id IN`` per table for deletes. Because these statements
+bypass the unit of work, change tracking does not see them; the activity log
+rows, notifications, status counter deltas, search index entries, project
+version bumps and change events are computed here instead and written (or, for
+events, published after commit) with the same transaction.
+"""
+from collections import Counter, defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, insert, select, update
+
+from app.extensions import db
+from app.models.activity_archive import ActivityArchive, ActivitySummary
+from app.models.activity_log import ActivityLog
+from app.models.comment import Comment
+from app.models.label import task_labels
+from app.models.notification import PendingNotification
+from app.models.task import Task
+from app.models.user import User
+from app.services.change_tracking import (TRACKED_FIELDS, bump_project_versions, format_value,
+                                          mark_notifications_queued, queue_events)
+from app.services.search_service import SearchService, inverted_index_enabled
+from app.services.task_service import TaskService
+
+MAX_BULK_TASKS = 5000
+
+# Core executemany needs every parameter set to have the same keys
+LOG_DEFAULTS = {"field_changed": None, "old_value": None, "new_value": None}
+
+TASK_STATUSES = tuple(Task.__table__.c.status.type.enums)
+TASK_PRIORITIES = tuple(Task.__table__.c.priority.type.enums)
+
+
+def _parse_date(value) -> Optional[date]:
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise ValueError("Invalid date format. Use YYYY-MM-DD")
+
+
+def _task_fields(item: Dict[str, Any], where: str) -> Dict[str, Any]:
+    """Validate the writable fields present in one create/update item."""
+    fields = {}
+    for field in TRACKED_FIELDS:
+        if field not in item:
+            continue
+        value = item[field]
+        if field == "due_date":
+            value = _parse_date(value)
+        elif field == "status" and value not in TASK_STATUSES:
+            raise ValueError(f"{where}: invalid status. Must be one of: {', '.join(TASK_STATUSES)}")
+        elif field == "priority" and value not in TASK_PRIORITIES:
+            raise ValueError(f"{where}: invalid priority. Must be one of: {', '.join(TASK_PRIORITIES)}")
+        elif field == "title" and not value:
+            raise ValueError(f"{where}: title cannot be empty")
+        elif field == "assigned_to" and value is not None and (isinstance(value, bool) or not isinstance(value, int)):
+            raise ValueError(f"{where}: assigned_to must be a user id or null")
+        fields[field] = value
+    return fields
+
+
+def _id(value, where: str) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{where} must be an integer id")
+
+
+def _ids(values, where: str) -> List[int]:
+    if not isinstance(values, list):
+        raise ValueError(f"{where} must be a list of task ids")
+    try:
+        return [int(v) for v in values]
+    except (TypeError, ValueError):
+        raise ValueError(f"{where} must be a list of task ids")
+
+
+def _check_assignees(rows: List[Dict[str, Any]]) -> None:
+    """Reject assignees that are not users, in one query for the whole request."""
+    user_ids = {row["assigned_to"] for row in rows if row.get("assigned_to") is not None}
+    if not user_ids:
+        return
+    found = set(db.session.scalars(select(User.id).where(User.id.in_(user_ids))))
+    missing = sorted(user_ids - found)
+    if missing:
+        raise ValueError(f"Assignee not found: {', '.join(str(user_id) for user_id in missing)}")
+
+
+class BulkTaskService:
+    @staticmethod
+    def parse_request(data: Any) -> Dict[str, Any]:
+        """Validate a bulk request body and normalise it.
+
+        Accepted keys (all optional, at least one required)::
+
+            create:      [{title, project_id, description?, assigned_to?, priority?, due_date?}]
+            update:      [{id, <any of title/description/status/priority/assigned_to/due_date>}]
+            move_status: {task_ids: [...], status}
+            delete:      [task ids]
+
+        Raises ValueError with a client-facing message.
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Request body must be a JSON object")
+        creates, updates = [], []
+        for i, item in enumerate(data.get("create") or []):
+            where = f"create[{i}]"
+            if not isinstance(item, dict) or not item.get("title") or not item.get("project_id"):
+                raise ValueError(f"{where}: title and project_id are required")
+            row = {"description": "", "assigned_to": None, "priority": "MEDIUM", "due_date": None}
+            row.update(_task_fields(item, where))
+            row["status"] = "TODO"
+            row["project_id"] = _id(item["project_id"], f"{where}.project_id")
+            creates.append(row)
+
+        for i, item in enumerate(data.get("update") or []):
+            where = f"update[{i}]"
+            if not isinstance(item, dict) or not item.get("id"):
+                raise ValueError(f"{where}: id is required")
+            updates.append(dict(_task_fields(item, where), id=_id(item["id"], f"{where}.id")))
+
+        move_ids, move_status = [], None
+        move = data.get("move_status")
+        if move:
+            move_ids = _ids(move.get("task_ids") if isinstance(move, dict) else None, "move_status.task_ids")
+            move_status = move.get("status")
+            if move_status not in TASK_STATUSES:
+                raise ValueError(f"move_status: invalid status. Must be one of: {', '.join(TASK_STATUSES)}")
+
+        delete_ids = _ids(data.get("delete") or [], "delete")
+
+        existing = [u["id"] for u in updates] + move_ids + delete_ids
+        total = len(creates) + len(existing)
+        if not total:
+            raise ValueError("Nothing to do: provide create, update, move_status or delete")
+        if total > MAX_BULK_TASKS:
+            raise ValueError(f"Too many tasks in one request (max {MAX_BULK_TASKS})")
+        if len(set(existing)) != len(existing):
+            raise ValueError("Each task may appear only once across update, move_status and delete")
+        _check_assignees(creates + updates)
+
+        return {"create": creates, "update": updates, "move_ids": move_ids, "move_status": move_status,
+                "delete": delete_ids, "task_ids": existing}
+
+    @staticmethod
+    def get_tasks(task_ids: List[int]) -> Dict[int, Task]:
+        if not task_ids:
+            return {}
+        return {t.id: t for t in Task.query.filter(Task.id.in_(task_ids)).all()}  # type: ignore
+
+    @staticmethod
+    def apply(ops: Dict[str, Any], tasks: Dict[int, Task], actor_id: int) -> Dict[str, Any]:
+        """Apply a parsed bulk request in a single transaction.
+
+        ``tasks`` are the existing tasks referenced by the request, already
+        loaded and access-checked by the caller. Returns the created task ids
+        and the number of tasks changed by each operation.
+        """
+        actor_id = int(actor_id)
+        logs: List[Dict[str, Any]] = []
+        # One notification per assignee and task: an assignment wins over
+        # field updates, and a status change over other fields.
+        notices: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        deltas: Dict[int, Counter] = defaultdict(Counter)
+
+        user_ids = {r["assigned_to"] for r in ops["create"] if r["assigned_to"]}
+        user_ids |= {u["assigned_to"] for u in ops["update"] if u.get("assigned_to")}
+        user_ids |= {t.assigned_to for t in tasks.values() if t.assigned_to}
+        users = {u.id: u for u in User.query.filter(User.id.in_(user_ids)).all()} if user_ids else {}  # type: ignore
+
+        def name(user_id):
+            user = users.get(user_id)
+            return format_value(user.name if user else user_id)
+
+        def notify(recipient_id, task_id, kind, field=None, old=None, new=None):
+            if not recipient_id or recipient_id == actor_id or recipient_id not in users:
+                return
+            key = (recipient_id, task_id)
+            current = notices.get(key)
+            if current and (current["kind"] == "assigned" or current["field_changed"] == "status"):
+                return
+            notices[key] = {"user_id": recipient_id, "task_id": task_id, "actor_id": actor_id, "kind": kind,
+                            "field_changed": field, "old_value": old, "new_value": new}
+
+        def record(task_id, assignee_id, field, old, new):
+            if field == "assigned_to":
+                logs.append({"task_id": task_id, "user_id": actor_id, "action": "assigned",
+                             "field_changed": "assignee", "old_value": name(old) if old else None,
+                             "new_value": name(new) if new else None})
+                notify(new, task_id, "assigned")
+            else:
+                old, new = format_value(old), format_value(new)
+                logs.append({"task_id": task_id, "user_id": actor_id, "action": "updated",
+                             "field_changed": field, "old_value": old, "new_value": new})
+                notify(assignee_id, task_id, "updated", field, old, new)
+
+        try:
+            created_ids = BulkTaskService._insert_tasks(ops["create"])
+            for task_id, row in zip(created_ids, ops["create"]):
+                deltas[row["project_id"]]["TODO"] += 1
+                logs.append({"task_id": task_id, "user_id": actor_id, "action": "created"})
+                if row["assigned_to"]:
+                    record(task_id, None, "assigned_to", None, row["assigned_to"])
+
+            # Rows with the same set of changed columns share one executemany
+            batches: Dict[Tuple[str, ...], List[Dict[str, Any]]] = defaultdict(list)
+            for item in ops["update"]:
+                task = tasks[item["id"]]
+                changes = {f: v for f, v in item.items() if f != "id" and getattr(task, f) != v}
+                if not changes:
+                    continue
+                batches[tuple(sorted(changes))].append(dict(changes, id=task.id))
+                assignee_id = changes.get("assigned_to", task.assigned_to)
+                for field in TRACKED_FIELDS:
+                    if field in changes:
+                        record(task.id, assignee_id, field, getattr(task, field), changes[field])
+                if "status" in changes:
+                    deltas[task.project_id][task.status] -= 1
+                    deltas[task.project_id][changes["status"]] += 1
+            for rows in batches.values():
+                db.session.execute(update(Task), rows)
+
+            moved = [tasks[i] for i in ops["move_ids"] if tasks[i].status != ops["move_status"]]
+            if moved:
+                db.session.execute(
+                    update(Task).where(Task.id.in_([t.id for t in moved])).values(status=ops["move_status"]),
+                    execution_options={"synchronize_session": False},
+                )
+                for task in moved:
+                    record(task.id, task.assigned_to, "status", task.status, ops["move_status"])
+                    deltas[task.project_id][task.status] -= 1
+                    deltas[task.project_id][ops["move_status"]] += 1
+
+            if ops["delete"]:
+                BulkTaskService._delete_tasks(ops["delete"])
+                for task_id in ops["delete"]:
+                    deltas[tasks[task_id].project_id][tasks[task_id].status] -= 1
+
+            if logs:
+                db.session.execute(insert(ActivityLog.__table__), [dict(LOG_DEFAULTS, **log) for log in logs])
+            BulkTaskService._queue_notifications(list(notices.values()), users)
+            for project_id, project_deltas in deltas.items():
+                TaskService.adjust_task_stats(project_id, dict(project_deltas))
+            if inverted_index_enabled():
+                BulkTaskService._update_search_index(ops, tasks, created_ids, batches)
+            bump_project_versions({t.project_id for t in tasks.values()} | {r["project_id"] for r in ops["create"]})
+            queue_events(BulkTaskService._events(ops, tasks, created_ids, batches, moved))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return {
+            "created": created_ids,
+            "updated": sum(len(rows) for rows in batches.values()),
+            "moved": len(moved),
+            "deleted": len(ops["delete"]),
+        }
+
+    @staticmethod
+    def _events(ops: Dict[str, Any], tasks: Dict[int, Task], created_ids: List[int],
+                batches: Dict[Tuple[str, ...], List[Dict[str, Any]]], moved: List[Task]) -> List[Dict[str, Any]]:
+        """One ``tasks.bulk`` change event per affected project."""
+        def value(v):
+            return v.isoformat() if isinstance(v, date) else v
+
+        events: Dict[int, Dict[str, Any]] = {}
+
+        def event(project_id):
+            return events.setdefault(project_id, {
+                "type": "tasks.bulk", "project_id": project_id,
+                "data": {"created": [], "updated": [], "deleted": []},
+            })["data"]
+
+        for task_id, row in zip(created_ids, ops["create"]):
+            event(row["project_id"])["created"].append(
+                {"id": task_id, **{field: value(row[field]) for field in TRACKED_FIELDS}})
+        for rows in batches.values():
+            for row in rows:
+                event(tasks[row["id"]].project_id)["updated"].append({k: value(v) for k, v in row.items()})
+        for task in moved:
+            event(task.project_id)["updated"].append({"id": task.id, "status": ops["move_status"]})
+        for task_id in ops["delete"]:
+            event(tasks[task_id].project_id)["deleted"].append(task_id)
+        return list(events.values())
+
+    @staticmethod
+    def _update_search_index(ops: Dict[str, Any], tasks: Dict[int, Task], created_ids: List[int],
+                             batches: Dict[Tuple[str, ...], List[Dict[str, Any]]]) -> None:
+        reindex = [(task_id, row["project_id"], row["title"], row["description"])
+                   for task_id, row in zip(created_ids, ops["create"])]
+        for fields, rows in batches.items():
+            if "title" in fields or "description" in fields:
+                for row in rows:
+                    task = tasks[row["id"]]
+                    reindex.append((task.id, task.project_id, row.get("title", task.title),
+                                    row.get("description", task.description)))
+        SearchService.remove(task_ids=ops["delete"])
+        SearchService.index_tasks(reindex)
+
+    @staticmethod
+    def _insert_tasks(rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert tasks and return their ids in input order."""
+        if not rows:
+            return []
+        now = datetime.utcnow()
+        rows = [dict(row, created_at=now) for row in rows]
+        if db.engine.dialect.insert_executemany_returning:
+            # SQLite/PostgreSQL/MariaDB: batched multi-row INSERT ... RETURNING. Ids are
+            # allocated in VALUES order, so sorting them restores the input order
+            # (sort_by_parameter_order would fall back to one INSERT per row here).
+            return sorted(db.session.scalars(insert(Task.__table__).returning(Task.id), rows))
+        # MySQL has no RETURNING, so ids come back one row at a time via the unit of work
+        new_tasks = [Task(**row) for row in rows]
+        db.session.add_all(new_tasks)
+        db.session.flush()
+        return [t.id for t in new_tasks]
+
+    @staticmethod
+    def _delete_tasks(task_ids: List[int]) -> None:
+        # Dependent rows are removed explicitly; SQLite does not enforce ON DELETE CASCADE by default
+        options = {"synchronize_session": False}
+        db.session.execute(delete(Comment).where(Comment.task_id.in_(task_ids)), execution_options=options)
+        db.session.execute(delete(ActivityLog).where(ActivityLog.task_id.in_(task_ids)), execution_options=options)
+        db.session.execute(delete(ActivityArchive).where(ActivityArchive.task_id.in_(task_ids)),
+                           execution_options=options)
+        db.session.execute(delete(ActivitySummary).where(ActivitySummary.task_id.in_(task_ids)),
+                           execution_options=options)
+        db.session.execute(delete(PendingNotification).where(PendingNotification.task_id.in_(task_ids)),
+                           execution_options=options)
+        db.session.execute(task_labels.delete().where(task_labels.c.task_id.in_(task_ids)))
+        db.session.execute(delete(Task).where(Task.id.in_(task_ids)), execution_options=options)
+
+    @staticmethod
+    def _queue_notifications(rows: List[Dict[str, Any]], users: Dict[int, User]) -> None:
+        from app.services.notification_service import email_enabled
+        from app.services.notification_queue import deliver_after
+
+        if not rows or not email_enabled():
+            return
+        now = datetime.utcnow()
+        for row in rows:
+            row["deliver_after"] = deliver_after(users[row["user_id"]], now)
+        db.session.execute(insert(PendingNotification.__table__), rows)
+        mark_notifications_queued()
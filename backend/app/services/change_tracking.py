@@ -0,0 +1,349 @@
+"""
+Change tracking for task writes.
+
+A ``before_flush`` hook reads SQLAlchemy attribute history on new and modified
+tasks (and new comments) and adds the matching ActivityLog and
+PendingNotification rows to the same flush, so a task write and its audit trail
+commit together. After the commit, the email outbox workers are woken if any
+notification was queued.
+
+Task changes are only recorded when an actor is set for the transaction with
+``set_actor`` (TaskService does this for user-initiated writes).
+
+Every flush that writes a project, task, comment, label or membership also bumps
+the affected projects' ``version``, which the read endpoints turn into ETags.
+Writes made with Core statements must call ``bump_project_versions`` themselves.
+Committed user changes bump the response cache's ``users`` namespace and drop
+the users' cached token claims (a role change also bumps the user's
+``token_version``, revoking tokens that carry the old role), and new,
+edited or deleted task text and comments are reindexed for search (when the
+search_postings inverted index is in use).
+
+Change events (compact deltas of task, comment, label and membership writes)
+are collected per flush and published to the event broker once the
+transaction commits, for the project event streams.
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from flask import has_app_context
+from sqlalchemy import event, inspect, update
+
+from app.extensions import db
+from app.models.activity_log import ActivityLog
+from app.models.comment import Comment
+from app.models.label import Label
+from app.models.notification import PendingNotification
+from app.models.project import Project, ProjectMember
+from app.models.task import Task
+from app.models.user import User
+from app.services.search_service import SearchService, inverted_index_enabled
+from app.utils.event_broker import event_broker
+from app.utils.response_cache import response_cache
+from app.utils.user_claims_cache import user_claims_cache
+
+TRACKED_FIELDS = ("title", "description", "status", "priority", "assigned_to", "due_date")
+MAX_VALUE_LENGTH = 200  # ActivityLog.old_value / new_value column size
+
+
+def set_actor(user_id: Optional[int]) -> None:
+    """Attribute the current transaction's task changes to ``user_id``."""
+    if user_id is None:
+        db.session.info.pop("actor_id", None)
+    else:
+        db.session.info["actor_id"] = int(user_id)  # JWT identities arrive as strings
+
+
+def mark_notifications_queued(session=None) -> None:
+    """Wake the outbox workers once the current transaction commits."""
+    (session or db.session).info["notifications_queued"] = True
+
+
+def bump_project_versions(project_ids: Iterable[int], session=None) -> None:
+    """Increment the version of each project in the current transaction."""
+    project_ids = sorted({pid for pid in project_ids if pid})
+    if project_ids:
+        (session or db.session).execute(
+            update(Project).where(Project.id.in_(project_ids)).values(version=Project.version + 1),
+            execution_options={"synchronize_session": False},
+        )
+
+
+def queue_events(events: Iterable[Dict[str, Any]], session=None) -> None:
+    """Publish change events once the current transaction commits."""
+    (session or db.session).info.setdefault("events", []).extend(events)
+
+
+def format_value(value) -> Optional[str]:
+    """Render a field value the way ActivityLog and notifications store it."""
+    if value is None:
+        return None
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:MAX_VALUE_LENGTH]
+
+
+def _user(session, user_id: Optional[int]) -> Optional[User]:
+    if user_id is None:
+        return None
+    with session.no_autoflush:
+        return session.get(User, user_id)
+
+
+class _Changes:
+    """Activity and notifications collected during one flush."""
+
+    def __init__(self, session):
+        self.session = session
+        self.notifications_enabled = None
+
+    def log(self, task: Task, actor_id: int, action: str, field_changed: Optional[str] = None,
+            old_value: Optional[str] = None, new_value: Optional[str] = None) -> None:
+        activity = ActivityLog(task_id=task.id, user_id=actor_id, action=action, field_changed=field_changed,
+                               old_value=old_value, new_value=new_value)
+        activity.task = task  # Lets the unit of work insert it after a new task
+        self.session.add(activity)
+
+    def notify(self, recipient_id: Optional[int], task: Task, actor_id: int, kind: str, **details) -> None:
+        if not recipient_id or recipient_id == actor_id:
+            return
+        if self.notifications_enabled is None:
+            from app.services.notification_service import email_enabled
+            self.notifications_enabled = has_app_context() and email_enabled()
+        if not self.notifications_enabled:
+            return
+        recipient = _user(self.session, recipient_id)
+        if recipient is None:
+            return
+        from app.services.notification_queue import deliver_after
+        notification = PendingNotification(user_id=recipient.id, task_id=task.id, actor_id=actor_id, kind=kind,
+                                           deliver_after=deliver_after(recipient), **details)
+        notification.task = task
+        self.session.add(notification)
+        mark_notifications_queued(self.session)
+
+
+def _track_new_task(changes: _Changes, task: Task, actor_id: int) -> None:
+    changes.log(task, actor_id, "created")
+    if task.assigned_to:
+        assignee = _user(changes.session, task.assigned_to)
+        changes.log(task, actor_id, "assigned", field_changed="assignee",
+                    new_value=format_value(assignee.name if assignee else task.assigned_to))
+        changes.notify(task.assigned_to, task, actor_id, "assigned")
+
+
+def _track_task_update(changes: _Changes, task: Task, actor_id: int) -> None:
+    state = inspect(task)
+    updated: List[tuple] = []
+    for field in TRACKED_FIELDS:
+        history = state.attrs[field].history
+        if not history.has_changes():
+            continue
+        old = history.deleted[0] if history.deleted else None
+        new = history.added[0] if history.added else None
+        if old == new:
+            continue
+        if field == "assigned_to":
+            old_user, new_user = _user(changes.session, old), _user(changes.session, new)
+            changes.log(task, actor_id, "assigned", field_changed="assignee",
+                        old_value=format_value(old_user.name if old_user else old),
+                        new_value=format_value(new_user.name if new_user else new))
+            changes.notify(new, task, actor_id, "assigned")
+        else:
+            changes.log(task, actor_id, "updated", field_changed=field, old_value=format_value(old), new_value=format_value(new))
+            updated.append((field, format_value(old), format_value(new)))
+    for field, old, new in updated:
+        changes.notify(task.assigned_to, task, actor_id, "updated", field_changed=field,
+                       old_value=old, new_value=new)
+
+
+def _track_new_comment(changes: _Changes, comment: Comment) -> None:
+    with changes.session.no_autoflush:
+        task = comment.task or changes.session.get(Task, comment.task_id)
+    if task is not None:
+        changes.notify(task.assigned_to, task, int(comment.user_id), "commented", content=comment.content)
+
+
+def _project_id(session, obj) -> Optional[int]:
+    """The project a flushed object belongs to, for version bumps."""
+    if isinstance(obj, Project):
+        return obj.id
+    if isinstance(obj, (Task, Label, ProjectMember)):
+        return obj.project_id
+    if isinstance(obj, Comment):
+        with session.no_autoflush:
+            task = obj.task or session.get(Task, obj.task_id)
+        return task.project_id if task is not None else None
+    return None
+
+
+def _touched_projects(session) -> Set[int]:
+    touched = set()
+    for obj in list(session.new) + list(session.deleted):
+        touched.add(_project_id(session, obj))
+    for obj in list(session.dirty):
+        if isinstance(obj, (Project, Task, Comment, Label, ProjectMember)) and session.is_modified(obj):
+            touched.add(_project_id(session, obj))
+    touched.discard(None)  # New projects have no id yet; they start at version 0 anyway
+    return touched
+
+
+def _text_changed(obj, *fields) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[field].history.has_changes() for field in fields)
+
+
+def _collect_search_changes(session) -> None:
+    pending = session.info.setdefault("search_changes", {
+        "tasks": set(), "comments": set(), "deleted_tasks": set(), "deleted_comments": set(),
+        "deleted_projects": set(),
+    })
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Task) and (obj in session.new or _text_changed(obj, "title", "description")):
+            pending["tasks"].add(obj)
+        elif isinstance(obj, Comment) and (obj in session.new or _text_changed(obj, "content")):
+            pending["comments"].add(obj)
+    for obj in list(session.deleted):
+        if isinstance(obj, Task):
+            pending["deleted_tasks"].add(obj.id)
+        elif isinstance(obj, Comment):
+            pending["deleted_comments"].add(obj.id)
+        elif isinstance(obj, Project):
+            pending["deleted_projects"].add(obj.id)
+
+
+def _update_search_index(session, pending) -> None:
+    SearchService.remove(pending["deleted_tasks"], pending["deleted_comments"], pending["deleted_projects"], session)
+    SearchService.index_tasks(
+        [(t.id, t.project_id, t.title, t.description) for t in pending["tasks"] if t.id not in pending["deleted_tasks"]],
+        session,
+    )
+    comments = []
+    for comment in pending["comments"]:
+        project_id = _project_id(session, comment)
+        if project_id and comment.id not in pending["deleted_comments"]:
+            comments.append((comment.id, comment.task_id, project_id, comment.content))
+    SearchService.index_comments(comments, session)
+
+
+def _event_value(value):
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _event_payload(obj) -> Dict[str, Any]:
+    if isinstance(obj, Task):
+        fields = ("id",) + TRACKED_FIELDS + ("created_at",)
+    elif isinstance(obj, Comment):
+        fields = ("id", "task_id", "user_id", "content", "created_at", "updated_at")
+    elif isinstance(obj, Label):
+        fields = ("id", "name", "color")
+    else:  # ProjectMember
+        fields = ("user_id", "role")
+    return {field: _event_value(getattr(obj, field)) for field in fields}
+
+
+EVENT_NAMES = {Task: "task", Comment: "comment", Label: "label", ProjectMember: "member"}
+
+
+def _collect_events(session) -> None:
+    """Note what changed; payloads are built after the flush, once new rows have ids."""
+    pending = session.info.setdefault("pending_events", [])
+    for obj in list(session.new):
+        if type(obj) in EVENT_NAMES:
+            pending.append((obj, "created", None))
+    for obj in list(session.dirty):
+        if type(obj) in EVENT_NAMES and session.is_modified(obj):
+            state = inspect(obj)
+            changed = [attr.key for attr in state.attrs if attr.history.has_changes()]
+            pending.append((obj, "updated", changed))
+    for obj in list(session.deleted):
+        if type(obj) in EVENT_NAMES:
+            # Deleted rows are gone after the flush, so build their payload now
+            key = {"user_id": obj.user_id} if isinstance(obj, ProjectMember) else {"id": obj.id}
+            if isinstance(obj, Comment):
+                key["task_id"] = obj.task_id
+            event = {"type": f"{EVENT_NAMES[type(obj)]}.deleted", "project_id": _project_id(session, obj),
+                     "data": key}
+            session.info.setdefault("events", []).append(event)
+
+
+def _build_events(session, pending) -> None:
+    events = []
+    for obj, action, changed in pending:
+        name = EVENT_NAMES[type(obj)]
+        data = _event_payload(obj)
+        if action == "updated" and isinstance(obj, Task):
+            # Only the changed fields, plus label ids when the label set changed
+            data = {"id": obj.id, **{k: v for k, v in data.items() if k in changed}}
+            if "labels" in changed:
+                data["labels"] = [label.id for label in obj.labels]
+            if len(data) == 1:
+                continue
+        events.append({"type": f"{name}.{action}", "project_id": _project_id(session, obj), "data": data})
+    queue_events([e for e in events if e["project_id"]], session)
+
+
+def _before_flush(session, flush_context, instances) -> None:
+    session.info.setdefault("touched_projects", set()).update(_touched_projects(session))
+    if inverted_index_enabled():
+        _collect_search_changes(session)
+    _collect_events(session)
+    users = [obj for obj in list(session.new) + list(session.dirty) + list(session.deleted) if isinstance(obj, User)]
+    if users:
+        session.info["users_changed"] = True
+        for user in users:
+            if user in session.dirty and inspect(user).attrs.role.history.has_changes() \
+                    and not inspect(user).attrs.token_version.history.has_changes():
+                user.revoke_tokens()
+        session.info.setdefault("changed_user_ids", set()).update(u.id for u in users if u.id is not None)
+    actor_id = session.info.get("actor_id")
+    changes = _Changes(session)
+    for obj in list(session.new):
+        if isinstance(obj, Task) and actor_id:
+            _track_new_task(changes, obj, actor_id)
+        elif isinstance(obj, Comment):
+            _track_new_comment(changes, obj)
+    if actor_id:
+        for obj in list(session.dirty):
+            if isinstance(obj, Task) and session.is_modified(obj, include_collections=False):
+                _track_task_update(changes, obj, actor_id)
+
+
+def _after_flush(session, flush_context) -> None:
+    bump_project_versions(session.info.pop("touched_projects", ()), session)
+    pending = session.info.pop("search_changes", None)
+    if pending:
+        _update_search_index(session, pending)
+    _build_events(session, session.info.pop("pending_events", ()))
+
+
+def _after_commit(session) -> None:
+    session.info.pop("actor_id", None)
+    if session.info.pop("users_changed", False):
+        response_cache.bump("users")
+    for user_id in session.info.pop("changed_user_ids", ()):
+        user_claims_cache.invalidate(user_id)
+    for event in session.info.pop("events", ()):
+        event_broker.publish(event)
+    if session.info.pop("notifications_queued", False) and has_app_context():
+        from app.services.notification_service import start_outbox_workers
+        start_outbox_workers()
+
+
+def _after_rollback(session, previous_transaction) -> None:
+    session.info.pop("actor_id", None)
+    session.info.pop("touched_projects", None)
+    session.info.pop("search_changes", None)
+    session.info.pop("pending_events", None)
+    session.info.pop("events", None)
+    session.info.pop("users_changed", None)
+    session.info.pop("changed_user_ids", None)
+    session.info.pop("notifications_queued", None)
+
+
+def register_change_tracking() -> None:
+    """Install the session hooks (idempotent)."""
+    for name, fn in (("before_flush", _before_flush), ("after_flush", _after_flush), ("after_commit", _after_commit),
+                     ("after_soft_rollback", _after_rollback)):
+        if not event.contains(db.session, name, fn):
+            event.listen(db.session, name, fn)
@@ -0,0 +1,235 @@
+import random
+import smtplib
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from flask import Flask
+
+from app.extensions import db, mail
+from app.models.email_outbox import EmailOutbox
+from app.services.notification_queue import flush_due_notifications
+from app.utils.metrics import email_failures, emails_queued, emails_sent
+
+MAX_BACKOFF_SECONDS = 3600
+
+
+def enqueue_email(subject: str, recipients: List[str], html_body: str) -> EmailOutbox:
+    """Persist an email for delivery by the outbox workers."""
+    entry = EmailOutbox(subject=subject, recipients=recipients, html_body=html_body)
+    db.session.add(entry)
+    db.session.commit()
+    emails_queued.inc()
+    return entry
+
+
+def claim_batch(batch_size: int, lease_seconds: int) -> List[Dict]:
+    """Claim up to ``batch_size`` due emails for this worker.
+
+    Claimed rows are marked SENDING with a lease; if the worker dies before
+    recording the outcome, the lease expires and another worker picks them up.
+    Rows are locked with SKIP LOCKED where the database supports it so
+    concurrent workers never claim the same email.
+    """
+    now = datetime.utcnow()
+    due = db.and_(EmailOutbox.status.in_(("PENDING", "SENDING")), EmailOutbox.next_attempt_at <= now)  # type: ignore
+    candidate_ids = [
+        row.id for row in
+        db.session.query(EmailOutbox.id)
+        .filter(due)
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .all()
+    ]
+    if not candidate_ids:
+        db.session.rollback()
+        return []
+
+    # The conditional UPDATE is atomic per row, so on databases without SKIP
+    # LOCKED (SQLite) a row claimed by another worker in the meantime is skipped
+    token = uuid.uuid4().hex
+    EmailOutbox.query.filter(EmailOutbox.id.in_(candidate_ids), due).update({  # type: ignore
+        "status": "SENDING",
+        "claim_token": token,
+        "next_attempt_at": now + timedelta(seconds=lease_seconds),
+    }, synchronize_session=False)
+    db.session.commit()
+
+    claimed = [
+        {
+            "id": row.id,
+            "subject": row.subject,
+            "recipients": row.recipient_list,
+            "html_body": row.html_body,
+            "attempts": row.attempts,
+        }
+        for row in EmailOutbox.query.filter_by(claim_token=token).order_by(EmailOutbox.id).all()
+    ]
+    db.session.commit()
+    return claimed
+
+
+def record_results(sent_ids: List[int], failures: Dict[int, str], attempts: Dict[int, int],
+                   max_attempts: int, backoff_seconds: int) -> None:
+    """Mark sent emails and schedule retries (with exponential backoff) for failed ones."""
+    now = datetime.utcnow()
+    if sent_ids:
+        EmailOutbox.query.filter(EmailOutbox.id.in_(sent_ids)).update(  # type: ignore
+            {"status": "SENT", "sent_at": now, "last_error": None}, synchronize_session=False
+        )
+    for email_id, error in failures.items():
+        attempt = attempts[email_id] + 1
+        delay = min(backoff_seconds * 2 ** (attempt - 1), MAX_BACKOFF_SECONDS)
+        EmailOutbox.query.filter_by(id=email_id).update({
+            "status": "FAILED" if attempt >= max_attempts else "PENDING",
+            "attempts": attempt,
+            "last_error": error[:500],
+            "next_attempt_at": now + timedelta(seconds=delay * random.uniform(1.0, 1.2)),
+        }, synchronize_session=False)
+    db.session.commit()
+
+
+class OutboxWorker:
+    """Drains the outbox in batches over one SMTP connection, kept open while there is work."""
+
+    def __init__(self, app: Flask):
+        self.app = app
+        config = app.config
+        self.batch_size = config["EMAIL_OUTBOX_BATCH_SIZE"]
+        self.max_attempts = config["EMAIL_OUTBOX_MAX_ATTEMPTS"]
+        self.backoff_seconds = config["EMAIL_OUTBOX_BACKOFF_SECONDS"]
+        self.lease_seconds = config["EMAIL_OUTBOX_LEASE_SECONDS"]
+        self._connection = None
+
+    def _connect(self):
+        if self._connection is None:
+            connection = mail.connect()
+            self._connection = connection.__enter__()
+        return self._connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            try:
+                self._connection.__exit__(None, None, None)
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._connection = None
+
+    def _send(self, email: Dict) -> None:
+        from flask_mail import Message
+
+        msg = Message(
+            subject=email["subject"],
+            recipients=email["recipients"],
+            html=email["html_body"],
+            sender=self.app.config.get("MAIL_DEFAULT_SENDER"),
+        )
+        try:
+            self._connect().send(msg)
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError):
+            # The server dropped the idle connection; reconnect once and retry
+            self.close()
+            self._connect().send(msg)
+        if mail.suppress:
+            print(f"Email delivery suppressed: {email['subject']} to {email['recipients']}")
+
+    def run_once(self) -> int:
+        """Coalesce due notifications, then claim and deliver one batch of email.
+
+        Returns the number of emails claimed.
+        """
+        with self.app.app_context():
+            flush_due_notifications(lease_seconds=self.lease_seconds)
+            batch = claim_batch(self.batch_size, self.lease_seconds)
+            if not batch:
+                return 0
+            sent_ids: List[int] = []
+            failures: Dict[int, str] = {}
+            for email in batch:
+                try:
+                    self._send(email)
+                    sent_ids.append(email["id"])
+                except Exception as e:
+                    print(f"Error sending email {email['id']}: {str(e)}")
+                    email_failures.inc("delivery")
+                    failures[email["id"]] = str(e)
+                    self.close()
+            emails_sent.inc(value=len(sent_ids))
+            record_results(sent_ids, failures, {e["id"]: e["attempts"] for e in batch},
+                           self.max_attempts, self.backoff_seconds)
+            return len(batch)
+
+    def drain(self) -> int:
+        """Deliver batches until nothing is due. Returns the number of emails processed."""
+        total = 0
+        try:
+            while True:
+                claimed = self.run_once()
+                if not claimed:
+                    return total
+                total += claimed
+        finally:
+            self.close()
+
+
+class OutboxWorkerPool:
+    """A fixed number of worker threads draining the outbox.
+
+    Workers sleep until woken by ``wake()`` (called after an email is queued)
+    or until the poll interval passes, which also picks up retries.
+    """
+
+    def __init__(self):
+        self._threads: List[threading.Thread] = []
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.app: Optional[Flask] = None
+
+    @property
+    def running(self) -> bool:
+        return any(t.is_alive() for t in self._threads)
+
+    def start(self, app: Flask, size: Optional[int] = None) -> None:
+        """Start the workers if they are not already running."""
+        with self._lock:
+            if self.running:
+                return
+            self.app = app
+            self._stop.clear()
+            size = size or app.config["EMAIL_OUTBOX_WORKERS"]
+            self._threads = [
+                threading.Thread(target=self._run, name=f"email-outbox-{n}", daemon=True)
+                for n in range(size)
+            ]
+            for thread in self._threads:
+                thread.start()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        worker = OutboxWorker(self.app)  # type: ignore
+        poll_interval = self.app.config["EMAIL_OUTBOX_POLL_INTERVAL"]  # type: ignore
+        while not self._stop.is_set():
+            try:
+                if worker.run_once():
+                    continue
+            except Exception as e:
+                print(f"Email outbox worker error: {str(e)}")
+            # Idle: release the SMTP connection and wait for new mail or the next poll
+            worker.close()
+            self._wake.wait(poll_interval)
+            self._wake.clear()
+        worker.close()
+
+
+outbox_workers = OutboxWorkerPool()
@@ -0,0 +1,175 @@
+"""
+Streaming export of a project's tasks, comments and activity.
+
+Rows are read with ``yield_per`` (a server-side cursor on MySQL) as plain
+column tuples rather than ORM objects (archived activity in bounded keyset
+batches), and written out in small chunks, so memory use does not depend on the
+size of the project and the first chunk is sent before the first query has
+finished reading.
+"""
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import Any, Dict, Iterator
+
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.orm import aliased
+
+from app.extensions import db
+from app.models.activity_archive import ActivityArchive
+from app.models.activity_log import ActivityLog
+from app.models.comment import Comment
+from app.models.label import Label, task_labels
+from app.models.project import Project
+from app.models.task import Task
+from app.models.user import User
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+YIELD_PER = 1000
+CHUNK_ROWS = 200  # Rows buffered per chunk written to the response
+ARCHIVE_BATCH = 20  # Archive segments each hold many entries
+
+# One flat CSV table for every record type; each type fills the columns it has
+CSV_COLUMNS = [
+    "type", "id", "task_id", "title", "description", "status", "priority", "assigned_to", "assignee",
+    "due_date", "labels", "user_id", "user", "action", "field_changed", "old_value", "new_value",
+    "content", "created_at", "updated_at",
+]
+
+
+def _value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _stream(statement) -> Iterator[Dict[str, Any]]:
+    result = db.session.execute(statement.execution_options(yield_per=YIELD_PER))
+    for row in result.mappings():
+        yield {key: _value(value) for key, value in row.items()}
+
+
+class ExportService:
+    @staticmethod
+    def records(project: Project) -> Iterator[Dict[str, Any]]:
+        """Yield the project, its labels, tasks, comments and activity as flat records."""
+        yield {"type": "project", "id": project.id, "title": project.name, "description": project.description,
+               "user_id": project.owner_id, "created_at": _value(project.created_at)}
+
+        labels = select(Label.id, Label.name, Label.color).where(Label.project_id == project.id).order_by(Label.id)
+        for row in _stream(labels):
+            yield {"type": "label", "id": row["id"], "title": row["name"], "content": row["color"]}
+
+        assignee = aliased(User)
+        label_ids = (
+            select(func.group_concat(task_labels.c.label_id))
+            .where(task_labels.c.task_id == Task.id)
+            .scalar_subquery()
+        )
+        tasks = (
+            select(Task.id, Task.title, Task.description, Task.status, Task.priority, Task.assigned_to,
+                   assignee.name.label("assignee"), Task.due_date, label_ids.label("labels"), Task.created_at)
+            .outerjoin(assignee, assignee.id == Task.assigned_to)
+            .where(Task.project_id == project.id)
+            .order_by(Task.id)
+        )
+        for row in _stream(tasks):
+            row["labels"] = [int(label_id) for label_id in row["labels"].split(",")] if row["labels"] else []
+            yield {"type": "task", **row}
+
+        comments = (
+            select(Comment.id, Comment.task_id, Comment.user_id, User.name.label("user"), Comment.content,
+                   Comment.created_at, Comment.updated_at)
+            .join(Task, Task.id == Comment.task_id)
+            .outerjoin(User, User.id == Comment.user_id)
+            .where(Task.project_id == project.id)
+            .order_by(Comment.id)
+        )
+        for row in _stream(comments):
+            yield {"type": "comment", **row}
+
+        # Archived activity predates everything still in activity_logs. User ids are
+        # inside the compressed segments, so segments are read in fully fetched
+        # keyset batches and each batch's user names are looked up in one query,
+        # never while a server-side cursor is open on the connection.
+        archive = (
+            select(ActivityArchive.task_id, ActivityArchive.first_at, ActivityArchive.id, ActivityArchive.entries)
+            .join(Task, Task.id == ActivityArchive.task_id)
+            .where(Task.project_id == project.id)
+            .order_by(ActivityArchive.task_id, ActivityArchive.first_at, ActivityArchive.id)
+            .limit(ARCHIVE_BATCH)
+        )
+        user_names: Dict[int, str] = {}
+        after = None
+        while True:
+            statement = archive if after is None else archive.where(
+                tuple_(ActivityArchive.task_id, ActivityArchive.first_at, ActivityArchive.id) > after)
+            batch = db.session.execute(statement).all()
+            if not batch:
+                break
+            after = tuple(batch[-1][:3])
+            segments = [ActivityArchive.decode(row.entries) for row in batch]
+            missing = {e["user_id"] for entries in segments for e in entries} - user_names.keys()
+            if missing:
+                user_names.update(db.session.execute(select(User.id, User.name).where(User.id.in_(missing))).all())
+            for entries in segments:
+                for entry in entries:
+                    yield {"type": "activity", "id": entry["id"], "task_id": entry["task_id"],
+                           "user_id": entry["user_id"], "user": user_names.get(entry["user_id"]),
+                           "action": entry["action"], "field_changed": entry["field_changed"],
+                           "old_value": entry["old_value"], "new_value": entry["new_value"],
+                           "created_at": entry["created_at"]}
+
+        activity = (
+            select(ActivityLog.id, ActivityLog.task_id, ActivityLog.user_id, User.name.label("user"),
+                   ActivityLog.action, ActivityLog.field_changed, ActivityLog.old_value, ActivityLog.new_value,
+                   ActivityLog.created_at)
+            .join(Task, Task.id == ActivityLog.task_id)
+            .outerjoin(User, User.id == ActivityLog.user_id)
+            .where(Task.project_id == project.id)
+            .order_by(ActivityLog.id)
+        )
+        for row in _stream(activity):
+            yield {"type": "activity", **row}
+
+    @staticmethod
+    def stream(project: Project, fmt: str) -> Iterator[str]:
+        """Yield the export as text chunks in ``fmt`` (a key of EXPORT_FORMATS)."""
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, extrasaction="ignore")
+            writer.writeheader()
+
+            def write(record):
+                if "labels" in record:
+                    record = dict(record, labels=",".join(str(label_id) for label_id in record["labels"]))
+                writer.writerow(record)
+        else:
+            buffer = io.StringIO()
+
+            def write(record):
+                buffer.write(json.dumps(record, separators=(",", ":")))
+                buffer.write("\n")
+
+        pending = 0
+        for record in ExportService.records(project):
+            write(record)
+            pending += 1
+            # Flush the first record straight away so the client sees bytes immediately
+            if pending >= CHUNK_ROWS or record["type"] == "project":
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        if buffer.tell():
+            yield buffer.getvalue()
+
+    @staticmethod
+    def filename(project: Project, fmt: str) -> str:
+        return f"project-{project.id}-export.{fmt}"
+
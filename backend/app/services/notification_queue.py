@@ -0,0 +1,134 @@
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from flask import current_app, render_template
+
+from app.extensions import db
+from app.models.email_outbox import EmailOutbox
+from app.models.notification import PendingNotification
+from app.models.task import Task
+from app.models.user import User
+from app.utils.metrics import emails_queued
+
+SUBJECTS = {
+    "assigned": "Task Assigned: {title}",
+    "updated": "Task Updated: {title}",
+    "commented": "New Comment on: {title}",
+}
+HEADINGS = {
+    "assigned": "Task Assigned to You",
+    "updated": "Task Updated",
+    "commented": "New Comment",
+}
+
+
+def deliver_after(recipient: User, now: Optional[datetime] = None) -> datetime:
+    """When a notification queued now for ``recipient`` becomes due, per their notification mode."""
+    now = now or datetime.utcnow()
+    if recipient.notification_mode == "HOURLY":
+        return now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+    if recipient.notification_mode == "DAILY":
+        digest_time = now.replace(hour=current_app.config["NOTIFICATION_DAILY_DIGEST_HOUR"],
+                                  minute=0, second=0, microsecond=0)
+        return digest_time if digest_time > now else digest_time + timedelta(days=1)
+    return now + timedelta(seconds=current_app.config["NOTIFICATION_COALESCE_SECONDS"])
+
+
+def _render(recipient: User, notifications: List[PendingNotification], tasks: Dict[int, Task],
+            users: Dict[int, User]) -> Optional[tuple]:
+    """Render one recipient's notifications as a single email. Returns (subject, html) or None."""
+    frontend_url = current_app.config.get("FRONTEND_URL", "http://localhost:3000")
+    groups: "OrderedDict[int, Dict]" = OrderedDict()
+    for n in notifications:
+        task = tasks.get(n.task_id)
+        if task is None:  # Task deleted since the notification was queued
+            continue
+        group = groups.setdefault(task.id, {
+            "task": task,
+            "task_url": f"{frontend_url}/projects/{task.project_id}",
+            "items": [],
+        })
+        actor = users.get(n.actor_id)
+        group["items"].append({
+            "kind": n.kind,
+            "actor_name": actor.name if actor else "Someone",
+            "field_changed": n.field_changed,
+            "old_value": n.old_value,
+            "new_value": n.new_value,
+            "content": n.content,
+        })
+    if not groups:
+        return None
+
+    items = [item for g in groups.values() for item in g["items"]]
+    if len(items) == 1:
+        only = next(iter(groups.values()))
+        subject = SUBJECTS[items[0]["kind"]].format(title=only["task"].title)
+        heading = HEADINGS[items[0]["kind"]]
+    else:
+        subject = f"TaskFlow: {len(items)} updates on {len(groups)} task(s)"
+        heading = "Your Task Updates"
+    html = render_template("email/notifications.html", recipient=recipient, heading=heading,
+                           groups=list(groups.values()))
+    return subject, html
+
+
+def flush_due_notifications(max_recipients: int = 100, lease_seconds: int = 300) -> int:
+    """Turn due notifications into one outbox email per recipient.
+
+    A recipient is due once their oldest pending notification is; everything
+    they have pending at that point goes into the same email. Rows are claimed
+    with a token so concurrent workers never render the same notification
+    twice. Returns the number of emails queued.
+    """
+    now = datetime.utcnow()
+    claimable = db.or_(
+        PendingNotification.claim_token.is_(None),  # type: ignore
+        PendingNotification.claimed_at < now - timedelta(seconds=lease_seconds),  # type: ignore
+    )
+    recipient_ids = [
+        user_id for (user_id,) in
+        db.session.query(PendingNotification.user_id)
+        .filter(PendingNotification.deliver_after <= now, claimable)  # type: ignore
+        .distinct()
+        .limit(max_recipients)
+        .all()
+    ]
+    if not recipient_ids:
+        db.session.rollback()
+        return 0
+
+    token = uuid.uuid4().hex
+    PendingNotification.query.filter(PendingNotification.user_id.in_(recipient_ids), claimable).update(  # type: ignore
+        {"claim_token": token, "claimed_at": now}, synchronize_session=False
+    )
+    db.session.commit()
+
+    notifications = (
+        PendingNotification.query.filter_by(claim_token=token)
+        .order_by(PendingNotification.user_id, PendingNotification.created_at, PendingNotification.id)
+        .all()
+    )
+    task_ids = {n.task_id for n in notifications}
+    user_ids = {n.user_id for n in notifications} | {n.actor_id for n in notifications}
+    tasks = {t.id: t for t in Task.query.filter(Task.id.in_(task_ids)).all()}  # type: ignore
+    users = {u.id: u for u in User.query.filter(User.id.in_(user_ids)).all()}  # type: ignore
+
+    by_recipient: Dict[int, List[PendingNotification]] = OrderedDict()
+    for n in notifications:
+        by_recipient.setdefault(n.user_id, []).append(n)
+
+    queued = 0
+    for user_id, pending in by_recipient.items():
+        recipient = users.get(user_id)
+        rendered = _render(recipient, pending, tasks, users) if recipient else None
+        if rendered:
+            subject, html = rendered
+            db.session.add(EmailOutbox(subject=subject, recipients=[recipient.email], html_body=html))  # type: ignore
+            queued += 1
+    PendingNotification.query.filter_by(claim_token=token).delete(synchronize_session=False)
+    db.session.commit()
+    emails_queued.inc(value=queued)
+    return queued
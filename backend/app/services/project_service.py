@@ -1,7 +1,12 @@
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Dict, Any
+from sqlalchemy.orm.attributes import set_committed_value
 from app.extensions import db
+from app.models.label import Label
 from app.models.project import Project, ProjectMember
+from app.models.task_stats import ProjectTaskStats
 from app.models.user import User
+from app.services.task_service import TaskService
+from app.utils.membership_cache import membership_cache
 
 
 class ProjectService:
@@ -14,6 +19,7 @@ class ProjectService:
         # Auto-add owner as PM (Project Manager)
         owner_membership = ProjectMember(user_id=owner_id, project_id=project.id, role="PM")
         db.session.add(owner_membership)
+        db.session.add(ProjectTaskStats(project_id=project.id))
         db.session.commit()
         return project
 
@@ -30,6 +36,77 @@ class ProjectService:
             )
         ).order_by(Project.created_at.desc()).all()  # type: ignore
 
+    @staticmethod
+    def get_member_project_ids(user_id: int) -> List[int]:
+        """Ids of the projects whose tasks the user can read (see is_project_member)"""
+        return [pid for (pid,) in db.session.query(ProjectMember.project_id).filter_by(user_id=int(user_id)).all()]
+
+    @staticmethod
+    def serialize_projects(projects: List[Project]) -> List[Dict[str, Any]]:
+        """Serialize a list of projects with a fixed number of queries.
+
+        Memberships (joined with their users), owners and task counters are loaded
+        for the whole list at once instead of per project.
+        """
+        if not projects:
+            return []
+
+        project_ids = [p.id for p in projects]
+        memberships_by_project: Dict[int, List[ProjectMember]] = {pid: [] for pid in project_ids}
+        memberships = ProjectMember.query.options(
+            db.joinedload(ProjectMember.user)
+        ).filter(ProjectMember.project_id.in_(project_ids)).all()  # type: ignore
+        users = {}
+        for membership in memberships:
+            memberships_by_project[membership.project_id].append(membership)
+            if membership.user:
+                users[membership.user_id] = membership.user
+
+        missing_owner_ids = {p.owner_id for p in projects} - users.keys()
+        if missing_owner_ids:
+            for owner in User.query.filter(User.id.in_(missing_owner_ids)).all():  # type: ignore
+                users[owner.id] = owner
+
+        task_stats = TaskService.get_task_stats(project_ids)
+
+        for project in projects:
+            set_committed_value(project, "owner", users.get(project.owner_id))
+        return [
+            p.to_dict(memberships=memberships_by_project[p.id], task_count=task_stats[p.id].total)
+            for p in projects
+        ]
+
+    @staticmethod
+    def get_board(project: Project, status: Optional[str] = None, priority: Optional[str] = None) -> Dict[str, Any]:
+        """Everything a project board renders, with a fixed number of queries.
+
+        Members come from one query joined with their users (which usually
+        include the owner), tasks from one query plus the batched loads of
+        ``TaskService.serialize_tasks``, and the status counters and the label
+        catalog from one query each. ``status``/``priority`` filter the tasks
+        only; the counts always cover the whole project.
+        """
+        memberships = ProjectMember.query.options(
+            db.joinedload(ProjectMember.user)
+        ).filter_by(project_id=project.id).all()
+        owner = next((m.user for m in memberships if m.user_id == project.owner_id and m.user), None)
+        if owner is not None:
+            set_committed_value(project, "owner", owner)
+        stats = TaskService.get_task_stats([project.id])[project.id]
+
+        columns: Dict[str, List[Dict[str, Any]]] = {s: [] for s in ProjectTaskStats.STATUS_COLUMNS}
+        tasks = TaskService.get_tasks_by_project(project.id, status=status, priority=priority)
+        for task in TaskService.serialize_tasks(tasks):
+            columns[task["status"]].append(task)
+
+        labels = Label.query.filter_by(project_id=project.id).order_by(Label.name).all()  # type: ignore
+        return {
+            "project": project.to_dict(memberships=memberships, task_count=stats.total),
+            "columns": columns,
+            "summary": stats.to_summary(),
+            "labels": [label.to_dict() for label in labels],
+        }
+
     @staticmethod
     def get_project_by_id(project_id: int) -> Optional[Project]:
         return Project.query.get(project_id)
@@ -45,8 +122,11 @@ class ProjectService:
 
     @staticmethod
     def delete_project(project: Project) -> None:
+        project_id = project.id
+        ProjectTaskStats.query.filter_by(project_id=project_id).delete()
         db.session.delete(project)
         db.session.commit()
+        membership_cache.invalidate_project(project_id)
 
     @staticmethod
     def add_member(project: Project, user_id: int, role: str = "MEMBER") -> Tuple[Optional[Project], Optional[str]]:
@@ -66,6 +146,7 @@ class ProjectService:
         membership = ProjectMember(user_id=user_id, project_id=project.id, role=role)
         db.session.add(membership)
         db.session.commit()
+        membership_cache.invalidate(int(user_id), project.id)
         return project, None
 
     @staticmethod
@@ -77,6 +158,7 @@ class ProjectService:
             return None, "Cannot remove the project owner"
         db.session.delete(membership)
         db.session.commit()
+        membership_cache.invalidate(int(user_id), project.id)
         return project, None
     
     @staticmethod
@@ -91,19 +173,30 @@ class ProjectService:
         
         membership.role = new_role
         db.session.commit()
+        membership_cache.invalidate(int(user_id), project.id)
         return project, None
 
+    @staticmethod
+    def get_member_role(project: Project, user_id: int) -> Optional[str]:
+        """Get the user's role in the project (None if not a member), via the membership cache"""
+        user_id = int(user_id)  # JWT identities arrive as strings
+        role = membership_cache.get(user_id, project.id)
+        if role is membership_cache.MISS:
+            role = project.get_user_role(user_id)
+            membership_cache.set(user_id, project.id, role)
+        return role
+
     @staticmethod
     def is_project_member(project: Project, user_id: int) -> bool:
         """Check if user is any kind of member (PM or regular)"""
-        return project.is_member(user_id)
+        return ProjectService.get_member_role(project, user_id) is not None
     
     @staticmethod
     def is_project_manager(project: Project, user_id: int) -> bool:
         """Check if user is a PM for this project"""
-        return project.is_project_manager(user_id)
+        return ProjectService.get_member_role(project, user_id) == "PM"
     
     @staticmethod
     def has_pm_access(project: Project, user_id: int, user_role: str) -> bool:
         """Check if user has PM-level access (ADMIN system-wide or PM for this project)"""
-        return user_role == "ADMIN" or project.is_project_manager(user_id)
+        return user_role == "ADMIN" or ProjectService.is_project_manager(project, user_id)
@@ -0,0 +1,201 @@
+"""
+Full-text search over task titles, descriptions and comments.
+
+On MySQL the search runs on FULLTEXT indexes (see the Task and Comment
+models). Elsewhere it uses the ``search_postings`` inverted index, which
+change tracking keeps current on every flush and bulk writes update
+explicitly. ``SEARCH_BACKEND`` can force either one.
+
+Both rank a task by how well the query matches its title (weighted highest),
+its description and its comments, and match any of the query terms.
+"""
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+from sqlalchemy import case, delete, func, insert, literal, or_, select, union_all
+from sqlalchemy.dialects.mysql import match
+
+from app.extensions import db
+from app.models.comment import Comment
+from app.models.search import SearchPosting
+from app.models.task import Task
+
+TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+MIN_TERM_LENGTH = 2
+MAX_TERM_LENGTH = 64  # SearchPosting.term column size
+MAX_QUERY_TERMS = 10
+
+SOURCE_WEIGHTS = {"title": 3, "description": 1, "comment": 1}
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+
+def tokenize(text: Optional[str]) -> Counter:
+    """Lower-cased word counts of ``text``, as stored in the inverted index."""
+    if not text:
+        return Counter()
+    return Counter(
+        term[:MAX_TERM_LENGTH]
+        for term in TERM_PATTERN.findall(text.lower())
+        if len(term) >= MIN_TERM_LENGTH
+    )
+
+
+def uses_fulltext() -> bool:
+    backend = current_app.config.get("SEARCH_BACKEND", "auto")
+    if backend == "auto":
+        return db.engine.dialect.name == "mysql"
+    return backend == "fulltext"
+
+
+def inverted_index_enabled() -> bool:
+    """Whether writes need to maintain search_postings."""
+    return has_app_context() and not uses_fulltext()
+
+
+def _postings(task_id: int, project_id: int, source: str, text: Optional[str],
+              comment_id: Optional[int] = None) -> List[Dict]:
+    return [
+        {"term": term, "task_id": task_id, "project_id": project_id, "source": source,
+         "comment_id": comment_id, "hits": hits}
+        for term, hits in tokenize(text).items()
+    ]
+
+
+class SearchService:
+    @staticmethod
+    def index_tasks(tasks: Iterable[Tuple[int, int, str, Optional[str]]], session=None) -> None:
+        """(Re)index the title and description of (task_id, project_id, title, description) rows."""
+        session = session or db.session
+        tasks = list(tasks)
+        if not tasks:
+            return
+        session.execute(
+            delete(SearchPosting)
+            .where(SearchPosting.task_id.in_([t[0] for t in tasks]), SearchPosting.comment_id.is_(None)),
+            execution_options={"synchronize_session": False},
+        )
+        rows = []
+        for task_id, project_id, title, description in tasks:
+            rows += _postings(task_id, project_id, "title", title)
+            rows += _postings(task_id, project_id, "description", description)
+        if rows:
+            session.execute(insert(SearchPosting.__table__), rows)
+
+    @staticmethod
+    def index_comments(comments: Iterable[Tuple[int, int, int, str]], session=None) -> None:
+        """(Re)index (comment_id, task_id, project_id, content) rows."""
+        session = session or db.session
+        comments = list(comments)
+        if not comments:
+            return
+        session.execute(
+            delete(SearchPosting).where(SearchPosting.comment_id.in_([c[0] for c in comments])),
+            execution_options={"synchronize_session": False},
+        )
+        rows = []
+        for comment_id, task_id, project_id, content in comments:
+            rows += _postings(task_id, project_id, "comment", content, comment_id)
+        if rows:
+            session.execute(insert(SearchPosting.__table__), rows)
+
+    @staticmethod
+    def remove(task_ids: Iterable[int] = (), comment_ids: Iterable[int] = (), project_ids: Iterable[int] = (),
+               session=None) -> None:
+        """Drop the postings of deleted tasks, comments and projects."""
+        session = session or db.session
+        clauses = []
+        for column, ids in ((SearchPosting.task_id, task_ids), (SearchPosting.comment_id, comment_ids),
+                            (SearchPosting.project_id, project_ids)):
+            ids = list(ids)
+            if ids:
+                clauses.append(column.in_(ids))
+        if clauses:
+            session.execute(delete(SearchPosting).where(or_(*clauses)),
+                            execution_options={"synchronize_session": False})
+
+    @staticmethod
+    def rebuild(batch_size: int = 1000) -> int:
+        """Rebuild the inverted index from scratch, committing per batch of tasks. Returns the task count."""
+        db.session.execute(delete(SearchPosting), execution_options={"synchronize_session": False})
+        db.session.commit()
+        count, last_id = 0, 0
+        while True:
+            tasks = db.session.execute(
+                select(Task.id, Task.project_id, Task.title, Task.description)
+                .where(Task.id > last_id).order_by(Task.id).limit(batch_size)
+            ).all()
+            if not tasks:
+                return count
+            last_id = tasks[-1][0]
+            SearchService.index_tasks(tasks)
+            project_of = {t[0]: t[1] for t in tasks}
+            comments = db.session.execute(
+                select(Comment.id, Comment.task_id, Comment.content).where(Comment.task_id.in_(list(project_of)))
+            ).all()
+            SearchService.index_comments((c[0], c[1], project_of[c[1]], c[2]) for c in comments)
+            db.session.commit()
+            count += len(tasks)
+
+    @staticmethod
+    def search(query: str, project_ids: Optional[List[int]], page: int = 1,
+               per_page: int = DEFAULT_PER_PAGE) -> Tuple[List[Tuple[int, float]], bool]:
+        """Rank tasks matching ``query`` within ``project_ids`` (None means every project).
+
+        Returns one page of (task_id, score) pairs, best first, and whether
+        there are more pages.
+        """
+        terms = list(tokenize(query))[:MAX_QUERY_TERMS]
+        if not terms or project_ids == []:
+            return [], False
+        page = max(1, page)
+        per_page = max(1, min(per_page, MAX_PER_PAGE))
+        if uses_fulltext():
+            statement = SearchService._fulltext_query(" ".join(terms), project_ids)
+        else:
+            statement = SearchService._inverted_index_query(terms, project_ids)
+        rows = db.session.execute(statement.offset((page - 1) * per_page).limit(per_page + 1)).all()
+        return [(task_id, float(score)) for task_id, score in rows[:per_page]], len(rows) > per_page
+
+    @staticmethod
+    def _inverted_index_query(terms: List[str], project_ids: Optional[List[int]]):
+        weight = case(SOURCE_WEIGHTS, value=SearchPosting.source, else_=1)
+        matched = func.count(func.distinct(SearchPosting.term))
+        score = func.sum(SearchPosting.hits * weight)
+        statement = select(SearchPosting.task_id, (matched * 100 + score).label("score")).where(
+            SearchPosting.term.in_(terms)
+        )
+        if project_ids is not None:
+            statement = statement.where(SearchPosting.project_id.in_(project_ids))
+        # Tasks matching more of the query terms come first, then by weighted hits
+        return statement.group_by(SearchPosting.task_id).order_by(
+            matched.desc(), score.desc(), SearchPosting.task_id.desc()
+        )
+
+    @staticmethod
+    def _fulltext_query(text: str, project_ids: Optional[List[int]]):
+        title_match = match(Task.title, against=text)
+        task_match = match(Task.title, Task.description, against=text)
+        comment_match = match(Comment.content, against=text)
+        tasks = select(
+            Task.id.label("task_id"),
+            (task_match + title_match * (SOURCE_WEIGHTS["title"] - 1)).label("score"),
+        ).where(task_match > 0)
+        comments = (
+            select(Comment.task_id.label("task_id"), (comment_match * literal(SOURCE_WEIGHTS["comment"])).label("score"))
+            .join(Task, Task.id == Comment.task_id)
+            .where(comment_match > 0)
+        )
+        if project_ids is not None:
+            tasks = tasks.where(Task.project_id.in_(project_ids))
+            comments = comments.where(Task.project_id.in_(project_ids))
+        hits = union_all(tasks, comments).subquery()
+        score = func.sum(hits.c.score)
+        return (
+            select(hits.c.task_id, score.label("score"))
+            .group_by(hits.c.task_id)
+            .order_by(score.desc(), hits.c.task_id.desc())
+        )
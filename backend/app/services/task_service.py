@@ -1,7 +1,66 @@
-from typing import Optional, List, Dict, Any
-from datetime import date
+import base64
+import json
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import date, datetime
+from sqlalchemy import and_, case, func, literal, or_
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm.attributes import set_committed_value
 from app.extensions import db
 from app.models.task import Task
+from app.models.user import User
+from app.models.label import Label, task_labels
+from app.models.comment import Comment
+from app.models.task_stats import ProjectTaskStats
+from app.services.change_tracking import set_actor
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+PRIORITY_RANK = {"LOW": 0, "MEDIUM": 1, "HIGH": 2}
+
+# Leading sort key for each supported ``sort`` option: (SQL expression, value taken
+# from a Task, value parsed back from a cursor). Every sort is tie-broken on
+# (created_at, id) so the ordering is total and keyset pagination is stable.
+# Priority is compared by rank rather than by the raw column because MySQL
+# orders ENUMs by index but compares them to literals as strings.
+SORT_KEYS = {
+    "created_at": None,
+    "priority": (
+        case(PRIORITY_RANK, value=Task.priority),
+        lambda t: PRIORITY_RANK[t.priority],
+        int,
+    ),
+    "due_date": (
+        func.coalesce(Task.due_date, literal(date.max, db.Date)),  # tasks without a due date sort last
+        lambda t: (t.due_date or date.max).isoformat(),
+        date.fromisoformat,
+    ),
+}
+
+DEFAULT_SORT_ORDER = {"created_at": "desc", "priority": "desc", "due_date": "asc"}
+
+
+def _encode_cursor(sort: str, task: Task) -> str:
+    key = SORT_KEYS[sort]
+    payload = {
+        "s": sort,
+        "k": key[1](task) if key else None,
+        "c": task.created_at.isoformat(),
+        "i": task.id,
+    }
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode()
+
+
+def _decode_cursor(sort: str, cursor: str) -> Tuple[Any, datetime, int]:
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if payload["s"] != sort:
+            raise ValueError("Cursor does not match the requested sort")
+        key = SORT_KEYS[sort]
+        return (key[2](payload["k"]) if key else None,
+                datetime.fromisoformat(payload["c"]), int(payload["i"]))
+    except (KeyError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
 
 
 class TaskService:
@@ -17,19 +76,11 @@ class TaskService:
             priority=priority,
             due_date=due_date,
         )
+        # Activity and notifications are added to the same flush by change tracking
+        set_actor(creator_id)
         db.session.add(task)
+        TaskService.adjust_task_stats(project_id, {task.status or "TODO": 1})
         db.session.commit()
-        
-        # Send notification if task is assigned and we have creator info
-        if assigned_to and creator_id and assigned_to != creator_id:
-            from app.services.notification_service import notify_task_assignment
-            notify_task_assignment(task.id, assigned_to, creator_id)
-        
-        # Log activity
-        if creator_id:
-            from app.services.notification_service import log_activity
-            log_activity(task.id, creator_id, "created")
-        
         return task
 
     @staticmethod
@@ -42,54 +93,198 @@ class TaskService:
             query = query.filter_by(priority=priority)
         return query.order_by(Task.created_at.desc()).all()  # type: ignore
 
+    @staticmethod
+    def get_tasks_page(project_id: int, status: Optional[str] = None, priority: Optional[str] = None,
+                       sort: str = "created_at", order: Optional[str] = None,
+                       limit: int = DEFAULT_PAGE_SIZE,
+                       cursor: Optional[str] = None) -> Tuple[List[Task], Optional[str]]:
+        """Return one page of a project's tasks and the cursor for the next page.
+
+        Pages are seeked from the cursor position rather than skipped with
+        OFFSET, so every page costs the same. Raises ValueError for a malformed
+        cursor.
+        """
+        order = order or DEFAULT_SORT_ORDER[sort]
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        key = SORT_KEYS[sort]
+        columns = ([key[0]] if key else []) + [Task.created_at, Task.id]
+
+        query = Task.query.filter_by(project_id=project_id)
+        if status:
+            query = query.filter_by(status=status)
+        if priority:
+            query = query.filter_by(priority=priority)
+
+        if cursor:
+            sort_value, created_at, task_id = _decode_cursor(sort, cursor)
+            values = ([sort_value] if key else []) + [created_at, task_id]
+            # Expanded row comparison: (a, b, c) > (x, y, z)
+            clauses = []
+            for i, column in enumerate(columns):
+                beyond = column < values[i] if order == "desc" else column > values[i]
+                clauses.append(and_(*[columns[j] == values[j] for j in range(i)], beyond))
+            query = query.filter(or_(*clauses))
+
+        query = query.order_by(*[c.desc() if order == "desc" else c.asc() for c in columns])
+        tasks = query.limit(limit + 1).all()  # type: ignore
+        next_cursor = None
+        if len(tasks) > limit:
+            tasks = tasks[:limit]
+            next_cursor = _encode_cursor(sort, tasks[-1])
+        return tasks, next_cursor
+
+    @staticmethod
+    def serialize_tasks(tasks: List[Task]) -> List[Dict[str, Any]]:
+        """Serialize a list of tasks with a fixed number of queries.
+
+        Assignees and labels are loaded with one query each and attached to the
+        instances, and comment counts come from a single grouped query, so the
+        cost does not grow with the number of tasks.
+        """
+        if not tasks:
+            return []
+
+        task_ids = [t.id for t in tasks]
+        assignee_ids = {t.assigned_to for t in tasks if t.assigned_to}
+        assignees = {}
+        if assignee_ids:
+            assignees = {u.id: u for u in User.query.filter(User.id.in_(assignee_ids)).all()}  # type: ignore
+
+        labels_by_task: Dict[int, List[Label]] = {task_id: [] for task_id in task_ids}
+        label_rows = (
+            db.session.query(task_labels.c.task_id, Label)
+            .join(Label, Label.id == task_labels.c.label_id)
+            .filter(task_labels.c.task_id.in_(task_ids))
+            .all()
+        )
+        for task_id, label in label_rows:
+            labels_by_task[task_id].append(label)
+
+        comment_counts = dict(
+            db.session.query(Comment.task_id, func.count(Comment.id))
+            .filter(Comment.task_id.in_(task_ids))  # type: ignore
+            .group_by(Comment.task_id)
+            .all()
+        )
+
+        for task in tasks:
+            # Populate the relationships as if they had been loaded, so to_dict() doesn't lazy load
+            set_committed_value(task, "assignee", assignees.get(task.assigned_to))
+            set_committed_value(task, "labels", labels_by_task[task.id])
+        return [t.to_dict(comment_count=comment_counts.get(t.id, 0)) for t in tasks]
+
     @staticmethod
     def get_task_by_id(task_id: int) -> Optional[Task]:
         return Task.query.get(task_id)
 
     @staticmethod
     def update_task(task: Task, updater_id: Optional[int] = None, **kwargs) -> Task:
+        """Apply field updates in one transaction.
+
+        Every changed field is recorded in the activity log (and the assignee
+        notified) by change tracking when ``updater_id`` is given.
+        """
         allowed_fields = ["title", "description", "status", "priority", "assigned_to", "due_date"]
-        
-        # Track changes for notifications
-        old_assigned_to = task.assigned_to
         old_status = task.status
-        old_priority = task.priority
-        
+
+        set_actor(updater_id)
         for field in allowed_fields:
             if field in kwargs and kwargs[field] is not None:
                 setattr(task, field, kwargs[field])
-        
+
+        if task.status != old_status:
+            TaskService.adjust_task_stats(task.project_id, {old_status: -1, task.status: 1})
         db.session.commit()
-        
-        # Send notifications and log activities if updater is provided
-        if updater_id:
-            from app.services.notification_service import notify_task_assignment, notify_task_update, log_activity
-            
-            # Notify if assignee changed
-            if "assigned_to" in kwargs and kwargs["assigned_to"] is not None:
-                new_assigned_to = kwargs["assigned_to"]
-                if new_assigned_to != old_assigned_to and new_assigned_to != updater_id:
-                    notify_task_assignment(task.id, new_assigned_to, updater_id)
-            
-            # Notify if status changed
-            if "status" in kwargs and kwargs["status"] != old_status:
-                notify_task_update(task.id, updater_id, "status", old_status, kwargs["status"])
-            
-            # Notify if priority changed
-            if "priority" in kwargs and kwargs["priority"] != old_priority:
-                notify_task_update(task.id, updater_id, "priority", old_priority, kwargs["priority"])
-        
         return task
 
     @staticmethod
     def delete_task(task: Task) -> None:
         db.session.delete(task)
+        TaskService.adjust_task_stats(task.project_id, {task.status: -1})
         db.session.commit()
 
+    @staticmethod
+    def adjust_task_stats(project_id: int, deltas: Dict[str, int]) -> None:
+        """Apply status count deltas to a project's counters in the current transaction.
+
+        The increments are done in SQL so concurrent writers don't lose updates.
+        If the project has no counter row yet, one is built from the tasks table
+        after flushing, which already reflects the pending change. Concurrent
+        first writes may both get here: the insert skips a row another
+        transaction created meanwhile, and the deltas are applied to that row.
+        """
+        values = {
+            ProjectTaskStats.STATUS_COLUMNS[status]: getattr(ProjectTaskStats, ProjectTaskStats.STATUS_COLUMNS[status]) + delta
+            for status, delta in deltas.items() if delta
+        }
+        if not values:
+            return
+        db.session.flush()
+        updated = ProjectTaskStats.query.filter_by(project_id=project_id).update(values)
+        if not updated and not TaskService._insert_task_stats(TaskService._count_task_stats([project_id])[project_id]):
+            ProjectTaskStats.query.filter_by(project_id=project_id).update(values)
+
+    @staticmethod
+    def _insert_task_stats(stats: ProjectTaskStats) -> bool:
+        """Insert a counter row unless the project already has one. Returns whether it was inserted."""
+        dialect = db.engine.dialect.name
+        if dialect == "mysql":
+            # ON DUPLICATE KEY UPDATE counts a matched row too (FOUND_ROWS), so only IGNORE tells them apart
+            statement = mysql.insert(ProjectTaskStats).prefix_with("IGNORE")
+        elif dialect in ("sqlite", "postgresql"):
+            insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            statement = insert(ProjectTaskStats).on_conflict_do_nothing(index_elements=["project_id"])
+        else:
+            raise RuntimeError(f"No insert-if-missing statement for the {dialect} dialect")
+        values = {column: getattr(stats, column) for column in ("project_id", *ProjectTaskStats.STATUS_COLUMNS.values())}
+        return db.session.execute(statement.values(**values)).rowcount > 0
+
+    @staticmethod
+    def _count_task_stats(project_ids: List[int]) -> Dict[int, ProjectTaskStats]:
+        """Count tasks by status with one grouped query (the fallback when counters are missing)."""
+        stats = {pid: ProjectTaskStats(project_id=pid) for pid in project_ids}
+        rows = (
+            db.session.query(Task.project_id, Task.status, func.count(Task.id))
+            .filter(Task.project_id.in_(project_ids))  # type: ignore
+            .group_by(Task.project_id, Task.status)
+            .all()
+        )
+        for project_id, status, count in rows:
+            setattr(stats[project_id], ProjectTaskStats.STATUS_COLUMNS[status], count)
+        return stats
+
+    @staticmethod
+    def get_task_stats(project_ids: List[int]) -> Dict[int, ProjectTaskStats]:
+        """Get status counters for many projects, counting any that have no counter row yet."""
+        if not project_ids:
+            return {}
+        stats = {
+            s.project_id: s
+            for s in ProjectTaskStats.query.filter(ProjectTaskStats.project_id.in_(project_ids)).all()  # type: ignore
+        }
+        missing = [pid for pid in project_ids if pid not in stats]
+        if missing:
+            stats.update(TaskService._count_task_stats(missing))
+        return stats
+
     @staticmethod
     def get_task_summary(project_id: int) -> Dict[str, int]:
-        tasks = Task.query.filter_by(project_id=project_id).all()
-        summary = {"total": len(tasks), "TODO": 0, "IN_PROGRESS": 0, "DONE": 0}
-        for t in tasks:
-            summary[t.status] = summary.get(t.status, 0) + 1
-        return summary
+        return TaskService.get_task_stats([project_id])[project_id].to_summary()
+
+    @staticmethod
+    def rebuild_task_stats(project_ids: Optional[List[int]] = None, batch_size: int = 500) -> int:
+        """Recompute counters from the tasks table, committing per batch of projects.
+
+        Repairs drift after manual SQL edits or imports. Returns the number of
+        projects rebuilt.
+        """
+        from app.models.project import Project
+
+        if project_ids is None:
+            project_ids = [pid for (pid,) in db.session.query(Project.id).order_by(Project.id).all()]
+        for start in range(0, len(project_ids), batch_size):
+            batch = project_ids[start:start + batch_size]
+            for stats in TaskService._count_task_stats(batch).values():
+                db.session.merge(stats)
+            db.session.commit()
+        return len(project_ids)
@@ -1,8 +1,56 @@
 from functools import wraps
 from typing import Optional, Tuple, Any
 from flask import jsonify
-from flask_jwt_extended import verify_jwt_in_request, get_jwt_identity
+from flask_jwt_extended import create_access_token, verify_jwt_in_request, get_jwt, get_jwt_identity
+from sqlalchemy import select
+from app.extensions import db
 from app.models.user import User
+from app.utils.user_claims_cache import user_claims_cache
+
+
+class CurrentUser:
+    """The authenticated user as described by the access token's claims.
+
+    Carries the id and role without touching the database; ``load()`` fetches
+    the full User row for handlers that need more.
+    """
+
+    def __init__(self, user_id: int, role: str):
+        self.id = user_id
+        self.role = role
+
+    def load(self) -> Optional[User]:
+        return db.session.get(User, self.id)
+
+
+def create_user_token(user: User) -> str:
+    """Issue an access token carrying the user's role and token version."""
+    return create_access_token(identity=str(user.id),
+                               additional_claims={"role": user.role, "ver": user.token_version or 0})
+
+
+def current_claims(user_id: int) -> Optional[Tuple[str, int]]:
+    """The user's current (role, token_version), or None if the user no longer exists."""
+    claims = user_claims_cache.get(user_id)
+    if claims is user_claims_cache.MISS:
+        row = db.session.execute(select(User.role, User.token_version).where(User.id == user_id)).first()
+        claims = (row[0], row[1] or 0) if row else None
+        user_claims_cache.set(user_id, claims)
+    return claims
+
+
+def is_token_revoked(jwt_header: Any, jwt_payload: dict) -> bool:
+    """Reject tokens of deleted users, and tokens issued before a role change or revocation."""
+    try:
+        user_id = int(jwt_payload["sub"])
+    except (KeyError, TypeError, ValueError):
+        return True
+    claims = current_claims(user_id)
+    if claims is None:
+        return True
+    role, version = claims
+    # Tokens issued before role claims existed have neither claim; version 0 accepts them
+    return jwt_payload.get("ver", 0) != version or jwt_payload.get("role", role) != role
 
 
 def admin_required(fn):
@@ -10,18 +58,32 @@ def admin_required(fn):
     @wraps(fn)
     def wrapper(*args, **kwargs):
         verify_jwt_in_request()
-        user_id = get_jwt_identity()
-        user = User.query.get(user_id)
+        user = get_current_user()
         if not user or user.role != "ADMIN":
             return jsonify({"error": "Admin access required"}), 403
         return fn(*args, **kwargs)
     return wrapper
 
 
-def get_current_user() -> Optional[User]:
-    """Get the current authenticated user from JWT identity."""
+def get_current_user() -> Optional[CurrentUser]:
+    """Get the current authenticated user from the JWT claims, without loading the user row."""
+    user_id = get_jwt_identity()
+    if user_id is None:
+        return None
+    user_id = int(user_id)
+    role = get_jwt().get("role")
+    if role is None:  # Token issued before role claims existed
+        claims = current_claims(user_id)
+        if claims is None:
+            return None
+        role = claims[0]
+    return CurrentUser(user_id, role)
+
+
+def load_current_user() -> Optional[User]:
+    """Load the current authenticated user's row, for handlers that need more than id and role."""
     user_id = get_jwt_identity()
-    return User.query.get(user_id)
+    return db.session.get(User, int(user_id)) if user_id is not None else None
 
 
 def validate_required_fields(data: dict, fields: list) -> Tuple[bool, Optional[str]]:
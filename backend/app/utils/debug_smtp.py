@@ -0,0 +1,73 @@
+"""
+Minimal debugging SMTP server for local development.
+
+Accepts any message without authentication or TLS and prints it (or hands it to
+a callback), so the email outbox can be exercised end to end without a real
+mail provider. Point the app at it with MAIL_SERVER=localhost, MAIL_PORT=1025
+and MAIL_USE_TLS=False.
+"""
+import socketserver
+from email import message_from_bytes
+from email.policy import default as default_policy
+from typing import Callable, List, Optional
+
+MessageHandler = Callable[[str, List[str], bytes], None]
+
+
+def print_message(sender: str, recipients: List[str], data: bytes) -> None:
+    message = message_from_bytes(data, policy=default_policy)
+    print("-" * 60)
+    print(f"From: {sender}")
+    print(f"To: {', '.join(recipients)}")
+    print(f"Subject: {message['subject']}")
+    print(f"Size: {len(data)} bytes")
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self) -> None:
+        sender, recipients = "", []
+        self._reply("220 taskflow debug SMTP ready")
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode(errors="replace").strip()
+            verb = command[:4].upper()
+            if verb in ("HELO", "EHLO"):
+                self._reply("250 taskflow")
+            elif verb == "MAIL":
+                sender, recipients = command.split(":", 1)[1].strip().strip("<>"), []
+                self._reply("250 OK")
+            elif verb == "RCPT":
+                recipients.append(command.split(":", 1)[1].strip().strip("<>"))
+                self._reply("250 OK")
+            elif verb == "DATA":
+                self._reply("354 End data with <CR><LF>.<CR><LF>")
+                lines = []
+                while True:
+                    line = self.rfile.readline()
+                    if not line or line in (b".\r\n", b".\n"):
+                        break
+                    lines.append(line[1:] if line.startswith(b"..") else line)
+                self.server.on_message(sender, recipients, b"".join(lines))  # type: ignore
+                self._reply("250 OK: queued")
+            elif verb in ("RSET", "NOOP"):
+                self._reply("250 OK")
+            elif verb == "QUIT":
+                self._reply("221 Bye")
+                return
+            else:
+                self._reply("502 Command not implemented")
+
+
+class DebugSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, host: str = "localhost", port: int = 1025,
+                 on_message: Optional[MessageHandler] = None):
+        super().__init__((host, port), _SMTPHandler)
+        self.on_message = on_message or print_message
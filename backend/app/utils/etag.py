@@ -0,0 +1,39 @@
+import hashlib
+
+from flask import Response, request
+
+from app.utils.response_cache import response_cache
+
+
+def project_etag(project, *parts) -> str:
+    """Strong ETag for a response built from ``project``'s current version.
+
+    Like ``response_cache.project_key`` it also carries the ``users`` namespace
+    version, since responses embed member and assignee rows that change without
+    a project write. ``parts`` distinguish different representations of the
+    same project (the endpoint and its query string), so they get different tags.
+    """
+    digest = hashlib.sha1("|".join(str(p) for p in parts).encode()).hexdigest()[:16]
+    users = response_cache.namespace_version("users")
+    return f"p{project.id}-v{project.version}-u{users}-{digest}"
+
+
+def request_etag(project) -> str:
+    """ETag for the current request's view of ``project``."""
+    return project_etag(project, request.path, request.query_string.decode())
+
+
+def not_modified(etag: str) -> bool:
+    """Whether the client's If-None-Match already has this representation."""
+    return request.if_none_match.contains(etag)
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    """Tag a response and ask clients to revalidate it on every use."""
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "private, no-cache"
+    return response
+
+
+def not_modified_response(etag: str) -> Response:
+    return with_etag(Response(status=304), etag)
@@ -0,0 +1,329 @@
+import asyncio
+import json
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set
+
+
+class Subscription:
+    """One client's queue of events for a project."""
+
+    def __init__(self, project_id: int, max_size: int):
+        self.project_id = project_id
+        self.events: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=max_size)
+        self.overflowed = False  # Events were dropped; the client must refetch
+        self._wakeup: Optional[Callable[[], None]] = None
+
+    def put(self, event: Dict[str, Any]) -> None:
+        try:
+            self.events.put_nowait(event)
+        except queue.Full:
+            self.overflowed = True
+        wakeup = self._wakeup
+        if wakeup is not None:
+            wakeup()
+
+    def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def get_async(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """``get`` for the event loop: waits without holding a thread."""
+        loop = asyncio.get_running_loop()
+        ready = asyncio.Event()
+        self._wakeup = lambda: loop.call_soon_threadsafe(ready.set)
+        deadline = loop.time() + timeout
+        try:
+            while True:
+                try:
+                    return self.events.get_nowait()
+                except queue.Empty:
+                    pass
+                remaining = deadline - loop.time()
+                if self.overflowed or remaining <= 0:
+                    return None
+                ready.clear()
+                try:
+                    await asyncio.wait_for(ready.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return None
+        finally:
+            self._wakeup = None
+
+    def reset(self) -> None:
+        """Drop everything queued after an overflow."""
+        while True:
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                break
+        self.overflowed = False
+
+
+class EventStream:
+    """The Server-Sent Events body for one subscription.
+
+    Sends each event, a ``resync`` after an overflow and a keepalive after
+    ``keepalive`` quiet seconds. Access is re-checked with ``still_allowed()``
+    whenever the last check is more than ``keepalive`` seconds old, busy or
+    quiet, before anything more is sent; once it fails, ``revoked`` ends the
+    stream. Iterating it blocks a thread on the subscription (WSGI);
+    ``async for`` waits on the event loop instead (ASGI mode), so an open
+    stream holds no thread.
+    """
+
+    CONNECTED = "retry: 3000\n: connected\n\n"
+    KEEPALIVE = ": keepalive\n\n"
+    REVOKED = "event: revoked\ndata: {}\n\n"
+
+    def __init__(self, broker: "EventBroker", subscription: Subscription, keepalive: float,
+                 still_allowed: Callable[[], bool]):
+        self.broker = broker
+        self.subscription = subscription
+        self.keepalive = keepalive
+        self.still_allowed = still_allowed
+        self.checked_at = time.monotonic()  # The request that opened the stream was just checked
+
+    def _until_check(self) -> float:
+        return max(0.0, self.checked_at + self.keepalive - time.monotonic())
+
+    def _chunk(self, event: Optional[Dict[str, Any]]) -> Optional[str]:
+        """The chunk for what the subscription returned; None when it timed out."""
+        if self.subscription.overflowed:
+            self.subscription.reset()
+            return "event: resync\ndata: {}\n\n"
+        if event is not None:
+            return f"event: {event['type']}\ndata: {json.dumps(event['data'], separators=(',', ':'))}\n\n"
+        return None
+
+    def __iter__(self):
+        try:
+            yield self.CONNECTED
+            while True:
+                event = self.subscription.get(timeout=self._until_check())
+                if self._until_check() == 0:
+                    if not self.still_allowed():
+                        yield self.REVOKED
+                        return
+                    self.checked_at = time.monotonic()
+                    chunk = self._chunk(event) or self.KEEPALIVE
+                else:
+                    chunk = self._chunk(event)
+                if chunk is not None:
+                    yield chunk
+        finally:
+            self.close()
+
+    async def __aiter__(self):
+        try:
+            yield self.CONNECTED
+            while True:
+                event = await self.subscription.get_async(self._until_check())
+                if self._until_check() == 0:
+                    # The access check queries the database; run it off the event loop
+                    if not await asyncio.get_running_loop().run_in_executor(None, self.still_allowed):
+                        yield self.REVOKED
+                        return
+                    self.checked_at = time.monotonic()
+                    chunk = self._chunk(event) or self.KEEPALIVE
+                else:
+                    chunk = self._chunk(event)
+                if chunk is not None:
+                    yield chunk
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.broker.unsubscribe(self.subscription)
+
+
+class LocalFanout:
+    """Delivers published events to this process's subscribers only."""
+
+    def start(self, deliver) -> None:
+        self.deliver = deliver
+
+    def publish(self, project_id: int, message: str) -> None:
+        self.deliver(project_id, message)
+
+    def stop(self) -> None:
+        pass
+
+
+class InMemoryPubSubClient:
+    """Stand-in for a shared pub/sub server, implementing the redis-py calls we use.
+
+    Every client created for the same name shares one hub, so several brokers
+    in one process (e.g. tests standing in for several workers) see each
+    other's events with no outside service (``EVENTS_URL=memory://``).
+    """
+
+    _hubs: Dict[str, "List[queue.Queue]"] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, name: str = "default"):
+        self.name = name
+        with self._lock:
+            self._hubs.setdefault(name, [])
+
+    def publish(self, channel: str, message: str) -> int:
+        with self._lock:
+            listeners = [listener for listener in self._hubs[self.name] if listener.match(channel)]
+        for listener in listeners:
+            listener.put({"type": "pmessage", "channel": channel, "data": message})
+        return len(listeners)
+
+    def pubsub(self) -> "_InMemoryPubSub":
+        return _InMemoryPubSub(self)
+
+
+class _InMemoryPubSub(queue.Queue):
+    def __init__(self, client: InMemoryPubSubClient):
+        super().__init__()
+        self.client = client
+        self.prefix: Optional[str] = None
+
+    def match(self, channel: str) -> bool:
+        return self.prefix is not None and channel.startswith(self.prefix)
+
+    def psubscribe(self, pattern: str) -> None:
+        self.prefix = pattern.rstrip("*")
+        with self.client._lock:
+            self.client._hubs[self.client.name].append(self)
+
+    def get_message(self, ignore_subscribe_messages: bool = True, timeout: float = 1.0):
+        try:
+            return self.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self) -> None:
+        with self.client._lock:
+            if self in self.client._hubs[self.client.name]:
+                self.client._hubs[self.client.name].remove(self)
+
+
+class SharedFanout:
+    """Fans events out through a pub/sub server shared by every worker process.
+
+    Works with a redis-py client; events published here reach this process's
+    subscribers through the same listener as everyone else's.
+    """
+
+    def __init__(self, client, prefix: str = "taskflow:events:"):
+        self.client = client
+        self.prefix = prefix
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_url(cls, url: str) -> "SharedFanout":
+        if url.startswith("memory://"):
+            return cls(InMemoryPubSubClient(url[len("memory://"):] or "default"))
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("EVENTS_URL needs the redis package (pip install redis)") from e
+        return cls(redis.Redis.from_url(url))
+
+    def start(self, deliver) -> None:
+        self.deliver = deliver
+        pubsub = self.client.pubsub()
+        pubsub.psubscribe(self.prefix + "*")
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, args=(pubsub,), name="event-fanout", daemon=True)
+        self._thread.start()
+
+    def _listen(self, pubsub) -> None:
+        try:
+            while not self._stop.is_set():
+                try:
+                    message = pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                except Exception as e:  # Connection lost; keep retrying until stopped
+                    print(f"Event fan-out error: {e}")
+                    self._stop.wait(1.0)
+                    continue
+                if not message or message.get("type") != "pmessage":
+                    continue
+                channel, data = message["channel"], message["data"]
+                if isinstance(channel, bytes):
+                    channel, data = channel.decode(), data.decode()
+                self.deliver(int(channel[len(self.prefix):]), data)
+        finally:
+            pubsub.close()
+
+    def publish(self, project_id: int, message: str) -> None:
+        self.client.publish(f"{self.prefix}{project_id}", message)
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+class EventBroker:
+    """In-process publish/subscribe of project change events.
+
+    Subscribers (SSE streams) register per project. ``publish`` hands the event
+    to the fan-out backend, which delivers it to the subscribers of every
+    process sharing that backend.
+    """
+
+    def __init__(self):
+        self.queue_size = 1000
+        self.fanout = LocalFanout()
+        self.fanout.start(self._deliver)
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.fanout.stop()
+        self.queue_size = app.config.get("EVENTS_QUEUE_SIZE", self.queue_size)
+        if app.config.get("EVENTS_BACKEND", "local") == "shared":
+            self.fanout = SharedFanout.from_url(app.config.get("EVENTS_URL", "memory://"))
+        else:
+            self.fanout = LocalFanout()
+        self.fanout.start(self._deliver)
+
+    def subscribe(self, project_id: int) -> Subscription:
+        subscription = Subscription(project_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(project_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.project_id]
+
+    def subscriber_count(self, project_id: Optional[int] = None) -> int:
+        with self._lock:
+            if project_id is not None:
+                return len(self._subscribers.get(project_id, ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+    def publish(self, event: Dict[str, Any]) -> None:
+        """Publish an event dict carrying a ``project_id``."""
+        try:
+            self.fanout.publish(event["project_id"], json.dumps(event, separators=(",", ":")))
+        except Exception as e:  # Live updates are best effort; never fail the write that caused them
+            print(f"Failed to publish event: {e}")
+
+    def _deliver(self, project_id: int, message: str) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(project_id, ()))
+        if not subscribers:
+            return
+        event = json.loads(message)
+        for subscription in subscribers:
+            subscription.put(event)
+
+
+event_broker = EventBroker()
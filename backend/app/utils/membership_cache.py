@@ -0,0 +1,67 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class MembershipCache:
+    """Process-local LRU cache of project roles keyed by (user_id, project_id).
+
+    Entries hold the user's role in the project, or None when the user is not a
+    member, and expire after ``ttl`` seconds. Writes in ProjectService invalidate
+    the affected keys explicitly; the TTL bounds staleness for changes made by
+    other processes.
+    """
+
+    MISS = object()
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[int, int], Tuple[float, Optional[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.ttl = app.config.get("AUTHZ_CACHE_TTL", self.ttl)
+        self.max_size = app.config.get("AUTHZ_CACHE_MAX_SIZE", self.max_size)
+        self.clear()
+
+    def get(self, user_id: int, project_id: int):
+        """Return the cached role (possibly None), or MembershipCache.MISS."""
+        key = (user_id, project_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return self.MISS
+            expires_at, role = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return self.MISS
+            self._entries.move_to_end(key)
+            return role
+
+    def set(self, user_id: int, project_id: int, role: Optional[str]) -> None:
+        if self.max_size <= 0:
+            return
+        key = (user_id, project_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, role)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int, project_id: int) -> None:
+        with self._lock:
+            self._entries.pop((user_id, project_id), None)
+
+    def invalidate_project(self, project_id: int) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[1] == project_id]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+membership_cache = MembershipCache()
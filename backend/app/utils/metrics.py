@@ -0,0 +1,197 @@
+"""
+Process-local metrics in the Prometheus text exposition format.
+
+Counters and histograms are aggregated per thread: each thread writes only to
+its own shard, so recording takes no lock and costs a dict update. Scrapes
+merge the shards; shards of threads that have exited are folded into one
+retired shard so their counts are kept without the list growing.
+"""
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from flask import g, request
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (0, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+Labels = Tuple[str, ...]
+
+
+class _Shard:
+    def __init__(self, thread: Optional[threading.Thread]):
+        self.thread = thread
+        self.counters: Dict[Tuple[str, Labels], float] = {}
+        self.histograms: Dict[Tuple[str, Labels], List[float]] = {}  # bucket counts..., +Inf count, sum
+
+    def merge(self, other: "_Shard") -> None:
+        for key, value in dict(other.counters).items():
+            self.counters[key] = self.counters.get(key, 0) + value
+        for key, values in dict(other.histograms).items():
+            mine = self.histograms.setdefault(key, [0.0] * len(values))
+            for i, value in enumerate(list(values)):
+                mine[i] += value
+
+
+class Counter:
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str, labelnames: Sequence[str] = ()):
+        self.registry, self.name, self.help, self.labelnames = registry, name, help, tuple(labelnames)
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        counters = self.registry._shard().counters
+        key = (self.name, labels)
+        counters[key] = counters.get(key, 0) + value
+
+
+class Histogram:
+    def __init__(self, registry: "MetricsRegistry", name: str, help: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.registry, self.name, self.help, self.labelnames = registry, name, help, tuple(labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        histograms = self.registry._shard().histograms
+        key = (self.name, labels)
+        counts = histograms.get(key)
+        if counts is None:
+            counts = histograms[key] = [0.0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1  # Non-cumulative here; cumulated on render
+        counts[-1] += value
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[_Shard] = []
+        self._retired = _Shard(None)
+        self._lock = threading.Lock()  # Guards the shard list, not the shards
+        self._metrics: Dict[str, object] = {}
+        self._gauges: Dict[str, Tuple[str, Sequence[str], Callable[[], Iterable[Tuple[Labels, float]]]]] = {}
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = self._metrics.setdefault(name, Counter(self, name, help, labelnames))
+        return metric  # type: ignore
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = self._metrics.setdefault(name, Histogram(self, name, help, labelnames, buckets))
+        return metric  # type: ignore
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str],
+              collect: Callable[[], Iterable[Tuple[Labels, float]]]) -> None:
+        """Register a gauge read at scrape time; ``collect`` yields (label values, value) pairs."""
+        self._gauges[name] = (help, tuple(labelnames), collect)
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard(threading.current_thread())
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def _collect(self) -> _Shard:
+        total = _Shard(None)
+        with self._lock:
+            for shard in [s for s in self._shards if not s.thread.is_alive()]:
+                self._retired.merge(shard)
+                self._shards.remove(shard)
+            shards = [self._retired] + list(self._shards)
+        for shard in shards:
+            total.merge(shard)
+        return total
+
+    def render(self) -> str:
+        totals = self._collect()
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            if isinstance(metric, Counter):
+                lines += [f"# HELP {metric.name} {metric.help}", f"# TYPE {metric.name} counter"]
+                samples = [(labels, value) for (name, labels), value in sorted(totals.counters.items())
+                           if name == metric.name]
+                if not samples and not metric.labelnames:
+                    samples = [((), 0)]
+                for labels, value in samples:
+                    lines.append(f"{metric.name}{_labels(metric.labelnames, labels)} {_number(value)}")
+            elif isinstance(metric, Histogram):
+                lines += [f"# HELP {metric.name} {metric.help}", f"# TYPE {metric.name} histogram"]
+                for (name, labels), counts in sorted(totals.histograms.items()):
+                    if name != metric.name:
+                        continue
+                    cumulative = 0.0
+                    for bound, count in zip(list(metric.buckets) + ["+Inf"], counts[:-1]):
+                        cumulative += count
+                        le = bound if bound == "+Inf" else _number(bound)
+                        lines.append(f"{name}_bucket{_labels(metric.labelnames + ('le',), labels + (le,))} "
+                                     f"{_number(cumulative)}")
+                    lines.append(f"{name}_sum{_labels(metric.labelnames, labels)} {_number(counts[-1])}")
+                    lines.append(f"{name}_count{_labels(metric.labelnames, labels)} {_number(cumulative)}")
+        for name, (help, labelnames, collect) in self._gauges.items():
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge"]
+            try:
+                for labels, value in collect():
+                    lines.append(f"{name}{_labels(labelnames, labels)} {_number(value)}")
+            except Exception as e:  # One broken gauge should not fail the scrape
+                print(f"Error collecting metric {name}: {e}")
+        return "\n".join(lines) + "\n"
+
+    def init_app(self, app) -> None:
+        """Time every request (``METRICS_ENABLED``)."""
+        if not app.config.get("METRICS_ENABLED", False):
+            return
+        app.before_request(_start_timer)
+        app.after_request(_record_request)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._retired = _Shard(None)
+            for shard in self._shards:
+                shard.counters.clear()
+                shard.histograms.clear()
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+metrics = MetricsRegistry()
+
+http_request_duration = metrics.histogram(
+    "taskflow_http_request_duration_seconds", "Time to handle a request, by route",
+    ("blueprint", "route", "method"),
+)
+http_requests = metrics.counter(
+    "taskflow_http_requests_total", "Requests handled, by route and status", ("blueprint", "route", "method", "status"),
+)
+http_request_size = metrics.histogram(
+    "taskflow_http_request_size_bytes", "Request body size, by blueprint", ("blueprint", "method"), SIZE_BUCKETS,
+)
+emails_queued = metrics.counter("taskflow_emails_queued_total", "Emails added to the outbox")
+emails_sent = metrics.counter("taskflow_emails_sent_total", "Emails delivered by the outbox workers")
+email_failures = metrics.counter(
+    "taskflow_email_failures_total", "Failed email queueing or delivery attempts", ("stage",),
+)
+
+
+def _start_timer() -> None:
+    g._metrics_started = time.perf_counter()
+
+
+def _record_request(response):
+    started = g.pop("_metrics_started", None)
+    if started is not None:
+        blueprint = request.blueprint or "app"
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        http_request_duration.observe(time.perf_counter() - started, blueprint, route, request.method)
+        http_requests.inc(blueprint, route, request.method, str(response.status_code))
+        http_request_size.observe(request.content_length or 0, blueprint, request.method)
+    return response
+
@@ -0,0 +1,108 @@
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from werkzeug.security import check_password_hash, generate_password_hash
+
+DEFAULT_METHOD = "scrypt:32768:8:1"  # werkzeug's default scrypt parameters
+
+
+class PasswordHashingBusy(Exception):
+    """Raised when the hashing pool is saturated; callers should answer 429."""
+
+
+class PasswordHasher:
+    """Runs password hashing and verification on a bounded process pool.
+
+    Hashing is deliberately CPU-heavy; doing it on the request thread lets a
+    burst of logins starve every other request on that worker. With
+    ``PASSWORD_HASH_WORKERS`` > 0 the work goes to that many worker processes
+    and at most ``PASSWORD_HASH_MAX_PENDING`` hashes may be queued or running;
+    beyond that ``PasswordHashingBusy`` is raised instead of queueing. With 0
+    workers hashing runs inline (scripts, tests).
+
+    ``PASSWORD_HASH_METHOD`` is the werkzeug method and work factor for new
+    hashes, e.g. ``scrypt:65536:8:1`` or ``pbkdf2:sha256:1000000``; stored
+    hashes made with anything else report ``needs_rehash``.
+    """
+
+    def __init__(self, method: str = DEFAULT_METHOD, workers: int = 0, max_pending: int = 0,
+                 timeout: float = 10.0):
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._configure(method, workers, max_pending, timeout)
+
+    def _configure(self, method: str, workers: int, max_pending: int, timeout: float) -> None:
+        self.method = method
+        self.workers = workers
+        self.max_pending = max_pending or workers * 4
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max(1, self.max_pending))
+        self._method_prefix: Optional[str] = None
+
+    def init_app(self, app) -> None:
+        self.shutdown()
+        self._configure(
+            app.config.get("PASSWORD_HASH_METHOD", DEFAULT_METHOD),
+            app.config.get("PASSWORD_HASH_WORKERS", 0),
+            app.config.get("PASSWORD_HASH_MAX_PENDING", 0),
+            app.config.get("PASSWORD_HASH_TIMEOUT", 10.0),
+        )
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        """Whether ``pwhash`` was made with a method or work factor other than the configured one."""
+        if self._method_prefix is None:
+            # werkzeug fills in defaults (e.g. "pbkdf2" -> "pbkdf2:sha256:1000000"); compare like with like
+            self._method_prefix = generate_password_hash("", self.method).split("$", 1)[0]
+        return pwhash.split("$", 1)[0] != self._method_prefix
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordHashingBusy()
+        try:
+            future = self._get_pool().submit(fn, *args)
+        except BrokenProcessPool:
+            slots.release()
+            self.shutdown()  # A worker died; start a fresh pool next time
+            raise PasswordHashingBusy()
+        except BaseException:
+            slots.release()
+            raise
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeoutError as e:
+            raise PasswordHashingBusy() from e
+        except BrokenProcessPool as e:
+            self.shutdown()
+            raise PasswordHashingBusy() from e
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn, not fork: the app process runs threads (outbox workers, event fan-out).
+                # Spawned workers re-import the __main__ script, so entry points must only
+                # build the app under their __main__ guard (see run.py)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,187 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class LocalCacheBackend:
+    """Process-local LRU of serialized values with a per-entry TTL.
+
+    Counters are kept apart from the LRU so eviction can never reset them. They
+    are per process too: a bump is only seen by the process that made it, so
+    this backend is for single-process deployments. Use the shared backend when
+    running several workers.
+    """
+
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[Optional[float], str]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def counter(self, key: str) -> int:
+        with self._lock:
+            return self._counters.get(key, 0)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._counters.clear()
+
+
+class InMemorySharedClient:
+    """Stand-in for a shared cache server, implementing the redis-py calls we use.
+
+    Lets the shared backend run in tests and local development with no
+    outside service (``RESPONSE_CACHE_URL=memory://``).
+    """
+
+    def __init__(self):
+        self._data: Dict[str, Tuple[Optional[float], bytes]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._data.get(name)
+            if entry is None or (entry[0] is not None and entry[0] <= time.monotonic()):
+                self._data.pop(name, None)
+                return None
+            return entry[1]
+
+    def set(self, name: str, value, ex: Optional[int] = None) -> bool:
+        if isinstance(value, str):
+            value = value.encode()
+        with self._lock:
+            self._data[name] = (time.monotonic() + ex if ex else None, value)
+        return True
+
+    def incr(self, name: str) -> int:
+        with self._lock:
+            _, value = self._data.get(name, (None, b"0"))
+            value = int(value) + 1
+            self._data[name] = (None, str(value).encode())
+            return value
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+        return True
+
+
+class SharedCacheBackend:
+    """Backend over a cache server shared by every process (redis-py compatible client)."""
+
+    def __init__(self, client, prefix: str = "taskflow:"):
+        self.client = client
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url: str) -> "SharedCacheBackend":
+        if url.startswith("memory://"):
+            return cls(InMemorySharedClient())
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RESPONSE_CACHE_URL needs the redis package (pip install redis)") from e
+        return cls(redis.Redis.from_url(url))
+
+    def get(self, key: str) -> Optional[str]:
+        value = self.client.get(self.prefix + key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        self.client.set(self.prefix + key, value, ex=int(ttl) if ttl else None)
+
+    def counter(self, key: str) -> int:
+        return int(self.get(key) or 0)
+
+    def incr(self, key: str) -> int:
+        return int(self.client.incr(self.prefix + key))
+
+    def clear(self) -> None:
+        if isinstance(self.client, InMemorySharedClient):
+            self.client.flushdb()
+
+
+class ResponseCache:
+    """Cache of serialized read responses under versioned keys.
+
+    Keys embed the version of everything the response is built from, so writes
+    never delete entries; they make new keys and the old ones age out. Project
+    responses use ``Project.version`` (bumped by change tracking on every task,
+    comment, label, membership and project write) and the ``users`` namespace
+    version, bumped after any user row is committed.
+
+    Only the payload is cached. Routes must run their access checks before
+    calling ``get_or_build``, so a cached entry is never served to a user who
+    could not have built it.
+    """
+
+    def __init__(self):
+        self.backend = LocalCacheBackend()
+        self.ttl = 300.0
+        self.enabled = True
+
+    def init_app(self, app) -> None:
+        kind = app.config.get("RESPONSE_CACHE_BACKEND", "local")
+        self.enabled = kind != "none"
+        self.ttl = app.config.get("RESPONSE_CACHE_TTL", self.ttl)
+        if kind == "shared":
+            self.backend = SharedCacheBackend.from_url(app.config.get("RESPONSE_CACHE_URL", "memory://"))
+        else:
+            self.backend = LocalCacheBackend(app.config.get("RESPONSE_CACHE_MAX_SIZE", 1024))
+        self.backend.clear()
+
+    # Counted even with the cache off: ETags are built from the same versions
+    def namespace_version(self, namespace: str) -> int:
+        return self.backend.counter(f"ns:{namespace}")
+
+    def bump(self, namespace: str) -> None:
+        """Invalidate every key and ETag built from ``namespace``."""
+        self.backend.incr(f"ns:{namespace}")
+
+    def project_key(self, project, view: str) -> str:
+        return f"project:{project.id}:v{project.version}:u{self.namespace_version('users')}:{view}"
+
+    def users_key(self, view: str) -> str:
+        return f"users:v{self.namespace_version('users')}:{view}"
+
+    def get_or_build(self, key: str, build: Callable[[], Any]) -> Any:
+        """Return the cached payload for ``key``, building and storing it on a miss."""
+        if not self.enabled:
+            return build()
+        cached = self.backend.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        value = build()
+        self.backend.set(key, json.dumps(value), self.ttl)
+        return value
+
+
+response_cache = ResponseCache()
@@ -0,0 +1,159 @@
+import heapq
+import re
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from flask import request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:\?|%s|:\w+)\s*,)+\s*(?:\?|%s|:\w+)\s*\)")
+_NUMBER = re.compile(r"\b\d+\b")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+
+
+def statement_shape(statement: str) -> str:
+    """Collapse a statement to its shape: literals and IN-list lengths removed."""
+    shape = _WHITESPACE.sub(" ", statement).strip()
+    shape = _STRING.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    return _PLACEHOLDER_LIST.sub("(?)", shape)
+
+
+class RequestProfile:
+    """Queries and database time of one request."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.shapes: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])  # shape -> [count, seconds]
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        entry = self.shapes[statement_shape(statement)]
+        entry[0] += 1
+        entry[1] += seconds
+
+    def suspects(self, threshold: int) -> List[Dict[str, Any]]:
+        """Statement shapes run ``threshold`` or more times: likely N+1 queries."""
+        return sorted(
+            ({"statement": shape, "count": count, "db_ms": round(seconds * 1000, 3)}
+             for shape, (count, seconds) in self.shapes.items() if count >= threshold),
+            key=lambda s: -s["count"],
+        )
+
+
+_current: ContextVar[Optional[RequestProfile]] = ContextVar("sql_profile", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("profiler_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current.get()
+    started = conn.info.get("profiler_started")
+    if profile is not None and started:
+        profile.record(statement, time.perf_counter() - started.pop())
+
+
+class SQLProfiler:
+    """Opt-in per-request SQL profiling (``SQL_PROFILER_ENABLED``).
+
+    Counts the queries and database time of each request from engine events,
+    adds a ``Server-Timing`` header, flags statement shapes repeated at least
+    ``SQL_PROFILER_N_PLUS_ONE_THRESHOLD`` times as N+1 suspects, and keeps the
+    ``SQL_PROFILER_WORST_PER_ENDPOINT`` slowest requests (by database time)
+    of each endpoint for the admin profile route. Streamed responses are
+    measured up to the point the view returns.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.threshold = 5
+        self.keep = 10
+        self._worst: Dict[str, List[Tuple[float, int, Dict[str, Any]]]] = {}
+        self._counter = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.enabled = app.config.get("SQL_PROFILER_ENABLED", False)
+        self.threshold = app.config.get("SQL_PROFILER_N_PLUS_ONE_THRESHOLD", self.threshold)
+        self.keep = app.config.get("SQL_PROFILER_WORST_PER_ENDPOINT", self.keep)
+        self.reset()
+        if not self.enabled:
+            return
+        for name, fn in (("before_cursor_execute", _before_cursor_execute),
+                         ("after_cursor_execute", _after_cursor_execute)):
+            if not event.contains(Engine, name, fn):
+                event.listen(Engine, name, fn)
+        app.before_request(self._start)
+        app.after_request(self._finish)
+        app.teardown_request(self._clear)
+
+    def _start(self) -> None:
+        _current.set(RequestProfile())
+
+    def _finish(self, response):
+        profile = _current.get()
+        if profile is None:
+            return response
+        _current.set(None)
+        total_ms = (time.perf_counter() - profile.started) * 1000
+        db_ms = profile.db_seconds * 1000
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={db_ms:.2f};desc="{profile.queries} queries", app;dur={total_ms:.2f}',
+        )
+        suspects = profile.suspects(self.threshold)
+        if suspects:
+            print(f"Possible N+1 queries in {request.method} {request.path}: "
+                  f"{suspects[0]['count']}x {suspects[0]['statement'][:120]}")
+        self._remember(request.endpoint or "unmatched", db_ms, {
+            "method": request.method,
+            "path": request.full_path.rstrip("?"),
+            "status": response.status_code,
+            "duration_ms": round(total_ms, 3),
+            "db_ms": round(db_ms, 3),
+            "queries": profile.queries,
+            "n_plus_one": suspects,
+            "at": datetime.utcnow().isoformat(),
+        })
+        return response
+
+    def _clear(self, exc=None) -> None:
+        _current.set(None)
+
+    def _remember(self, endpoint: str, db_ms: float, record: Dict[str, Any]) -> None:
+        with self._lock:
+            self._counter += 1
+            worst = self._worst.setdefault(endpoint, [])
+            # Min-heap on database time: the cheapest kept request is evicted first
+            item = (db_ms, self._counter, record)
+            if len(worst) < self.keep:
+                heapq.heappush(worst, item)
+            elif worst and db_ms > worst[0][0]:
+                heapq.heapreplace(worst, item)
+
+    def worst_requests(self) -> Dict[str, List[Dict[str, Any]]]:
+        """The kept requests per endpoint, most expensive first."""
+        with self._lock:
+            return {
+                endpoint: [record for _, _, record in sorted(items, key=lambda i: (-i[0], -i[1]))]
+                for endpoint, items in sorted(self._worst.items())
+            }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._worst.clear()
+
+
+sql_profiler = SQLProfiler()
@@ -0,0 +1,62 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class UserClaimsCache:
+    """Process-local LRU cache of each user's current (role, token_version).
+
+    Access tokens carry the role and token version they were issued with;
+    requests compare them against this cache instead of loading the user row.
+    A cached None means the user no longer exists. Entries expire after
+    ``ttl`` seconds, so role changes, revocations and deletions made by other
+    processes take effect within that window; change tracking invalidates
+    this process's entries as soon as such a change commits.
+    """
+
+    MISS = object()
+
+    def __init__(self, ttl: float = 30.0, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, Tuple[float, Optional[Tuple[str, int]]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app) -> None:
+        self.ttl = app.config.get("AUTH_CLAIMS_CACHE_TTL", self.ttl)
+        self.max_size = app.config.get("AUTH_CLAIMS_CACHE_MAX_SIZE", self.max_size)
+        self.clear()
+
+    def get(self, user_id: int):
+        """Return the cached (role, token_version) or None, or UserClaimsCache.MISS."""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return self.MISS
+            expires_at, claims = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return self.MISS
+            self._entries.move_to_end(user_id)
+            return claims
+
+    def set(self, user_id: int, claims: Optional[Tuple[str, int]]) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, claims)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+user_claims_cache = UserClaimsCache()
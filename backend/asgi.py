@@ -0,0 +1,8 @@
+from app.asgi import create_asgi_app
+
+# Built only when run as a script, like run.py; servers call the factory:
+# uvicorn --factory asgi:create_asgi_app
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(create_asgi_app(), host="0.0.0.0", port=5000)
@@ -0,0 +1,79 @@
+"""Shared helpers for the benchmark scripts."""
+import math
+import time
+from typing import Dict, List, Sequence
+
+from flask import Flask
+from sqlalchemy import event
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from app.models.user import User
+from app.utils.auth_middleware import create_user_token
+
+DEFAULT_DATABASE_URL = "sqlite:////tmp/taskflow_bench.db"
+
+
+def create_benchmark_app(database_url: str, **overrides) -> Flask:
+    """Create an app against ``database_url`` with outbound email disabled and any config ``overrides``."""
+
+    class BenchmarkConfig(Config):
+        SQLALCHEMY_DATABASE_URI = database_url
+        ENABLE_EMAIL_NOTIFICATIONS = False
+
+    for key, value in overrides.items():
+        setattr(BenchmarkConfig, key, value)
+    return create_app(BenchmarkConfig)
+
+
+def auth_headers(app: Flask, user_id: int) -> Dict[str, str]:
+    with app.app_context():
+        return {"Authorization": f"Bearer {create_user_token(db.session.get(User, user_id))}"}
+
+
+def percentiles(samples: Sequence[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p95/p99 plus max, rounded to microseconds."""
+    if not samples:
+        return {}
+    ordered = sorted(samples)
+
+    def rank(p: float) -> float:
+        return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+    return {
+        "p50": round(rank(50), 3),
+        "p95": round(rank(95), 3),
+        "p99": round(rank(99), 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class QueryRecorder:
+    """Records every statement the engine executes while active."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements: List[tuple] = []
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        self.statements = []
+        event.listen(self.engine, "before_cursor_execute", self._before)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine, "before_cursor_execute", self._before)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+def timed(fn, *args, **kwargs):
+    """Call fn and return (result, elapsed milliseconds)."""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - start) * 1000
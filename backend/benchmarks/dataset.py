@@ -0,0 +1,186 @@
+"""
+Synthetic dataset generator for benchmarks.
+
+Inserts rows with bulk Core INSERTs (executemany) in batches, so millions of
+rows take seconds instead of the per-object ORM round trips seed_db.py uses.
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.models.activity_log import ActivityLog
+from app.models.comment import Comment
+from app.models.label import Label, task_labels
+from app.models.project import Project, ProjectMember
+from app.models.task import Task
+from app.models.task_stats import ProjectTaskStats
+from app.models.user import User
+
+BATCH_SIZE = 5000
+STATUSES = ["TODO", "IN_PROGRESS", "DONE"]
+PRIORITIES = ["LOW", "MEDIUM", "HIGH"]
+PASSWORD = "benchmark123"
+
+
+@dataclass
+class DatasetSpec:
+    users: int = 50
+    projects: int = 10
+    members_per_project: int = 8
+    tasks_per_project: int = 2000
+    comments_per_task: int = 2
+    labels_per_project: int = 8
+    labels_per_task: int = 2
+    activity_per_task: int = 3
+    seed: int = 42
+
+
+def _insert(table, rows: Iterator[Dict]) -> int:
+    """Insert rows in executemany batches. Returns the number of rows inserted."""
+    count = 0
+    batch: List[Dict] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= BATCH_SIZE:
+            db.session.execute(table.insert(), batch)
+            count += len(batch)
+            batch = []
+    if batch:
+        db.session.execute(table.insert(), batch)
+        count += len(batch)
+    return count
+
+
+def _max_id(model) -> int:
+    return db.session.query(db.func.coalesce(db.func.max(model.id), 0)).scalar()
+
+
+def generate(spec: DatasetSpec) -> Dict[str, int]:
+    """Populate the current app's database according to ``spec``.
+
+    Ids are assigned explicitly (continuing from the current maximum) so child
+    rows can reference parents without reading them back. The first user is an
+    ADMIN; every user shares the password ``PASSWORD``. Returns row counts per
+    table.
+    """
+    rng = random.Random(spec.seed)
+    now = datetime.utcnow()
+    password_hash = generate_password_hash(PASSWORD)  # hashing is slow, do it once
+    counts: Dict[str, int] = {}
+
+    user_base = _max_id(User)
+    user_ids = list(range(user_base + 1, user_base + spec.users + 1))
+    counts["users"] = _insert(User.__table__, (
+        {
+            "id": uid,
+            "name": f"Bench User {uid}",
+            "email": f"bench{uid}@taskflow.test",
+            "password_hash": password_hash,
+            "role": "ADMIN" if i == 0 else "MEMBER",
+            "created_at": now,
+        }
+        for i, uid in enumerate(user_ids)
+    ))
+
+    project_base = _max_id(Project)
+    project_ids = list(range(project_base + 1, project_base + spec.projects + 1))
+    owners = {pid: user_ids[0] for pid in project_ids}
+    counts["projects"] = _insert(Project.__table__, (
+        {
+            "id": pid,
+            "name": f"Bench Project {pid}",
+            "description": "Generated for benchmarking",
+            "owner_id": owners[pid],
+            "created_at": now - timedelta(minutes=pid),
+        }
+        for pid in project_ids
+    ))
+
+    members: Dict[int, List[int]] = {}
+    for pid in project_ids:
+        others = rng.sample(user_ids[1:], min(spec.members_per_project, len(user_ids) - 1))
+        members[pid] = [owners[pid]] + others
+    counts["project_members"] = _insert(ProjectMember.__table__, (
+        {"user_id": uid, "project_id": pid, "role": "PM" if uid == owners[pid] else "MEMBER", "added_at": now}
+        for pid in project_ids for uid in members[pid]
+    ))
+
+    label_base = _max_id(Label)
+    labels: Dict[int, List[int]] = {}
+    label_rows = []
+    next_label = label_base + 1
+    for pid in project_ids:
+        labels[pid] = list(range(next_label, next_label + spec.labels_per_project))
+        for n, lid in enumerate(labels[pid]):
+            label_rows.append({"id": lid, "name": f"label-{n}", "color": "#6b7280", "project_id": pid, "created_at": now})
+        next_label += spec.labels_per_project
+    counts["labels"] = _insert(Label.__table__, iter(label_rows))
+
+    task_base = _max_id(Task)
+    task_rows = []
+    stats = {pid: dict.fromkeys(STATUSES, 0) for pid in project_ids}
+    next_task = task_base + 1
+    for pid in project_ids:
+        for n in range(spec.tasks_per_project):
+            status = rng.choice(STATUSES)
+            stats[pid][status] += 1
+            task_rows.append({
+                "id": next_task,
+                "title": f"Task {n} in project {pid}",
+                "description": f"Generated task {n} with some searchable words like deploy, review and release",
+                "status": status,
+                "priority": rng.choice(PRIORITIES),
+                "project_id": pid,
+                "assigned_to": rng.choice(members[pid] + [None]),
+                "due_date": (now + timedelta(days=rng.randint(-30, 60))).date() if rng.random() < 0.8 else None,
+                "created_at": now - timedelta(seconds=spec.tasks_per_project - n, minutes=pid),
+            })
+            next_task += 1
+    counts["tasks"] = _insert(Task.__table__, iter(task_rows))
+
+    counts["project_task_stats"] = _insert(ProjectTaskStats.__table__, (
+        {
+            "project_id": pid,
+            "todo_count": s["TODO"],
+            "in_progress_count": s["IN_PROGRESS"],
+            "done_count": s["DONE"],
+        }
+        for pid, s in stats.items()
+    ))
+
+    counts["task_labels"] = _insert(task_labels, (
+        {"task_id": t["id"], "label_id": lid}
+        for t in task_rows
+        for lid in rng.sample(labels[t["project_id"]], min(spec.labels_per_task, len(labels[t["project_id"]])))
+    ))
+
+    counts["comments"] = _insert(Comment.__table__, (
+        {
+            "content": f"Comment {n} on task {t['id']}",
+            "task_id": t["id"],
+            "user_id": rng.choice(members[t["project_id"]]),
+            "created_at": t["created_at"] + timedelta(minutes=n + 1),
+            "updated_at": t["created_at"] + timedelta(minutes=n + 1),
+        }
+        for t in task_rows for n in range(spec.comments_per_task)
+    ))
+
+    counts["activity_logs"] = _insert(ActivityLog.__table__, (
+        {
+            "task_id": t["id"],
+            "user_id": rng.choice(members[t["project_id"]]),
+            "action": "created" if n == 0 else "updated",
+            "field_changed": None if n == 0 else "status",
+            "old_value": None if n == 0 else "TODO",
+            "new_value": None if n == 0 else "IN_PROGRESS",
+            "created_at": t["created_at"] + timedelta(minutes=n),
+        }
+        for t in task_rows for n in range(spec.activity_per_task)
+    ))
+
+    db.session.commit()
+    return counts
@@ -0,0 +1,324 @@
+"""
+Endpoint benchmark suite for the auth, projects, tasks, comment and label blueprints.
+
+Generates a dataset with benchmarks.dataset (bulk Core inserts, no outside
+services; SQLite by default), then times every route of those blueprints
+through the test client. Writes get a fresh target per run from an untimed
+setup step. For each route it reports latency percentiles, queries per
+request and the peak memory allocated while handling one request.
+
+Routes added to these blueprints without a case here are listed as
+uncovered. With --baseline the run is compared against a previous report and
+exits non-zero if a route's status changed, its query count grew, or its p95
+latency or peak memory regressed beyond --tolerance. The generator is seeded,
+so regenerating with the same sizes gives the baseline's dataset; --reuse
+skips generation but the write routes grow the data on every run.
+
+Usage (from backend/):
+    python -m benchmarks.endpoints --tasks-per-project 5000 --output endpoints.json
+    python -m benchmarks.endpoints --tasks-per-project 5000 --baseline endpoints.json
+"""
+import argparse
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import count
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from flask import Flask
+from sqlalchemy import delete, insert, select
+
+from app.extensions import db
+from app.models.comment import Comment
+from app.models.label import Label, task_labels
+from app.models.project import Project, ProjectMember
+from app.models.task import Task
+from app.models.user import User
+from benchmarks.common import DEFAULT_DATABASE_URL, QueryRecorder, auth_headers, create_benchmark_app, percentiles, timed
+from benchmarks.dataset import PASSWORD, DatasetSpec, generate
+
+BLUEPRINTS = ("auth", "projects", "tasks", "comment", "label")
+# Endpoints that cannot be timed as a single request
+SKIPPED = {"projects.project_events": "Server-Sent Events stream that never completes"}
+
+Request = Tuple[str, str, Optional[Dict[str, Any]], str]  # method, path, json body, "member" | "admin"
+
+
+@dataclass
+class Fixture:
+    """Ids from the generated dataset that the cases work against."""
+    project_id: int
+    admin_id: int
+    member_id: int
+    member_email: str
+    task_id: int
+    comment_id: int
+    label_id: int
+
+
+class Runner:
+    def __init__(self, app: Flask, fixture: Fixture):
+        self.app = app
+        self.fx = fixture
+        self.client = app.test_client()
+        self.headers = {"member": auth_headers(app, fixture.member_id), "admin": auth_headers(app, fixture.admin_id)}
+        self.serial = count(int(datetime.utcnow().timestamp() * 1000))  # Unique across --reuse runs
+
+    def request(self, req: Request):
+        method, path, body, who = req
+        response = self.client.open(path, method=method, json=body, headers=self.headers[who])
+        response.get_data()  # Drain streamed bodies so they are timed and their context is released
+        response.close()
+        return response
+
+    def api(self, req: Request) -> Dict[str, Any]:
+        """Make an untimed setup request and return its JSON."""
+        response = self.request(req)
+        if response.status_code >= 400:
+            raise RuntimeError(f"Setup {req[0]} {req[1]} returned {response.status_code}: {response.get_data(as_text=True)}")
+        return response.get_json()
+
+    def insert(self, table, **values) -> int:
+        """Insert a setup row with Core, bypassing the API. Returns its primary key."""
+        with self.app.app_context():
+            result = db.session.execute(insert(table).values(**values))
+            db.session.commit()
+            return result.inserted_primary_key[0]
+
+    def next_value(self, column, row_id: int, values: List[str]) -> str:
+        """The value after the row's current one in ``values``, so every update really changes it."""
+        with self.app.app_context():
+            current = db.session.scalar(select(column).where(column.table.c.id == row_id))
+        return values[(values.index(current) + 1) % len(values)] if current in values else values[0]
+
+    def new_user(self) -> int:
+        n = next(self.serial)
+        with self.app.app_context():
+            password_hash = db.session.scalar(select(User.password_hash).where(User.id == self.fx.member_id))
+        return self.insert(User.__table__, name=f"Bench Extra {n}", email=f"extra{n}@taskflow.test",
+                           password_hash=password_hash, role="MEMBER")
+
+
+def cases(r: Runner) -> Dict[str, Callable[[], Request]]:
+    """Endpoint name -> setup returning the request to time."""
+    fx = r.fx
+    n = r.serial
+
+    def delete_label_target() -> Request:
+        label_id = r.insert(Label.__table__, name=f"tmp-{next(n)}", color="#000000", project_id=fx.project_id,
+                            created_at=datetime.utcnow())
+        return "DELETE", f"/api/labels/{label_id}", None, "admin"
+
+    def add_label_target() -> Request:
+        with r.app.app_context():
+            db.session.execute(delete(task_labels).where(task_labels.c.task_id == fx.task_id,
+                                                         task_labels.c.label_id == fx.label_id))
+            db.session.commit()
+        return "POST", f"/api/tasks/{fx.task_id}/labels/{fx.label_id}", None, "member"
+
+    def remove_label_target() -> Request:
+        with r.app.app_context():
+            exists = db.session.execute(select(task_labels).where(task_labels.c.task_id == fx.task_id,
+                                                                  task_labels.c.label_id == fx.label_id)).first()
+            if not exists:
+                db.session.execute(insert(task_labels).values(task_id=fx.task_id, label_id=fx.label_id))
+                db.session.commit()
+        return "DELETE", f"/api/tasks/{fx.task_id}/labels/{fx.label_id}", None, "member"
+
+    def remove_member_target() -> Request:
+        user_id = r.new_user()
+        r.insert(ProjectMember.__table__, user_id=user_id, project_id=fx.project_id, role="MEMBER",
+                 added_at=datetime.utcnow())
+        return "DELETE", f"/api/projects/{fx.project_id}/members/{user_id}", None, "admin"
+
+    def delete_project_target() -> Request:
+        project_id = r.insert(Project.__table__, name=f"Bench Doomed {next(n)}", description="",
+                              owner_id=fx.admin_id, created_at=datetime.utcnow())
+        return "DELETE", f"/api/projects/{project_id}", None, "admin"
+
+    return {
+        "auth.register": lambda: ("POST", "/api/auth/register",
+                                  {"name": "New", "email": f"new{next(n)}@taskflow.test",
+                                   "password": PASSWORD}, "member"),
+        "auth.login": lambda: ("POST", "/api/auth/login", {"email": fx.member_email, "password": PASSWORD}, "member"),
+        "auth.profile": lambda: ("GET", "/api/auth/profile", None, "member"),
+        "auth.update_preferences": lambda: ("PUT", "/api/auth/preferences",
+                                            {"notification_mode": r.next_value(User.notification_mode, fx.member_id,
+                                                                               ["IMMEDIATE", "HOURLY", "DAILY"])},
+                                            "member"),
+        "auth.get_all_users": lambda: ("GET", "/api/auth/users", None, "member"),
+
+        "projects.create_project": lambda: ("POST", "/api/projects", {"name": f"Bench New {next(n)}"}, "admin"),
+        "projects.get_projects": lambda: ("GET", "/api/projects", None, "member"),
+        "projects.get_project": lambda: ("GET", f"/api/projects/{fx.project_id}", None, "member"),
+        "projects.get_board": lambda: ("GET", f"/api/projects/{fx.project_id}/board", None, "member"),
+        "projects.update_project": lambda: ("PUT", f"/api/projects/{fx.project_id}",
+                                            {"description": f"Updated {next(n)}"}, "admin"),
+        "projects.delete_project": delete_project_target,
+        "projects.export_project": lambda: ("GET", f"/api/projects/{fx.project_id}/export?format=ndjson", None, "member"),
+        "projects.add_member": lambda: ("POST", f"/api/projects/{fx.project_id}/members",
+                                        {"user_id": r.new_user(), "role": "MEMBER"}, "admin"),
+        "projects.remove_member": remove_member_target,
+        "projects.update_member_role": lambda: ("PUT", f"/api/projects/{fx.project_id}/members/{fx.member_id}/role",
+                                                {"role": "MEMBER"}, "admin"),
+
+        "tasks.create_task": lambda: ("POST", "/api/tasks", {"title": f"Bench {next(n)}", "project_id": fx.project_id},
+                                      "member"),
+        "tasks.bulk_tasks": lambda: ("POST", "/api/tasks/bulk", {"create": [
+            {"title": f"Bulk {next(n)}", "project_id": fx.project_id} for _ in range(50)
+        ]}, "member"),
+        "tasks.get_tasks": lambda: ("GET", f"/api/tasks/project/{fx.project_id}", None, "member"),
+        "tasks.update_task": lambda: ("PUT", f"/api/tasks/{fx.task_id}",
+                                      {"status": r.next_value(Task.status, fx.task_id, ["TODO", "IN_PROGRESS", "DONE"])},
+                                      "member"),
+        "tasks.delete_task": lambda: ("DELETE", "/api/tasks/{}".format(r.api(
+            ("POST", "/api/tasks", {"title": "Doomed", "project_id": fx.project_id}, "member"))["task"]["id"]),
+            None, "member"),
+        "tasks.get_task_activity": lambda: ("GET", f"/api/tasks/{fx.task_id}/activity", None, "member"),
+
+        "comment.get_comments": lambda: ("GET", f"/api/tasks/{fx.task_id}/comments", None, "member"),
+        "comment.create_comment": lambda: ("POST", f"/api/tasks/{fx.task_id}/comments",
+                                           {"content": f"Bench comment {next(n)}"}, "member"),
+        "comment.update_comment": lambda: ("PUT", f"/api/tasks/comments/{fx.comment_id}",
+                                           {"content": f"Edited {next(n)}"}, "member"),
+        "comment.delete_comment": lambda: ("DELETE", "/api/tasks/comments/{}".format(r.api(
+            ("POST", f"/api/tasks/{fx.task_id}/comments", {"content": "Doomed"}, "member"))["id"]),
+            None, "member"),
+
+        "label.get_project_labels": lambda: ("GET", f"/api/projects/{fx.project_id}/labels", None, "member"),
+        "label.create_label": lambda: ("POST", f"/api/projects/{fx.project_id}/labels",
+                                       {"name": f"bench-{next(n)}"}, "admin"),
+        "label.update_label": lambda: ("PUT", f"/api/labels/{fx.label_id}", {"color": f"#{next(n) % 0xffffff:06x}"},
+                                       "admin"),
+        "label.delete_label": delete_label_target,
+        "label.add_label_to_task": add_label_target,
+        "label.remove_label_from_task": remove_label_target,
+    }
+
+
+def load_fixture() -> Fixture:
+    project = db.session.query(Project).order_by(Project.id).first()
+    member = (
+        db.session.query(User).join(ProjectMember, ProjectMember.user_id == User.id)
+        .filter(ProjectMember.project_id == project.id, ProjectMember.role == "MEMBER").order_by(User.id).first()
+    )
+    task = Task.query.filter_by(project_id=project.id).order_by(Task.id).first()
+    comment = Comment.query.filter_by(user_id=member.id).order_by(Comment.id).first()
+    if comment is None:
+        comment = Comment(content="Bench comment", task_id=task.id, user_id=member.id)
+        db.session.add(comment)
+        db.session.commit()
+    label = Label.query.filter_by(project_id=project.id).order_by(Label.id).first()
+    return Fixture(project.id, project.owner_id, member.id, member.email, task.id, comment.id, label.id)
+
+
+def run(args) -> Dict:
+    app = create_benchmark_app(args.database_url, PASSWORD_HASH_WORKERS=0)
+    with app.app_context():
+        if not args.reuse:
+            db.drop_all()
+            db.create_all()
+            spec = DatasetSpec(users=args.users, projects=args.projects, tasks_per_project=args.tasks_per_project,
+                               comments_per_task=args.comments_per_task, labels_per_project=args.labels_per_project,
+                               activity_per_task=args.activity_per_task)
+            print(f"Generated {generate(spec)}", file=sys.stderr)
+        fixture = load_fixture()
+        engine = db.engine
+
+    runner = Runner(app, fixture)
+    endpoint_cases = cases(runner)
+    endpoints = sorted({rule.endpoint for rule in app.url_map.iter_rules() if rule.endpoint.split(".")[0] in BLUEPRINTS})
+    report: Dict[str, Any] = {"routes": {}, "uncovered": [], "skipped": SKIPPED}
+    for endpoint in endpoints:
+        if endpoint in SKIPPED:
+            continue
+        setup = endpoint_cases.get(endpoint)
+        if setup is None:
+            report["uncovered"].append(endpoint)
+            continue
+        runner.request(setup())  # warm up caches and connections
+        latencies: List[float] = []
+        queries: List[int] = []
+        status = None
+        for _ in range(args.runs):
+            req = setup()
+            with app.app_context(), QueryRecorder(engine) as recorder:
+                response, elapsed = timed(runner.request, req)
+            status = response.status_code
+            latencies.append(elapsed)
+            queries.append(recorder.count)
+        req = setup()
+        tracemalloc.start()
+        runner.request(req)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        report["routes"][endpoint] = {
+            "method": req[0],
+            "path": req[1],
+            "status": status,
+            "latency_ms": percentiles(latencies),
+            "queries": max(queries),
+            "queries_min": min(queries),
+            "peak_memory_kib": round(peak / 1024, 1),
+        }
+        result = report["routes"][endpoint]
+        print(f"{endpoint:32} {status:>3}  p50 {result['latency_ms']['p50']:>8.2f}  p95 {result['latency_ms']['p95']:>8.2f}"
+              f"  p99 {result['latency_ms']['p99']:>8.2f} ms  {result['queries']:>3} queries"
+              f"  {result['peak_memory_kib']:>9.1f} KiB peak", file=sys.stderr)
+    for endpoint in report["uncovered"]:
+        print(f"UNCOVERED {endpoint}: add a case to benchmarks/endpoints.py", file=sys.stderr)
+    return report
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    problems = []
+    for name, current in report["routes"].items():
+        previous = baseline.get("routes", {}).get(name)
+        if not previous:
+            continue
+        if current["status"] != previous["status"]:
+            problems.append(f"{name}: status {previous['status']} -> {current['status']}")
+        if current["queries"] > previous["queries"]:
+            problems.append(f"{name}: queries {previous['queries']} -> {current['queries']}")
+        before, after = previous["latency_ms"]["p95"], current["latency_ms"]["p95"]
+        if after > before * (1 + tolerance):
+            problems.append(f"{name}: p95 {before:.2f} ms -> {after:.2f} ms")
+        before, after = previous["peak_memory_kib"], current["peak_memory_kib"]
+        if after > before * (1 + tolerance):
+            problems.append(f"{name}: peak memory {before:.1f} KiB -> {after:.1f} KiB")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--tasks-per-project", type=int, default=2000)
+    parser.add_argument("--comments-per-task", type=int, default=2)
+    parser.add_argument("--labels-per-project", type=int, default=8)
+    parser.add_argument("--activity-per-task", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=20, help="timed requests per route")
+    parser.add_argument("--reuse", action="store_true", help="use the existing data instead of regenerating")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="compare against a previous JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p95/memory regression")
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(report, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
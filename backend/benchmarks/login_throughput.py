@@ -0,0 +1,126 @@
+"""
+Login throughput benchmark for the password hashing pool.
+
+Runs a burst of concurrent logins for a fixed time with hashing inline on the
+request threads (--workers 0) and on process pools of the given sizes. For each
+it reports successful logins per second, how many were turned away with 429,
+login latency, and the latency of a cheap authenticated endpoint probed
+throughout the burst, which shows how much the logins starve other requests.
+
+Usage (from backend/):
+    python -m benchmarks.login_throughput --workers 0 2 4 --concurrency 16 --duration 10
+    python -m benchmarks.login_throughput --method scrypt:65536:8:1 --output login.json
+"""
+import argparse
+import json
+import sys
+import threading
+import time
+from typing import Dict, List
+
+from werkzeug.security import generate_password_hash
+
+from app.extensions import db
+from app.models.user import User
+from benchmarks.common import DEFAULT_DATABASE_URL, auth_headers, create_benchmark_app, percentiles, timed
+from benchmarks.dataset import PASSWORD
+
+
+def prepare(database_url: str, users: int, method: str) -> None:
+    app = create_benchmark_app(database_url, PASSWORD_HASH_WORKERS=0)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        password_hash = generate_password_hash(PASSWORD, method)  # shared; hashing is slow
+        db.session.execute(User.__table__.insert(), [
+            {"name": f"Bench User {i}", "email": f"bench{i}@taskflow.test", "password_hash": password_hash,
+             "role": "MEMBER"}
+            for i in range(1, users + 1)
+        ])
+        db.session.commit()
+
+
+def run_mode(args, workers: int) -> Dict:
+    app = create_benchmark_app(args.database_url, PASSWORD_HASH_WORKERS=workers,
+                               PASSWORD_HASH_METHOD=args.method)
+    probe_headers = auth_headers(app, 1)
+    app.test_client().post("/api/auth/login", json={"email": "bench1@taskflow.test", "password": PASSWORD})  # start the pool
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    logins: List[float] = []
+    probes: List[float] = []
+    status_counts: Dict[int, int] = {}
+
+    def login_loop(n: int) -> None:
+        client = app.test_client()
+        i = n
+        while not stop.is_set():
+            email = f"bench{i % args.users + 1}@taskflow.test"
+            response, elapsed = timed(client.post, "/api/auth/login", json={"email": email, "password": PASSWORD})
+            with lock:
+                status_counts[response.status_code] = status_counts.get(response.status_code, 0) + 1
+                if response.status_code == 200:
+                    logins.append(elapsed)
+            if response.status_code == 429:
+                time.sleep(0.01)
+            i += args.concurrency
+
+    def probe_loop() -> None:
+        client = app.test_client()
+        while not stop.is_set():
+            response, elapsed = timed(client.get, "/api/auth/profile", headers=probe_headers)
+            if response.status_code == 200:
+                probes.append(elapsed)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=login_loop, args=(n,)) for n in range(args.concurrency)]
+    threads.append(threading.Thread(target=probe_loop))
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    from app.utils.password_hasher import password_hasher
+    password_hasher.shutdown()
+    return {
+        "workers": workers,
+        "logins_per_second": round(len(logins) / elapsed, 2),
+        "status_counts": status_counts,
+        "login_latency_ms": percentiles(logins),
+        "probe_latency_ms": percentiles(probes),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2], help="pool sizes to compare (0 = inline)")
+    parser.add_argument("--concurrency", type=int, default=8, help="concurrent login clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per mode")
+    parser.add_argument("--method", default="scrypt:32768:8:1", help="PASSWORD_HASH_METHOD to benchmark")
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    prepare(args.database_url, args.users, args.method)
+    report = []
+    for workers in args.workers:
+        result = run_mode(args, workers)
+        report.append(result)
+        print(f"workers={workers:<3} {result['logins_per_second']:>8.2f} logins/s  "
+              f"login p95 {result['login_latency_ms'].get('p95', 0):>9.2f} ms  "
+              f"probe p95 {result['probe_latency_ms'].get('p95', 0):>8.2f} ms  "
+              f"statuses {result['status_counts']}", file=sys.stderr)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
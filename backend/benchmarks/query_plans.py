@@ -0,0 +1,143 @@
+"""
+Query-plan regression benchmark for the list endpoints.
+
+Generates a large dataset, then for each list endpoint records the SQL it runs,
+the EXPLAIN plan of every SELECT and request latency percentiles. Plans that
+scan a whole table are flagged. With --baseline, the run is compared against a
+previous report and exits non-zero if an endpoint gained a full scan or its p95
+regressed beyond --tolerance.
+
+Usage (from backend/):
+    python -m benchmarks.query_plans --tasks-per-project 20000 --output plans.json
+    python -m benchmarks.query_plans --baseline plans.json
+"""
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+from app.extensions import db
+from app.models.project import Project, ProjectMember
+from app.models.task import Task
+from benchmarks.common import (
+    DEFAULT_DATABASE_URL, QueryRecorder, auth_headers, create_benchmark_app, percentiles, timed,
+)
+from benchmarks.dataset import DatasetSpec, generate
+
+
+def list_endpoints(project_id: int, task_id: int) -> Dict[str, str]:
+    return {
+        "projects.list": "/api/projects",
+        "projects.detail": f"/api/projects/{project_id}",
+        "tasks.list": f"/api/tasks/project/{project_id}",
+        "tasks.list_status": f"/api/tasks/project/{project_id}?status=TODO",
+        "tasks.list_priority_sort": f"/api/tasks/project/{project_id}?sort=priority",
+        "tasks.list_due_date_sort": f"/api/tasks/project/{project_id}?sort=due_date",
+        "comments.list": f"/api/tasks/{task_id}/comments",
+        "activity.list": f"/api/tasks/{task_id}/activity",
+        "labels.list": f"/api/projects/{project_id}/labels",
+        "users.list": "/api/auth/users",
+    }
+
+
+def explain(connection, statement: str, parameters) -> Dict:
+    """EXPLAIN a statement and report whether it scans a whole table."""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+        plan = [row[-1] for row in rows]
+        # "SCAN tasks" is a table scan; "SCAN tasks USING INDEX ..." walks an index
+        full_scan = any(step.startswith("SCAN") and "INDEX" not in step for step in plan)
+    else:
+        result = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+        keys = list(result.keys())
+        plan = [dict(zip(keys, row)) for row in result.fetchall()]
+        full_scan = any(step.get("type") == "ALL" for step in plan)
+    return {"sql": " ".join(statement.split()), "plan": plan, "full_scan": full_scan}
+
+
+def run(args) -> Dict:
+    app = create_benchmark_app(args.database_url)
+    with app.app_context():
+        if not args.reuse:
+            db.drop_all()
+            db.create_all()
+            spec = DatasetSpec(projects=args.projects, tasks_per_project=args.tasks_per_project)
+            print(f"Generated {generate(spec)}", file=sys.stderr)
+        project = db.session.query(Project).order_by(Project.id).first()
+        member = ProjectMember.query.filter_by(project_id=project.id, role="MEMBER").first()
+        task = Task.query.filter_by(project_id=project.id).first()
+        project_id, task_id, user_id = project.id, task.id, member.user_id
+        engine = db.engine
+
+    headers = auth_headers(app, user_id)
+    client = app.test_client()
+    report: Dict[str, Dict] = {}
+    for name, path in list_endpoints(project_id, task_id).items():
+        client.get(path, headers=headers)  # warm up caches and connections
+        with app.app_context(), QueryRecorder(engine) as recorder:
+            response = client.get(path, headers=headers)
+        if response.status_code != 200:
+            raise RuntimeError(f"{name} returned {response.status_code}: {response.get_data(as_text=True)}")
+        latencies = [timed(client.get, path, headers=headers)[1] for _ in range(args.runs)]
+        with engine.connect() as connection:
+            plans = [
+                explain(connection, statement, parameters)
+                for statement, parameters in recorder.statements
+                if statement.lstrip().upper().startswith("SELECT")
+            ]
+        report[name] = {
+            "path": path,
+            "queries": recorder.count,
+            "latency_ms": percentiles(latencies),
+            "full_scans": sum(p["full_scan"] for p in plans),
+            "plans": plans,
+        }
+        print(f"{name:28} {report[name]['latency_ms']['p95']:>9.2f} ms p95  "
+              f"{recorder.count:>3} queries  {report[name]['full_scans']} full scans", file=sys.stderr)
+    return report
+
+
+def compare(report: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    problems = []
+    for name, current in report.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if current["full_scans"] > previous["full_scans"]:
+            problems.append(f"{name}: full scans {previous['full_scans']} -> {current['full_scans']}")
+        if current["queries"] > previous["queries"]:
+            problems.append(f"{name}: queries {previous['queries']} -> {current['queries']}")
+        before, after = previous["latency_ms"]["p95"], current["latency_ms"]["p95"]
+        if after > before * (1 + tolerance):
+            problems.append(f"{name}: p95 {before:.2f} ms -> {after:.2f} ms")
+    return problems
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=DEFAULT_DATABASE_URL)
+    parser.add_argument("--projects", type=int, default=10)
+    parser.add_argument("--tasks-per-project", type=int, default=5000)
+    parser.add_argument("--runs", type=int, default=20, help="timed requests per endpoint")
+    parser.add_argument("--reuse", action="store_true", help="use the existing data instead of regenerating")
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--baseline", help="compare against a previous JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative p95 regression")
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, default=str)
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(report, json.load(f), args.tolerance)
+        for problem in problems:
+            print(f"REGRESSION {problem}", file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""add project task stats
+
+Revision ID: 5ff08cd17362
+Revises: e93343fe721e
+Create Date: 2026-10-18 04:12:37.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5ff08cd17362'
+down_revision = 'e93343fe721e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Databases created by create_all after the counters were added already have the table
+    if not sa.inspect(op.get_bind()).has_table('project_task_stats'):
+        op.create_table('project_task_stats',
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('todo_count', sa.Integer(), nullable=False),
+        sa.Column('in_progress_count', sa.Integer(), nullable=False),
+        sa.Column('done_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('project_id')
+        )
+
+    # Backfill the counters of every project that has no row yet from the tasks table
+    op.execute(
+        "INSERT INTO project_task_stats (project_id, todo_count, in_progress_count, done_count) "
+        "SELECT p.id, "
+        "SUM(CASE WHEN t.status = 'TODO' THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN t.status = 'IN_PROGRESS' THEN 1 ELSE 0 END), "
+        "SUM(CASE WHEN t.status = 'DONE' THEN 1 ELSE 0 END) "
+        "FROM projects p LEFT JOIN tasks t ON t.project_id = p.id "
+        "WHERE p.id NOT IN (SELECT project_id FROM project_task_stats) "
+        "GROUP BY p.id"
+    )
+
+
+def downgrade():
+    op.drop_table('project_task_stats')
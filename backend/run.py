@@ -1,6 +1,9 @@
 from app import create_app
 
-app = create_app()
-
+# The app is only built when this file is run as a script. Password hashing
+# workers are spawned processes that re-import this module (as __mp_main__),
+# and must not boot a whole app each. Servers call the factory: flask --app run
+# finds create_app, gunicorn takes "run:create_app()".
 if __name__ == "__main__":
+    app = create_app()
     app.run(debug=True, host="0.0.0.0", port=5000)
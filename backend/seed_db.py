@@ -11,6 +11,7 @@ from app.models.task import Task
 from app.models.comment import Comment
 from app.models.label import Label
 from app.models.activity_log import ActivityLog
+from app.services.task_service import TaskService
 
 def seed_database():
     app = create_app()
@@ -256,6 +257,7 @@ def seed_database():
         db.session.add_all(all_tasks)
         db.session.commit()
         print(f"   ✓ Created {Task.query.count()} tasks")
+        TaskService.rebuild_task_stats()
         
         # Print summary
         print("\n" + "="*60)
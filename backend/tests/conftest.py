@@ -0,0 +1,75 @@
+"""Fixtures for the query-count tests: the app on embedded SQLite, seeded at two sizes."""
+import sqlite3
+from typing import Dict, Tuple
+
+import pytest
+
+from app import create_app
+from app.config import Config
+from app.extensions import db
+from benchmarks.dataset import DatasetSpec, generate
+from benchmarks.endpoints import Runner, load_fixture
+
+# Same shape, ten times the rows in every table: a query count that differs between the two grows with the data
+SIZES: Dict[str, DatasetSpec] = {
+    "small": DatasetSpec(users=12, projects=2, members_per_project=4, tasks_per_project=4, comments_per_task=2,
+                         labels_per_project=3, labels_per_task=2, activity_per_task=2),
+    "large": DatasetSpec(users=120, projects=20, members_per_project=40, tasks_per_project=40, comments_per_task=20,
+                         labels_per_project=30, labels_per_task=2, activity_per_task=20),
+}
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite://"
+    JWT_SECRET_KEY = "taskflow-query-count-tests-secret-key"
+    ENABLE_EMAIL_NOTIFICATIONS = False
+    EMAIL_OUTBOX_IN_PROCESS = False  # Worker threads would query while a test counts
+    PASSWORD_HASH_WORKERS = 0
+    # Caches off, so every request pays for what it builds
+    RESPONSE_CACHE_BACKEND = "none"
+    AUTHZ_CACHE_MAX_SIZE = 0
+    AUTH_CLAIMS_CACHE_MAX_SIZE = 0
+    METRICS_ENABLED = True
+
+
+def _runner(spec: DatasetSpec, config=TestConfig) -> Runner:
+    app = create_app(config)
+    with app.app_context():
+        db.create_all()
+        generate(spec)
+        fixture = load_fixture()
+    return Runner(app, fixture)
+
+
+def _copy_database(runner: Runner, source: sqlite3.Connection = None) -> sqlite3.Connection:
+    """Copy the runner's in-memory database into a new one, or overwrite it with ``source``."""
+    with runner.app.app_context():
+        connection = db.engine.raw_connection()  # The app's only connection (StaticPool)
+        try:
+            if source is None:
+                source, target = connection.driver_connection, sqlite3.connect(":memory:")
+            else:
+                target = connection.driver_connection
+            source.backup(target)
+        finally:
+            connection.close()
+    return target
+
+
+@pytest.fixture(scope="session")
+def seeded() -> Dict[str, Tuple[Runner, sqlite3.Connection]]:
+    """One seeded app per dataset size, shared by the whole session, with a copy of its freshly seeded data."""
+    seeded = {}
+    for size, spec in SIZES.items():
+        runner = _runner(spec)
+        seeded[size] = (runner, _copy_database(runner))
+    return seeded
+
+
+@pytest.fixture
+def runners(seeded) -> Dict[str, Runner]:
+    """The seeded apps, their data reset first, so a test never sees rows an earlier one wrote."""
+    for runner, snapshot in seeded.values():
+        _copy_database(runner, snapshot)
+    return {size: runner for size, (runner, _) in seeded.items()}
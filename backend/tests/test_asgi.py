@@ -0,0 +1,202 @@
+"""ASGI mode: the async read routes, the native event stream and the threaded WSGI fallback."""
+import asyncio
+import json
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from sqlalchemy import event
+
+from app.asgi import ASYNC_ENDPOINTS, create_asgi_app
+from app.extensions import db
+from app.models.project import ProjectMember
+from app.utils.event_broker import EventStream, event_broker
+from benchmarks.common import auth_headers
+from benchmarks.dataset import generate
+from benchmarks.endpoints import Runner, cases, load_fixture
+from tests.conftest import SIZES, TestConfig
+
+
+@pytest.fixture(scope="module")
+def served(tmp_path_factory):
+    """The ASGI app and a runner for its Flask app, on a SQLite file both engines can open."""
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f"sqlite:///{tmp_path_factory.mktemp('asgi') / 'taskflow.db'}"
+        ASGI_THREADS = 4
+        EVENTS_KEEPALIVE_SECONDS = 0.3
+
+    asgi = create_asgi_app(FileConfig)
+    asgi.threads = []  # Thread each WSGI request ran on
+    asgi.app.before_request(lambda: asgi.threads.append(threading.current_thread().name) and None)
+    with asgi.app.app_context():
+        db.create_all()
+        generate(SIZES["small"])
+        fixture = load_fixture()
+    yield asgi, Runner(asgi.app, fixture)
+    asgi.executor.shutdown()
+
+
+def run(asgi, coroutine):
+    """Run ``coroutine`` on a fresh event loop, releasing the async pool's connections to it afterwards."""
+    async def main():
+        try:
+            return await coroutine
+        finally:
+            await asgi.engine.dispose()
+
+    return asyncio.run(main())
+
+
+def _scope(method: str, path: str, headers: Dict[str, str]) -> Dict:
+    path, _, query = path.partition("?")
+    return {
+        "type": "http", "http_version": "1.1", "method": method, "scheme": "http", "path": path, "root_path": "",
+        "query_string": query.encode(), "server": ("localhost", 80), "client": ("127.0.0.1", 50000),
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+
+
+async def call(asgi, method: str, path: str, headers: Dict[str, str],
+               body: Optional[Dict] = None) -> Tuple[int, Dict[bytes, bytes], bytes]:
+    """Make one request to the ASGI app in process; return status, headers and body."""
+    payload = json.dumps(body).encode() if body is not None else b""
+    if body is not None:
+        headers = {**headers, "Content-Type": "application/json", "Content-Length": str(len(payload))}
+    received = False
+    messages: List[Dict] = []
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.Event().wait()  # The client never disconnects
+
+    async def send(message):
+        messages.append(message)
+
+    await asgi(_scope(method, path, headers), receive, send)
+    start = messages[0]
+    return start["status"], dict(start["headers"]), b"".join(m.get("body", b"") for m in messages[1:])
+
+
+@pytest.mark.parametrize("endpoint", sorted(ASYNC_ENDPOINTS))
+def test_async_route_matches_wsgi(served, endpoint):
+    asgi, runner = served
+    method, path, body, who = cases(runner)[endpoint]()
+    assert asgi.endpoint(method, path) == endpoint
+
+    expected = runner.client.open(path, method=method, headers=runner.headers[who])
+    async_queries = [0]
+
+    def count(*args):
+        async_queries[0] += 1
+
+    event.listen(asgi.engine.sync_engine, "before_cursor_execute", count)
+    try:
+        status, headers, data = run(asgi, call(asgi, method, path, runner.headers[who]))
+    finally:
+        event.remove(asgi.engine.sync_engine, "before_cursor_execute", count)
+
+    assert async_queries[0] > 0, f"{endpoint} did not run on the async engine"
+    assert status == expected.status_code == 200
+    assert headers[b"content-type"] == expected.headers["Content-Type"].encode()
+    assert data == expected.get_data()
+
+
+def test_event_stream_stays_open_while_writes_run(served):
+    asgi, runner = served
+    project_id = runner.fx.project_id
+    headers = runner.headers["member"]
+
+    async def scenario():
+        chunks: "asyncio.Queue[Dict]" = asyncio.Queue()
+        gone = asyncio.Event()
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await gone.wait()
+            return {"type": "http.disconnect"}
+
+        stream = asyncio.ensure_future(asgi(_scope("GET", f"/api/projects/{project_id}/events", headers),
+                                            receive, chunks.put))
+        start = await asyncio.wait_for(chunks.get(), 5)
+        assert start["status"] == 200
+        assert b": connected" in (await asyncio.wait_for(chunks.get(), 5))["body"]
+        assert event_broker.subscriber_count(project_id) == 1
+
+        # Writes go through the WSGI fallback, several at once, while the stream is open
+        asgi.threads.clear()
+        writes = [call(asgi, "POST", "/api/tasks", headers, {"title": f"Live {i}", "project_id": project_id})
+                  for i in range(4)]
+        results = await asyncio.wait_for(asyncio.gather(*writes), 10)
+        assert [status for status, _, _ in results] == [201] * 4
+        assert asgi.threads and all(name.startswith("wsgi") for name in asgi.threads)
+
+        received = b""
+        while received.count(b"event: task.created") < 4:
+            received += (await asyncio.wait_for(chunks.get(), 5))["body"]
+
+        gone.set()
+        await asyncio.wait_for(stream, 5)
+        assert event_broker.subscriber_count(project_id) == 0
+
+    run(asgi, scenario())
+
+
+def test_event_stream_revokes_removed_member_on_a_busy_project(served):
+    asgi, runner = served
+    project_id = runner.fx.project_id
+    user_id = runner.new_user()
+    runner.insert(ProjectMember.__table__, user_id=user_id, project_id=project_id, role="MEMBER",
+                  added_at=datetime.utcnow())
+    admin = runner.headers["admin"]
+
+    async def scenario():
+        chunks: List[bytes] = []
+        gone = asyncio.Event()
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await gone.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            chunks.append(message.get("body", b""))
+
+        stream = asyncio.ensure_future(asgi(_scope("GET", f"/api/projects/{project_id}/events",
+                                                   auth_headers(runner.app, user_id)), receive, send))
+        while event_broker.subscriber_count(project_id) == 0:
+            await asyncio.sleep(0.01)
+        status, _, _ = await call(asgi, "DELETE", f"/api/projects/{project_id}/members/{user_id}", admin)
+        assert status == 200
+
+        # Keep the project busy: the stream never goes quiet long enough for a keepalive
+        for i in range(40):
+            if stream.done():
+                break
+            await call(asgi, "POST", "/api/tasks", admin, {"title": f"Busy {i}", "project_id": project_id})
+            await asyncio.sleep(0.05)
+        assert stream.done(), "the removed member was still streaming"
+        gone.set()
+        assert chunks[-2:] == [EventStream.REVOKED.encode(), b""]
+        assert event_broker.subscriber_count(project_id) == 0
+
+    run(asgi, scenario())
+
+
+def test_event_stream_refusal_is_sent_whole(served):
+    asgi, runner = served
+    status, _, data = run(asgi, call(asgi, "GET", f"/api/projects/{runner.fx.project_id + 999}/events",
+                                     runner.headers["member"]))
+    assert status == 404
+    assert json.loads(data) == {"error": "Project not found"}
@@ -0,0 +1,40 @@
+"""Malformed bulk requests are refused with 400 before anything is written."""
+import pytest
+
+from benchmarks.endpoints import Runner
+from tests.conftest import SIZES, _runner
+
+
+@pytest.fixture(scope="module")
+def runner() -> Runner:
+    return _runner(SIZES["small"])
+
+
+def bodies(runner: Runner):
+    fx = runner.fx
+    return {
+        "list body": [{"title": "A", "project_id": fx.project_id}],
+        "string body": "create",
+        "object assignee": {"create": [{"title": "A", "project_id": fx.project_id, "assigned_to": {"id": 1}}]},
+        "string assignee": {"update": [{"id": fx.task_id, "assigned_to": "2"}]},
+        "boolean assignee": {"update": [{"id": fx.task_id, "assigned_to": True}]},
+        "unknown assignee": {"create": [{"title": "A", "project_id": fx.project_id, "assigned_to": 10 ** 9}]},
+        "object project id": {"create": [{"title": "A", "project_id": {"id": fx.project_id}}]},
+        "object task id": {"update": [{"id": [fx.task_id], "title": "B"}]},
+    }
+
+
+@pytest.mark.parametrize("case", ["list body", "string body", "object assignee", "string assignee", "boolean assignee",
+                                  "unknown assignee", "object project id", "object task id"])
+def test_malformed_request_is_refused(runner, case):
+    response = runner.request(("POST", "/api/tasks/bulk", bodies(runner)[case], "member"))
+    assert response.status_code == 400, response.get_data(as_text=True)
+    assert "error" in response.get_json()
+
+
+def test_assignee_may_be_set_and_cleared(runner):
+    fx = runner.fx
+    created = runner.api(("POST", "/api/tasks/bulk", {"create": [
+        {"title": "Assigned", "project_id": fx.project_id, "assigned_to": fx.member_id}]}, "member"))["created"]
+    result = runner.api(("POST", "/api/tasks/bulk", {"update": [{"id": created[0], "assigned_to": None}]}, "member"))
+    assert result["updated"] == 1
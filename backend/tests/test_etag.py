@@ -0,0 +1,32 @@
+"""ETags of project responses change with everything the response embeds, not only the project's own rows."""
+import pytest
+
+from app.models.user import User
+from benchmarks.endpoints import Runner
+from tests.conftest import SIZES, _runner
+
+
+@pytest.fixture(scope="module")
+def runner() -> Runner:
+    return _runner(SIZES["small"])
+
+
+def paths(runner: Runner):
+    project_id = runner.fx.project_id
+    return [f"/api/projects/{project_id}", f"/api/projects/{project_id}/board", f"/api/tasks/project/{project_id}"]
+
+
+def test_preferences_change_invalidates_project_etags(runner):
+    headers = runner.headers["member"]
+    etags = {}
+    for path in paths(runner):
+        etags[path] = runner.client.get(path, headers=headers).headers["ETag"]
+        assert runner.client.get(path, headers={**headers, "If-None-Match": etags[path]}).status_code == 304
+
+    mode = runner.next_value(User.notification_mode, runner.fx.member_id, ["IMMEDIATE", "HOURLY", "DAILY"])
+    runner.api(("PUT", "/api/auth/preferences", {"notification_mode": mode}, "member"))
+
+    for path in paths(runner):
+        response = runner.client.get(path, headers={**headers, "If-None-Match": etags[path]})
+        assert response.status_code == 200, path
+        assert response.headers["ETag"] != etags[path]
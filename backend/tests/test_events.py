@@ -0,0 +1,76 @@
+"""Project event streams stop once the subscriber may no longer listen, however busy the project is."""
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Dict, List, Tuple
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+from app.models.project import ProjectMember
+from app.utils.event_broker import EventStream
+from benchmarks.common import auth_headers
+from benchmarks.endpoints import Runner
+from tests.conftest import SIZES, TestConfig, _runner
+
+KEEPALIVE = 0.2
+
+
+class EventsConfig(TestConfig):
+    EVENTS_KEEPALIVE_SECONDS = KEEPALIVE
+
+
+@pytest.fixture(scope="module")
+def runner() -> Runner:
+    return _runner(SIZES["small"], EventsConfig)
+
+
+def extra_member(runner: Runner) -> Tuple[int, Dict[str, str]]:
+    """A new member of the fixture project and their auth headers."""
+    user_id = runner.new_user()
+    runner.insert(ProjectMember.__table__, user_id=user_id, project_id=runner.fx.project_id, role="MEMBER",
+                  added_at=datetime.utcnow())
+    return user_id, auth_headers(runner.app, user_id)
+
+
+def open_stream(runner: Runner, headers: Dict[str, str]):
+    response = runner.client.get(f"/api/projects/{runner.fx.project_id}/events", headers=headers, buffered=False)
+    assert response.status_code == 200
+    chunks = iter(response.response)
+    assert next(chunks) == EventStream.CONNECTED.encode()
+    return chunks
+
+
+def rest(chunks) -> List[bytes]:
+    """What the stream still sends, bounded so a stream that never ends fails instead of hanging."""
+    return list(islice(chunks, 10))
+
+
+def create_tasks(runner: Runner, count: int) -> None:
+    for _ in range(count):
+        runner.api(("POST", "/api/tasks", {"title": f"Busy {next(runner.serial)}", "project_id": runner.fx.project_id},
+                    "admin"))
+
+
+def test_removed_member_stops_receiving_events(runner):
+    user_id, headers = extra_member(runner)
+    chunks = open_stream(runner, headers)
+    create_tasks(runner, 1)
+    assert next(chunks).startswith(b"event: task.created")
+
+    runner.api(("DELETE", f"/api/projects/{runner.fx.project_id}/members/{user_id}", None, "admin"))
+    time.sleep(KEEPALIVE)
+    create_tasks(runner, 3)  # Events are waiting, so the stream never goes quiet
+    assert rest(chunks) == [EventStream.REVOKED.encode()]
+
+
+def test_stream_ends_when_the_token_expires(runner):
+    user_id, _ = extra_member(runner)
+    with runner.app.app_context():
+        token = create_access_token(identity=str(user_id), additional_claims={"role": "MEMBER", "ver": 0},
+                                    expires_delta=timedelta(seconds=1))
+    chunks = open_stream(runner, {"Authorization": f"Bearer {token}"})
+
+    time.sleep(1.5)
+    create_tasks(runner, 3)
+    assert rest(chunks) == [EventStream.REVOKED.encode()]
@@ -0,0 +1,25 @@
+"""/metrics is off unless enabled, and with METRICS_TOKEN set it answers only scrapers that send the token."""
+from app import create_app
+from app.config import Config
+from tests.conftest import TestConfig
+
+
+class TokenConfig(TestConfig):
+    METRICS_TOKEN = "scrape-secret"
+
+
+def test_metrics_are_off_by_default():
+    class DefaultConfig(TestConfig):
+        METRICS_ENABLED = Config.METRICS_ENABLED
+
+    assert create_app(DefaultConfig).test_client().get("/metrics").status_code == 404
+
+
+def test_metrics_token_is_required_when_set():
+    client = create_app(TokenConfig).test_client()
+    assert client.get("/metrics").status_code == 401
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 401
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert b"taskflow_http_request_duration_seconds" in response.data
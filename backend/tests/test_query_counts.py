@@ -0,0 +1,95 @@
+"""
+Query budgets for every API endpoint.
+
+Each endpoint is requested once against the small and the large dataset (see
+conftest.SIZES) with the caches off, on data reset to the seeded rows first so no
+test depends on what another one wrote. The test fails if the number of queries
+differs between the two, which means it grows with the rows (an N+1), or if it
+exceeds the endpoint's budget below. Lower a budget when an endpoint gets
+cheaper; raising one should come with a reason in review.
+"""
+from typing import Callable, Dict
+
+import pytest
+
+from app.extensions import db
+from benchmarks.common import QueryRecorder
+from benchmarks.endpoints import SKIPPED, Request, Runner, cases
+
+BUDGETS: Dict[str, int] = {
+    "admin.get_sql_profile": 1,
+    "admin.reset_sql_profile": 1,
+
+    "auth.get_all_users": 2,
+    "auth.login": 1,
+    "auth.profile": 2,
+    "auth.register": 3,
+    "auth.update_preferences": 4,
+
+    "comment.create_comment": 10,
+    "comment.delete_comment": 6,
+    "comment.get_comments": 5,
+    "comment.update_comment": 9,
+
+    "label.add_label_to_task": 12,
+    "label.create_label": 5,
+    "label.delete_label": 6,
+    "label.get_project_labels": 4,
+    "label.remove_label_from_task": 12,
+    "label.update_label": 6,
+
+    "metrics.get_metrics": 1,
+
+    "projects.add_member": 9,
+    "projects.create_project": 9,
+    "projects.delete_project": 11,
+    "projects.export_project": 8,
+    "projects.get_board": 10,
+    "projects.get_project": 9,
+    "projects.get_projects": 5,
+    "projects.remove_member": 8,
+    "projects.update_member_role": 6,
+    "projects.update_project": 7,
+
+    "search.search": 3,
+
+    "tasks.bulk_tasks": 9,
+    "tasks.create_task": 12,
+    "tasks.delete_task": 17,
+    "tasks.get_task_activity": 9,
+    "tasks.get_tasks": 8,
+    "tasks.update_task": 12,
+}
+
+
+def _cases(runner: Runner) -> Dict[str, Callable[[], Request]]:
+    return {
+        **cases(runner),
+        "admin.get_sql_profile": lambda: ("GET", "/api/admin/sql-profile", None, "admin"),
+        "admin.reset_sql_profile": lambda: ("DELETE", "/api/admin/sql-profile", None, "admin"),
+        "search.search": lambda: ("GET", "/api/search?q=task", None, "member"),
+        "metrics.get_metrics": lambda: ("GET", "/metrics", None, "member"),
+    }
+
+
+def _count_queries(runner: Runner, endpoint: str) -> int:
+    req = _cases(runner)[endpoint]()  # Setup runs outside the recorder
+    with runner.app.app_context():
+        engine = db.engine
+    with QueryRecorder(engine) as recorder:
+        response = runner.request(req)
+    assert response.status_code < 400, f"{req[0]} {req[1]} -> {response.status_code}: {response.get_data(as_text=True)}"
+    return recorder.count
+
+
+@pytest.mark.parametrize("endpoint", sorted(BUDGETS))
+def test_query_budget(runners, endpoint):
+    counts = {size: _count_queries(runner, endpoint) for size, runner in runners.items()}
+    assert counts["small"] == counts["large"], f"{endpoint} runs more queries on more rows: {counts}"
+    assert counts["large"] <= BUDGETS[endpoint], f"{endpoint} ran {counts['large']} queries, budget {BUDGETS[endpoint]}"
+
+
+def test_every_endpoint_has_a_budget(runners):
+    app = runners["small"].app
+    endpoints = {rule.endpoint for rule in app.url_map.iter_rules()} - {"static"} - set(SKIPPED)
+    assert sorted(endpoints - set(BUDGETS)) == []
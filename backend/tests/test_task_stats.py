@@ -0,0 +1,48 @@
+"""Status counters: the first write to a project without a counter row must not fail when another one races it."""
+from datetime import datetime
+
+import pytest
+
+from app.extensions import db
+from app.models.project import Project
+from app.models.task_stats import ProjectTaskStats
+from app.services.task_service import TaskService
+from benchmarks.endpoints import Runner
+from tests.conftest import SIZES, _runner
+
+
+@pytest.fixture(scope="module")
+def runner() -> Runner:
+    return _runner(SIZES["small"])
+
+
+def project_without_counters(runner: Runner) -> int:
+    return runner.insert(Project.__table__, name=f"No counters {next(runner.serial)}", description="",
+                         owner_id=runner.fx.admin_id, created_at=datetime.utcnow())
+
+
+def test_insert_skips_an_existing_row(runner):
+    project_id = project_without_counters(runner)
+    with runner.app.app_context():
+        assert TaskService._insert_task_stats(ProjectTaskStats(project_id, todo_count=2)) is True
+        assert TaskService._insert_task_stats(ProjectTaskStats(project_id, todo_count=5)) is False
+        db.session.commit()
+        assert db.session.get(ProjectTaskStats, project_id).todo_count == 2
+
+
+def test_first_write_applies_deltas_to_a_row_created_meanwhile(runner, monkeypatch):
+    project_id = project_without_counters(runner)
+    count = TaskService._count_task_stats
+
+    def count_while_another_writer_inserts(project_ids):
+        # Another transaction creates the row between our UPDATE and INSERT
+        db.session.execute(ProjectTaskStats.__table__.insert().values(
+            project_id=project_id, todo_count=3, in_progress_count=0, done_count=1))
+        return count(project_ids)
+
+    monkeypatch.setattr(TaskService, "_count_task_stats", staticmethod(count_while_another_writer_inserts))
+    with runner.app.app_context():
+        TaskService.adjust_task_stats(project_id, {"TODO": 1, "DONE": -1})
+        db.session.commit()
+        assert db.session.get(ProjectTaskStats, project_id).to_summary() == {
+            "total": 4, "TODO": 4, "IN_PROGRESS": 0, "DONE": 0}
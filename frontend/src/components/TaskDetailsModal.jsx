@@ -7,6 +7,8 @@ import LabelBadge from './LabelBadge';
 const TaskDetailsModal = ({ task, isOpen, onClose, onUpdate, projectLabels, projectMembers }) => {
   const [comments, setComments] = useState([]);
   const [activityLog, setActivityLog] = useState([]);
+  const [activityCursor, setActivityCursor] = useState(null);
+  const [activityTotal, setActivityTotal] = useState(0);
   const [newComment, setNewComment] = useState('');
   const [loading, setLoading] = useState(false);
   const [activeTab, setActiveTab] = useState('comments');
@@ -44,10 +46,13 @@ const TaskDetailsModal = ({ task, isOpen, onClose, onUpdate, projectLabels, proj
     }
   };
 
-  const fetchActivity = async () => {
+  const fetchActivity = async (cursor = null) => {
     try {
-      const response = await API.get(`/tasks/${task.id}/activity`);
-      setActivityLog(response.data);
+      const response = await API.get(`/tasks/${task.id}/activity`, { params: cursor ? { cursor } : {} });
+      const { activities, next_cursor, summary } = response.data;
+      setActivityLog((prev) => (cursor ? [...prev, ...activities] : activities));
+      setActivityCursor(next_cursor);
+      setActivityTotal(summary.total);
     } catch (error) {
       console.error('Error fetching activity:', error);
     }
@@ -260,7 +265,7 @@ const TaskDetailsModal = ({ task, isOpen, onClose, onUpdate, projectLabels, proj
               style={activeTab === 'activity' ? { ...styles.tab, ...styles.activeTab } : styles.tab}
               onClick={() => setActiveTab('activity')}
             >
-              <FiActivity size={16} /> Activity ({activityLog.length})
+              <FiActivity size={16} /> Activity ({activityTotal})
             </button>
           </div>
 
@@ -325,6 +330,11 @@ const TaskDetailsModal = ({ task, isOpen, onClose, onUpdate, projectLabels, proj
                     </div>
                   ))
                 )}
+                {activityCursor && (
+                  <button style={styles.loadMoreBtn} onClick={() => fetchActivity(activityCursor)}>
+                    Load older activity
+                  </button>
+                )}
               </div>
             )}
           </div>
@@ -620,6 +630,16 @@ const styles = {
     display: 'block',
     marginTop: '0.25rem',
   },
+  loadMoreBtn: {
+    backgroundColor: '#e2e8f0',
+    color: '#4a5568',
+    border: 'none',
+    padding: '0.5rem 1rem',
+    borderRadius: '6px',
+    cursor: 'pointer',
+    fontSize: '0.85rem',
+    alignSelf: 'center',
+  },
   emptyState: {
     textAlign: 'center',
     color: '#a0aec0',
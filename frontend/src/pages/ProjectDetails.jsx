@@ -41,13 +41,23 @@ export default function ProjectDetails() {
   const [selectedTask, setSelectedTask] = useState(null);
   const [showTaskModal, setShowTaskModal] = useState(false);
 
-  const fetchProject = async () => {
+  // Project, members, labels, tasks and counts in one request
+  const fetchBoard = async () => {
     try {
-      const res = await API.get(`/projects/${id}`);
+      const params = {};
+      if (filter.status) params.status = filter.status;
+      if (filter.priority) params.priority = filter.priority;
+      const res = await API.get(`/projects/${id}/board`, { params });
+      const { columns } = res.data;
       setProject(res.data.project);
+      setLabels(res.data.labels);
+      setSummary(res.data.summary);
+      setTasks([...columns.TODO, ...columns.IN_PROGRESS, ...columns.DONE]);
     } catch (err) {
       console.error(err);
       navigate('/');
+    } finally {
+      setLoading(false);
     }
   };
 
@@ -60,39 +70,13 @@ export default function ProjectDetails() {
     }
   };
 
-  const fetchLabels = async () => {
-    try {
-      const res = await API.get(`/projects/${id}/labels`);
-      setLabels(res.data);
-    } catch (err) {
-      console.error('Failed to fetch labels', err);
-    }
-  };
-
-  const fetchTasks = async () => {
-    try {
-      const params = {};
-      if (filter.status) params.status = filter.status;
-      if (filter.priority) params.priority = filter.priority;
-      const res = await API.get(`/tasks/project/${id}`, { params });
-      setTasks(res.data.tasks);
-      setSummary(res.data.summary);
-    } catch (err) {
-      console.error(err);
-    } finally {
-      setLoading(false);
-    }
-  };
-
   useEffect(() => {
-    fetchProject();
     fetchAllUsers();
-    fetchLabels();
   }, [id]);
 
   useEffect(() => {
-    if (project) fetchTasks();
-  }, [project, filter]);
+    fetchBoard();
+  }, [id, filter]);
 
   const handleCreateTask = async (e) => {
     e.preventDefault();
@@ -111,7 +95,7 @@ export default function ProjectDetails() {
       setTaskDueDate('');
       setTaskAssignee('');
       setShowTaskForm(false);
-      fetchTasks();
+      fetchBoard();
     } catch (err) {
       console.error(err);
     }
@@ -120,7 +104,7 @@ export default function ProjectDetails() {
   const handleStatusChange = async (taskId, newStatus) => {
     try {
       await API.put(`/tasks/${taskId}`, { status: newStatus });
-      fetchTasks();
+      fetchBoard();
     } catch (err) {
       console.error(err);
     }
@@ -130,7 +114,7 @@ export default function ProjectDetails() {
     if (!window.confirm('Delete this task?')) return;
     try {
       await API.delete(`/tasks/${taskId}`);
-      fetchTasks();
+      fetchBoard();
     } catch (err) {
       console.error(err);
     }
@@ -160,7 +144,7 @@ export default function ProjectDetails() {
       setSelectedUserId('');
       setSelectedUserRole('MEMBER');
       setShowMemberForm(false);
-      fetchProject();
+      fetchBoard();
     } catch (err) {
       alert(err.response?.data?.error || 'Failed to add member');
     }
@@ -173,7 +157,7 @@ export default function ProjectDetails() {
       setLabelName('');
       setLabelColor('#6b7280');
       setShowLabelForm(false);
-      fetchLabels();
+      fetchBoard();
     } catch (err) {
       alert(err.response?.data?.error || 'Failed to create label');
     }
@@ -183,7 +167,7 @@ export default function ProjectDetails() {
     if (!window.confirm('Delete this label?')) return;
     try {
       await API.delete(`/projects/labels/${labelId}`);
-      fetchLabels();
+      fetchBoard();
     } catch (err) {
       alert(err.response?.data?.error || 'Failed to delete label');
     }
@@ -197,7 +181,7 @@ export default function ProjectDetails() {
   const handleTaskUpdate = (updatedTask) => {
     setTasks(tasks.map(t => t.id === updatedTask.id ? updatedTask : t));
     setSelectedTask(updatedTask);
-    fetchTasks();
+    fetchBoard();
   };
 
   if (loading || !project) {
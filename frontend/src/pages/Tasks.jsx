@@ -19,7 +19,7 @@ export default function Tasks() {
       return;
     }
     setLoading(true);
-    const params = {};
+    const params = { paginate: false };
     if (filter.status) params.status = filter.status;
     if (filter.priority) params.priority = filter.priority;
     API.get(`/tasks/project/${selectedProject}`, { params })
@@ -30,7 +30,7 @@ export default function Tasks() {
   const handleStatusChange = async (taskId, newStatus) => {
     await API.put(`/tasks/${taskId}`, { status: newStatus });
     // Re-fetch
-    const params = {};
+    const params = { paginate: false };
     if (filter.status) params.status = filter.status;
     if (filter.priority) params.priority = filter.priority;
     const res = await API.get(`/tasks/project/${selectedProject}`, { params });